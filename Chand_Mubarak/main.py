@@ -2,6 +2,8 @@ import streamlit as st
 import random
 from datetime import datetime
 import pytz
+from pathlib import Path
+from static_assets import asset_url
 
 # Set page configuration
 st.set_page_config(
@@ -150,15 +152,18 @@ def main():
                 st.image(uploaded_image, caption="Your Greeting", use_column_width=True)
                 st.success("Image shared!")
 
+    # The social icons ship with the app in images/ and are encoded once per process
+    linkedin_icon = asset_url(Path(__file__).parent / "images" / "linkedin.svg")
+    x_icon = asset_url(Path(__file__).parent / "images" / "x.svg")
     st.markdown(
-        """
+        f"""
         <div class='footer'>
             <p>Made by Osama bin Adnan with ❤️</p>
             <a href='https://www.linkedin.com/in/osama-bin-adnan/' target='_blank'>
-                <img src='https://img.icons8.com/ios-filled/50/000000/linkedin.png' alt='LinkedIn' width=40px>
+                <img src='{linkedin_icon}' alt='LinkedIn' width=40px>
             </a>
             <a href='https://x.com/osamabinadnan1' target='_blank'>
-                <img src='https://img.icons8.com/ios-filled/50/000000/x.png' alt='X' width=30px>
+                <img src='{x_icon}' alt='X' width=30px>
             </a>
         </div>
         """,
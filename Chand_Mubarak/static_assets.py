@@ -0,0 +1,75 @@
+# Static assets served by URL instead of being inlined into the HTML of every rerun.
+#
+# asset_url(path) reads an image once per process, optionally resizes it with Pillow,
+# and writes it to the app's static/ folder under a content-hashed name such as
+# static/osama-3f2a9c1b7d4e.png. Streamlit serves that folder at app/static/ when
+# server.enableStaticServing is on (see .streamlit/config.toml). An edited source file
+# gets a new name, so a browser can keep every URL cached.
+#
+# When static serving is off, or for formats that Streamlit doesn't serve as images
+# (e.g. SVG), the asset comes back as a base64 data URI, still encoded once per process.
+#
+# The apps are deployed independently, so each app that needs this has its own copy.
+import base64
+import hashlib
+import mimetypes
+import os
+from io import BytesIO
+from pathlib import Path
+
+import streamlit as st
+
+# Streamlit's static folder for this app, next to the main script
+STATIC_DIR = Path(__file__).parent / "static"
+
+# Formats served from the static folder; anything else is inlined. The locked Streamlit
+# serves other suffixes (SVG included) as text/plain with nosniff, which browsers won't draw
+SERVED_SUFFIXES = {".png", ".jpg", ".jpeg", ".gif", ".webp"}
+
+# Formats that are resized; GIFs are left alone so animations survive
+RESIZABLE_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp"}
+
+# Shrink an image to `width` pixels wide, keeping its aspect ratio and format.
+# Without Pillow, or when the image is already narrow enough, the bytes are returned unchanged.
+def resize_image(data, width):
+    try:
+        from PIL import Image
+    except ImportError:
+        return data
+    with Image.open(BytesIO(data)) as image:
+        if image.width <= width:
+            return data
+        image_format = image.format
+        resized = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+    output = BytesIO()
+    resized.save(output, format=image_format, optimize=True)
+    return output.getvalue()
+
+# Load, resize and publish an image; keyed by its modification time and size, so an
+# edited file is processed again while an unchanged one costs a single stat per rerun
+@st.cache_resource(show_spinner=False)
+def _publish(path, width, modified, size):
+    path = Path(path)
+    data = path.read_bytes()
+    if width and path.suffix.lower() in RESIZABLE_SUFFIXES:
+        data = resize_image(data, width)
+
+    if path.suffix.lower() not in SERVED_SUFFIXES or not st.get_option("server.enableStaticServing"):
+        mime_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        return f"data:{mime_type};base64,{base64.b64encode(data).decode()}"
+
+    name = f"{path.stem}-{hashlib.sha256(data).hexdigest()[:12]}{path.suffix.lower()}"
+    target = STATIC_DIR / name
+    if not target.exists():
+        # Write to a temporary file first so a concurrent request never gets a partial image
+        STATIC_DIR.mkdir(exist_ok=True)
+        temporary = target.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_bytes(data)
+        temporary.replace(target)
+    return f"app/static/{name}"
+
+def asset_url(path, width=None):
+    """URL of an image file for use in HTML, optionally resized to `width` pixels wide."""
+    path = Path(path).resolve()
+    stat = path.stat()
+    return _publish(str(path), width, stat.st_mtime_ns, stat.st_size)
@@ -0,0 +1,64 @@
+# Repository analysis for the profile page.
+#
+# The repositories of one fetch are parsed once into a typed frame:
+#   - star, fork and size counts as int32, fork as bool
+#   - language as a category (a handful of distinct values across thousands of rows)
+#   - name and html_url as pandas strings
+#   - created_at as a UTC datetime, parsed once and formatted only for display
+# Every chart and metric on the page is derived from that frame by summarize().
+import hashlib
+from collections import namedtuple
+
+import pandas as pd
+
+# Repository fields kept from the API: in batch checkpoints, the history store and the
+# combined batch DataFrame
+REPO_FIELDS = ["name", "stargazers_count", "forks_count", "language", "html_url", "created_at", "pushed_at", "size", "fork"]
+
+# Repository fields shown and analyzed, in table order
+REPO_COLUMNS = ["name", "stargazers_count", "forks_count", "language", "html_url", "created_at", "size", "fork"]
+
+REPO_DTYPES = {
+    "name": "string",
+    "stargazers_count": "int32",
+    "forks_count": "int32",
+    "language": "category",
+    "html_url": "string",
+    "size": "int32",
+    "fork": "bool",
+}
+
+# Aggregates behind the analysis tabs
+RepoSummary = namedtuple(
+    "RepoSummary",
+    ["top_repos", "language_count", "total_stars", "total_forks", "fork_ratio", "top_forked", "yearly"],
+)
+
+# Fingerprint of the fields the analysis depends on; changes whenever a repository is
+# added, removed, pushed to, starred or forked
+def data_version(repos):
+    digest = hashlib.sha1()
+    for repo in repos:
+        digest.update(f"{repo['name']}\0{repo.get('pushed_at')}\0{repo['stargazers_count']}\0{repo['forks_count']}\n".encode())
+    return digest.hexdigest()
+
+# Parse raw API dicts into the typed frame, most starred first
+def build_repo_frame(repos):
+    frame = pd.DataFrame(repos, columns=REPO_COLUMNS).astype(REPO_DTYPES)
+    frame["created_at"] = pd.to_datetime(frame["created_at"], utc=True)
+    return frame.sort_values("stargazers_count", ascending=False, ignore_index=True)
+
+# Every tab's aggregates from one frame built by build_repo_frame
+def summarize(frame):
+    languages = frame["language"].value_counts()
+    language_count = languages[languages > 0].rename_axis("Language").reset_index(name="Count")
+    yearly = frame.groupby(frame["created_at"].dt.year).size().rename_axis("Year").reset_index(name="Number of Repositories")
+    return RepoSummary(
+        top_repos=frame.head(10),
+        language_count=language_count,
+        total_stars=int(frame["stargazers_count"].sum()),
+        total_forks=int(frame["forks_count"].sum()),
+        fork_ratio=float(frame["fork"].mean() * 100),
+        top_forked=frame.nlargest(5, "forks_count")[["name", "forks_count"]],
+        yearly=yearly,
+    )
@@ -0,0 +1,223 @@
+# Batch analysis of many GitHub accounts, e.g. a team roster.
+#
+# - Usernames are fetched concurrently on a bounded pool, one request in flight per user.
+# - The client paces requests to the API rate limit and retries rate-limited ones. When
+#   the budget is spent for longer than the client will wait, the user is re-queued and
+#   the scheduler pauses until the reset, so a run slows down instead of failing.
+# - Every finished user is appended to a JSON Lines checkpoint. Rerunning the same
+#   roster skips the users already in it, so an interrupted run resumes where it stopped.
+#   Once every user has finished the checkpoint is deleted, so the next run of the roster
+#   fetches fresh data; `fresh=True` discards it before starting.
+# - build_frames turns the records into one repository DataFrame and a ranked
+#   per-user leaderboard.
+#
+# Run from the command line:
+#   python batch.py team.txt --output leaderboard.csv
+import hashlib
+import json
+import re
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+import pandas as pd
+import requests
+
+from analysis import REPO_FIELDS
+from github_client import CACHE_DIR, RateLimitExceeded
+
+# Users fetched at once; each has at most one request in flight
+BATCH_WORKERS = 8
+
+# Where checkpoints are written, one file per roster
+CHECKPOINT_DIR = CACHE_DIR / "batches"
+
+# User fields kept in checkpoints
+USER_FIELDS = ["login", "name", "avatar_url", "followers", "following", "public_repos"]
+
+# Split pasted text or file contents into unique usernames.
+# Accepts newlines, commas or spaces as separators, a leading "@", and "#" comments.
+def parse_usernames(text):
+    usernames = {}
+    for line in text.splitlines():
+        for name in re.split(r"[\s,;]+", line.split("#", 1)[0]):
+            name = name.strip().lstrip("@")
+            if name:
+                # Logins are case-insensitive; keep the first spelling
+                usernames.setdefault(name.lower(), name)
+    return list(usernames.values())
+
+# ------------------------------------------------------------------------------
+# Checkpoints
+# ------------------------------------------------------------------------------
+# The checkpoint file for a roster; the same set of usernames always maps to the same file
+def checkpoint_path(usernames, directory=CHECKPOINT_DIR):
+    key = "\n".join(sorted({name.lower() for name in usernames}))
+    return Path(directory) / f"{hashlib.sha256(key.encode()).hexdigest()[:16]}.jsonl"
+
+# Finished records by lowercase username; a line cut short by an interruption is skipped
+def load_checkpoint(path):
+    records = {}
+    try:
+        with open(path, encoding="utf-8") as checkpoint:
+            for line in checkpoint:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                records[record["username"].lower()] = record
+    except OSError:
+        pass
+    return records
+
+# ------------------------------------------------------------------------------
+# Fetching
+# ------------------------------------------------------------------------------
+# Fetch one user and all of their repositories.
+# Returns a record with status "ok", "not_found", "rate_limited" (with "reset_at") or "error".
+def fetch_user(client, username):
+    record = {"username": username, "status": "ok", "user": None, "repos": []}
+    try:
+        user_response = client.get(f"/users/{username}")
+        if user_response.status_code != 200:
+            return dict(record, status="not_found" if user_response.status_code == 404 else "error")
+        record["user"] = {field: user_response.data.get(field) for field in USER_FIELDS}
+
+        # Pages one at a time: the concurrency comes from fetching several users at once
+        for page in client.iter_pages(f"/users/{username}/repos", max_workers=1):
+            if page.status_code != 200:
+                return dict(record, status="error", error=f"HTTP {page.status_code}")
+            record["repos"].extend({field: repo.get(field) for field in REPO_FIELDS} for repo in page.data)
+    except RateLimitExceeded as error:
+        return dict(record, status="rate_limited", reset_at=error.reset_at)
+    except requests.RequestException as error:
+        return dict(record, status="error", error=str(error))
+    return record
+
+# Fetch every username, yielding records as they finish.
+# Users already in the checkpoint are yielded first without any request. New "ok" and
+# "not_found" records are appended to the checkpoint; "error" records are not, so the
+# next run retries them. Rate-limited users are re-queued rather than yielded.
+# The checkpoint is deleted when the run ends without errors, and ignored if `fresh`.
+def run_batch(client, usernames, checkpoint=None, max_workers=BATCH_WORKERS, fresh=False):
+    checkpoint = Path(checkpoint or checkpoint_path(usernames))
+    checkpoint.parent.mkdir(parents=True, exist_ok=True)
+    if fresh:
+        checkpoint.unlink(missing_ok=True)
+
+    finished = load_checkpoint(checkpoint)
+    queue = deque()
+    for username in usernames:
+        if username.lower() in finished:
+            yield dict(finished[username.lower()], resumed=True)
+        else:
+            queue.append(username)
+
+    with open(checkpoint, "a", encoding="utf-8") as output, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = set()
+        resume_at = 0.0
+        failed = False
+        while queue or futures:
+            while queue and len(futures) < max_workers and time.time() >= resume_at:
+                futures.add(executor.submit(fetch_user, client, queue.popleft()))
+
+            if not futures:
+                # Budget spent and nothing in flight: wait for the rate limit window to reset
+                time.sleep(max(0.0, resume_at - time.time()))
+                continue
+
+            done, futures = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                record = future.result()
+                if record["status"] == "rate_limited":
+                    queue.append(record["username"])
+                    resume_at = max(resume_at, record["reset_at"])
+                    continue
+                if record["status"] in ("ok", "not_found"):
+                    output.write(json.dumps(record) + "\n")
+                    output.flush()
+                else:
+                    failed = True
+                yield record
+
+    # Every user finished: the checkpoint is only needed to retry failures
+    if not failed:
+        checkpoint.unlink(missing_ok=True)
+
+# ------------------------------------------------------------------------------
+# Aggregation
+# ------------------------------------------------------------------------------
+# Combine records into (repos, leaderboard):
+#   repos:       one row per repository, with an "owner" column
+#   leaderboard: one row per user with totals, ranked by stars, then forks, then followers
+def build_frames(records):
+    found = [record for record in records if record["status"] == "ok"]
+    repos = pd.DataFrame(
+        [dict(repo, owner=record["username"]) for record in found for repo in record["repos"]],
+        columns=["owner", *REPO_FIELDS],
+    )
+    users = pd.DataFrame(
+        [
+            {
+                "username": record["username"],
+                "name": record["user"]["name"],
+                "followers": record["user"]["followers"],
+                "public_repos": record["user"]["public_repos"],
+            }
+            for record in found
+        ],
+        columns=["username", "name", "followers", "public_repos"],
+    ).set_index("username")
+
+    totals = repos.groupby("owner").agg(
+        stars=("stargazers_count", "sum"),
+        forks=("forks_count", "sum"),
+        top_repo_stars=("stargazers_count", "max"),
+        fork_ratio=("fork", "mean"),
+    )
+    top_language = repos.dropna(subset=["language"]).groupby("owner")["language"].agg(lambda languages: languages.mode().iloc[0])
+
+    leaderboard = users.join(totals).join(top_language.rename("top_language"))
+    count_columns = ["stars", "forks", "top_repo_stars"]
+    leaderboard[count_columns] = leaderboard[count_columns].fillna(0).astype(int)
+    leaderboard["fork_ratio"] = leaderboard["fork_ratio"].fillna(0.0).astype(float)
+    leaderboard = leaderboard.sort_values(["stars", "forks", "followers"], ascending=False)
+    leaderboard = leaderboard.reset_index()
+    leaderboard.insert(0, "rank", range(1, len(leaderboard) + 1))
+    return repos, leaderboard
+
+
+if __name__ == "__main__":
+    import argparse
+    import fileinput
+    import os
+    import sys
+
+    from dotenv import load_dotenv
+
+    from github_client import GitHubClient
+
+    parser = argparse.ArgumentParser(description="Fetch many GitHub accounts and rank them.")
+    parser.add_argument("files", nargs="*", help="files of usernames (default: standard input)")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="users fetched at once (default: %(default)s)")
+    parser.add_argument("--output", type=Path, help="write the leaderboard to this CSV file")
+    parser.add_argument("--fresh", action="store_true", help="ignore the checkpoint of an interrupted run")
+    parser.add_argument("--repos-output", type=Path, help="write the combined repository table to this CSV file")
+    args = parser.parse_args()
+
+    load_dotenv()
+    usernames = parse_usernames("".join(fileinput.input(args.files)))
+    client = GitHubClient(token=os.getenv("GITHUB_TOKEN"))
+
+    records = []
+    for record in run_batch(client, usernames, max_workers=args.workers, fresh=args.fresh):
+        records.append(record)
+        print(f"[{len(records)}/{len(usernames)}] {record['username']}: {record['status']}", file=sys.stderr)
+
+    repos, leaderboard = build_frames(records)
+    if args.output:
+        leaderboard.to_csv(args.output, index=False)
+    if args.repos_output:
+        repos.to_csv(args.repos_output, index=False)
+    print(leaderboard.to_string(index=False))
@@ -0,0 +1,132 @@
+# Profile analyzer benchmarks
+#
+# fetch: latency against the local mock server of three ways of loading a profile and
+# all of its repositories:
+#   - REST sequential: the user, then each repos page one after another
+#   - REST parallel:   fetch_profile (user and first page at once) plus concurrent pages
+#   - GraphQL:         fetch_profile_graphql (one request per 100 repositories)
+# The cache TTL is 0, so every run goes over the network (after the first, as ETag
+# revalidations answered with 304 Not Modified).
+#
+# analysis: time and memory of turning a synthetic 5k-repository account into the
+# tabs' aggregates, with the typed single-parse frame against the previous pipeline
+# (two DataFrames, created_at parsed twice and formatted back to strings).
+#
+# Run with: python benchmark.py [fetch|analysis] [--latency 0.05] [--runs 10] [--repos 5000]
+import argparse
+import statistics
+import tempfile
+import time
+import timeit
+
+import pandas as pd
+
+from analysis import REPO_COLUMNS, build_repo_frame, summarize
+from github_client import GitHubClient, last_page_number
+from mock_server import MockGitHubServer, make_repos
+
+# Users and their repository counts: one page, a few pages, and a large account
+USERS = {"small": 30, "medium": 250, "large": 1000}
+
+def rest_sequential(client, username):
+    user = client.get(f"/users/{username}")
+    repos = []
+    page = 1
+    while True:
+        response = client.get(f"/users/{username}/repos?per_page=100&page={page}")
+        repos.extend(response.data)
+        if page >= last_page_number(response.headers.get("Link")):
+            return user.data, repos
+        page += 1
+
+def rest_parallel(client, username):
+    user, first_page, remaining_pages = client.fetch_profile(username)
+    repos = list(first_page.data)
+    for page in remaining_pages:
+        repos.extend(page.data)
+    return user.data, repos
+
+def graphql(client, username):
+    user, first_page, remaining_pages = client.fetch_profile_graphql(username)
+    repos = list(first_page.data)
+    for page in remaining_pages:
+        repos.extend(page.data)
+    return user.data, repos
+
+MODES = {"REST sequential": rest_sequential, "REST parallel": rest_parallel, "GraphQL": graphql}
+
+def fetch_benchmark(args):
+    server = MockGitHubServer(USERS, latency=args.latency).start()
+    print(f"Mock server latency {args.latency * 1000:.0f} ms per request, {args.runs} runs each\n")
+    print(f"{'User':<10}{'Repos':>7}  {'Mode':<18}{'p50 (ms)':>10}{'p95 (ms)':>10}{'Requests':>10}")
+
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = GitHubClient(base_url=server.url, cache_dir=cache_dir, ttl=0)
+            for username, repo_count in USERS.items():
+                for mode, fetch in MODES.items():
+                    timings = []
+                    requests_before = server.request_count
+                    for _ in range(args.runs):
+                        start = time.perf_counter()
+                        _, repos = fetch(client, username)
+                        timings.append((time.perf_counter() - start) * 1000)
+                        assert len(repos) == repo_count
+                    p50 = statistics.median(timings)
+                    p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+                    requests_per_run = (server.request_count - requests_before) / args.runs
+                    print(f"{username:<10}{repo_count:>7}  {mode:<18}{p50:>10.1f}{p95:>10.1f}{requests_per_run:>10.0f}")
+    finally:
+        server.stop()
+
+# The analysis as main.py did it before the typed frame, returning the same aggregates
+def legacy_analysis(repos_data):
+    repo_df = pd.DataFrame(repos_data)[REPO_COLUMNS]
+    repo_df["created_at"] = pd.to_datetime(repo_df["created_at"]).dt.strftime("%B %d, %Y")
+    repo_df = repo_df.sort_values(by="stargazers_count", ascending=False)
+    language_count = repo_df["language"].dropna().value_counts().reset_index()
+    totals = (repo_df["stargazers_count"].sum(), repo_df["forks_count"].sum(), repo_df["fork"].sum() / len(repo_df) * 100)
+    top = (repo_df.head(10), repo_df.nlargest(5, "forks_count")[["name", "forks_count"]])
+    timeline_df = pd.DataFrame(repos_data)[["created_at"]]
+    timeline_df["created_at"] = pd.to_datetime(timeline_df["created_at"])
+    yearly = timeline_df.groupby(timeline_df["created_at"].dt.year).size().reset_index()
+    return repo_df, (language_count, totals, top, yearly)
+
+def typed_analysis(repos_data):
+    repo_df = build_repo_frame(repos_data)
+    return repo_df, summarize(repo_df)
+
+def analysis_benchmark(args):
+    repos_data = make_repos("large", args.repos)
+    print(f"Analysis of {args.repos} repositories\n")
+    print(f"{'Pipeline':<14}{'Time (ms)':>12}{'Frame memory (KB)':>20}")
+    results = {}
+    for name, pipeline in (("previous", legacy_analysis), ("typed frame", typed_analysis)):
+        timer = timeit.Timer(lambda: pipeline(repos_data))
+        number, _ = timer.autorange()
+        seconds = min(timer.repeat(repeat=5, number=number)) / number
+        memory = pipeline(repos_data)[0].memory_usage(deep=True).sum()
+        results[name] = (seconds, memory)
+        print(f"{name:<14}{seconds * 1000:>12.2f}{memory / 1024:>20.1f}")
+
+    (old_seconds, old_memory), (new_seconds, new_memory) = results.values()
+    print(f"\nTime saved: {1 - new_seconds / old_seconds:.0%}, memory saved: {1 - new_memory / old_memory:.0%}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the profile analyzer.")
+    parser.add_argument("benchmark", nargs="?", choices=["fetch", "analysis"], help="run only this benchmark (default: both)")
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated round trip per request in seconds (default: %(default)s)")
+    parser.add_argument("--runs", type=int, default=10, help="fetch runs per user and mode (default: %(default)s)")
+    parser.add_argument("--repos", type=int, default=5000, help="repositories in the analysis benchmark (default: %(default)s)")
+    args = parser.parse_args()
+
+    if args.benchmark in (None, "fetch"):
+        fetch_benchmark(args)
+    if args.benchmark is None:
+        print()
+    if args.benchmark in (None, "analysis"):
+        analysis_benchmark(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,442 @@
+# GitHub REST API client used by the analyzer.
+#
+# - One pooled requests.Session, so repeated calls reuse TCP/TLS connections.
+# - Successful responses are cached on disk (one JSON file per URL) and in memory.
+# - Within the TTL a cached response is returned without touching the network.
+# - After the TTL the request is revalidated with If-None-Match; GitHub answers
+#   304 Not Modified, which doesn't count against the rate limit, and the cached
+#   body is reused.
+# - Paginated endpoints are read page by page: the first page's Link header gives
+#   the page count, and the remaining pages are fetched concurrently.
+# - A profile can be fetched over REST (user and repos requested in parallel) or
+#   over GraphQL (profile, repos, languages and stars in one request per 100 repos).
+# - Outgoing requests are paced by a token bucket fed from the X-RateLimit-* headers.
+#   Rate-limited responses (403/429) are retried with jittered exponential backoff,
+#   so bulk use slows down as the budget runs out instead of failing.
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Base URL of the API; point it at a mock server for offline testing
+API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
+
+# Where cached responses are stored, and how long (in seconds) they are served without revalidation
+CACHE_DIR = Path(os.getenv("GITHUB_CACHE_DIR", Path(__file__).parent / ".cache"))
+CACHE_TTL = float(os.getenv("GITHUB_CACHE_TTL", 300))
+
+# Cached responses also kept in memory, least recently used dropped first; the rest are read from disk
+MEMORY_CACHE_ENTRIES = 256
+
+# Response headers worth keeping with a cached body
+CACHED_HEADERS = ("ETag", "Last-Modified", "Link")
+
+# Largest page size the API allows, and how many pages are fetched at once
+PER_PAGE = 100
+MAX_PAGE_WORKERS = 8
+
+# Below this share of the budget, the remaining requests are spread evenly until the reset
+RATE_LIMIT_LOW_WATER = 0.1
+
+# Requests that may go out back to back while paced
+RATE_LIMIT_BURST = 5
+
+# Retries of a rate-limited request, and the exponential backoff between them (seconds)
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+
+# Longest a single request waits for the budget; past this RateLimitExceeded is raised instead
+MAX_RATE_LIMIT_WAIT = float(os.getenv("GITHUB_MAX_RATE_LIMIT_WAIT", 60))
+
+# Profile, repositories, languages and stars in one query; repositories are paged by cursor,
+# most recently pushed first like fetch_profile's REST listing
+PROFILE_QUERY = """
+query($login: String!, $cursor: String) {
+  user(login: $login) {
+    login
+    name
+    avatarUrl
+    bio
+    followers { totalCount }
+    following { totalCount }
+    repositories(first: 100, after: $cursor, privacy: PUBLIC, ownerAffiliations: OWNER, orderBy: {field: PUSHED_AT, direction: DESC}) {
+      totalCount
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        stargazerCount
+        forkCount
+        primaryLanguage { name }
+        url
+        createdAt
+        pushedAt
+        diskUsage
+        isFork
+      }
+    }
+  }
+}
+"""
+
+# Read the number of the last page from a Link header; a missing header means a single page
+def last_page_number(link_header):
+    for link in requests.utils.parse_header_links(link_header or ""):
+        if link.get("rel") == "last":
+            return int(parse_qs(urlparse(link["url"]).query)["page"][0])
+    return 1
+
+# A 429, or a 403 that carries rate limit information, means "slow down" rather than "forbidden"
+def is_rate_limited(response):
+    if response.status_code == 429:
+        return True
+    return response.status_code == 403 and (
+        "Retry-After" in response.headers
+        or response.headers.get("X-RateLimit-Remaining") == "0"
+        or "rate limit" in response.text.lower()
+    )
+
+# Seconds to wait before retrying a rate-limited response: Retry-After or the window reset
+# when the API gives one, otherwise exponential backoff; jittered so that concurrent
+# requests don't all retry at the same moment
+def backoff_delay(response, attempt):
+    backoff = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt)
+    if "Retry-After" in response.headers:
+        return float(response.headers["Retry-After"]) + random.uniform(0, backoff)
+    if response.headers.get("X-RateLimit-Remaining") == "0" and "X-RateLimit-Reset" in response.headers:
+        return max(0.0, float(response.headers["X-RateLimit-Reset"]) - time.time()) + random.uniform(0, backoff)
+    return backoff / 2 + random.uniform(0, backoff / 2)
+
+# Convert GraphQL user and repository nodes into the REST field names the analyzer uses
+def rest_user(user):
+    return {
+        "login": user["login"],
+        "name": user["name"],
+        "avatar_url": user["avatarUrl"],
+        "bio": user["bio"],
+        "followers": user["followers"]["totalCount"],
+        "following": user["following"]["totalCount"],
+        "public_repos": user["repositories"]["totalCount"],
+    }
+
+def rest_repo(repo):
+    return {
+        "name": repo["name"],
+        "stargazers_count": repo["stargazerCount"],
+        "forks_count": repo["forkCount"],
+        "language": (repo["primaryLanguage"] or {}).get("name"),
+        "html_url": repo["url"],
+        "created_at": repo["createdAt"],
+        "pushed_at": repo["pushedAt"],
+        "size": repo["diskUsage"],
+        "fork": repo["isFork"],
+    }
+
+# Result of GitHubClient.get: `data` is the decoded JSON body, `from_cache` tells
+# whether the body came from the cache (fresh hit or 304 revalidation)
+GitHubResponse = namedtuple("GitHubResponse", ["status_code", "data", "headers", "from_cache"])
+
+# Rate limit budget of one API resource; reset_at is a Unix timestamp
+RateLimit = namedtuple("RateLimit", ["limit", "remaining", "reset_at"])
+
+
+class RateLimitExceeded(requests.RequestException):
+    """The rate limit budget won't come back within the allowed wait."""
+
+    def __init__(self, resource, reset_at):
+        self.resource = resource
+        self.reset_at = reset_at
+        super().__init__(f"GitHub {resource} rate limit exceeded; it resets at {time.strftime('%H:%M:%S', time.localtime(reset_at))}")
+
+
+class RateLimiter:
+    """Token bucket paced by the rate limit GitHub reports for one resource ("core" or "graphql").
+
+    While more than RATE_LIMIT_LOW_WATER of the budget is left, requests go out unpaced.
+    Below it, the bucket refills at remaining / seconds-until-reset, so the last requests
+    of the window are spread over it instead of failing at its end.
+    """
+
+    def __init__(self, burst=RATE_LIMIT_BURST, low_water=RATE_LIMIT_LOW_WATER):
+        self.burst = burst
+        self.low_water = low_water
+        self.limit = None
+        self.remaining = None
+        self.reset_at = 0.0
+        self.tokens = float(burst)
+        self.updated = time.time()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token for one request; returns the seconds to wait before sending it."""
+        with self._lock:
+            now = time.time()
+            if now >= self.reset_at:
+                # A new window starts with a full budget, which the next response will report
+                self.remaining = None
+            if self.remaining is not None and self.remaining <= 0:
+                return self.reset_at - now
+
+            if self.remaining is None or self.remaining > self.low_water * (self.limit or 0):
+                rate = None
+                self.tokens = float(self.burst)
+            else:
+                rate = self.remaining / (self.reset_at - now)
+                self.tokens = min(float(self.burst), self.tokens + (now - self.updated) * rate)
+            self.updated = now
+
+            # Count the request now, so concurrent callers see it before its response arrives
+            self.tokens -= 1
+            if self.remaining is not None:
+                self.remaining -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / rate
+
+    def update(self, headers):
+        """Read X-RateLimit-Limit/Remaining/Reset from a live response."""
+        if "X-RateLimit-Remaining" not in headers:
+            return
+        with self._lock:
+            remaining = int(headers["X-RateLimit-Remaining"])
+            reset_at = float(headers.get("X-RateLimit-Reset", 0))
+            # Responses arrive out of order; within one window the lowest count is the latest
+            if reset_at == self.reset_at and self.remaining is not None:
+                remaining = min(remaining, self.remaining)
+            self.limit = int(headers.get("X-RateLimit-Limit", self.limit or remaining))
+            self.remaining = remaining
+            self.reset_at = reset_at
+
+    def budget(self):
+        """The last known RateLimit, or None before the first response or after a reset."""
+        with self._lock:
+            if self.remaining is None or time.time() >= self.reset_at:
+                return None
+            return RateLimit(self.limit, max(self.remaining, 0), self.reset_at)
+
+
+class GitHubClient:
+    """Cached, conditional-request client for the GitHub REST API."""
+
+    def __init__(self, token=None, base_url=API_URL, cache_dir=CACHE_DIR, ttl=CACHE_TTL, pool_size=MAX_PAGE_WORKERS + 2, timeout=10, max_wait=MAX_RATE_LIMIT_WAIT):
+        self.base_url = base_url.rstrip("/")
+        self.ttl = ttl
+        self.timeout = timeout
+        self.max_wait = max_wait
+        # REST and GraphQL have separate budgets
+        self.rate_limiters = {"core": RateLimiter(), "graphql": RateLimiter()}
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._memory_cache = OrderedDict()
+        self._memory_lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["Accept"] = "application/vnd.github+json"
+        if token:
+            self.session.headers["Authorization"] = f"token {token}"
+
+    def url(self, path):
+        """Turn an API path such as "/users/octocat" into a full URL; full URLs pass through."""
+        return path if path.startswith("http") else f"{self.base_url}{path}"
+
+    def rate_limit(self, resource="core"):
+        """Remaining budget of "core" (REST) or "graphql" requests, or None while unknown."""
+        return self.rate_limiters[resource].budget()
+
+    def _send(self, method, url, resource="core", **kwargs):
+        """Send a request paced by the resource's rate limiter, retrying rate-limited responses.
+
+        Raises RateLimitExceeded when the budget won't return within max_wait seconds,
+        or when the request is still rate limited after MAX_RETRIES retries.
+        """
+        limiter = self.rate_limiters[resource]
+        for attempt in range(MAX_RETRIES + 1):
+            delay = limiter.reserve()
+            if delay > self.max_wait:
+                raise RateLimitExceeded(resource, time.time() + delay)
+            if delay > 0:
+                time.sleep(delay)
+
+            response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            limiter.update(response.headers)
+            if not is_rate_limited(response):
+                return response
+
+            delay = backoff_delay(response, attempt)
+            if attempt == MAX_RETRIES or delay > self.max_wait:
+                raise RateLimitExceeded(resource, time.time() + delay)
+            time.sleep(delay)
+
+    def _cache_path(self, url):
+        return self.cache_dir / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def _remember(self, url, entry):
+        # Page workers share the client, so the LRU order is updated under a lock
+        with self._memory_lock:
+            self._memory_cache[url] = entry
+            self._memory_cache.move_to_end(url)
+            while len(self._memory_cache) > MEMORY_CACHE_ENTRIES:
+                self._memory_cache.popitem(last=False)
+
+    def _load(self, url):
+        with self._memory_lock:
+            entry = self._memory_cache.get(url)
+            if entry is not None:
+                self._memory_cache.move_to_end(url)
+        if entry is None:
+            try:
+                entry = json.loads(self._cache_path(url).read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                return None
+            self._remember(url, entry)
+        return entry
+
+    def _store(self, url, entry):
+        self._remember(url, entry)
+        # Write to a temporary file first so a concurrent reader never sees a partial file
+        path = self._cache_path(url)
+        temporary = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        temporary.write_text(json.dumps(entry), encoding="utf-8")
+        temporary.replace(path)
+
+    def get(self, path, max_age=None):
+        """GET an API path, serving it from the cache when fresh and revalidating it with its ETag when stale."""
+        url = self.url(path)
+        max_age = self.ttl if max_age is None else max_age
+        entry = self._load(url)
+
+        if entry is not None and time.time() - entry["fetched_at"] < max_age:
+            return GitHubResponse(200, entry["data"], entry["headers"], True)
+
+        headers = {}
+        if entry is not None and entry["headers"].get("ETag"):
+            headers["If-None-Match"] = entry["headers"]["ETag"]
+
+        response = self._send("GET", url, headers=headers)
+
+        if response.status_code == 304 and entry is not None:
+            entry["fetched_at"] = time.time()
+            self._store(url, entry)
+            return GitHubResponse(200, entry["data"], entry["headers"], True)
+
+        try:
+            data = response.json()
+        except ValueError:
+            data = None
+
+        if response.status_code == 200:
+            kept_headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+            self._store(url, {"url": url, "fetched_at": time.time(), "data": data, "headers": kept_headers})
+
+        return GitHubResponse(response.status_code, data, response.headers, False)
+
+    def iter_pages(self, path, per_page=PER_PAGE, max_workers=MAX_PAGE_WORKERS):
+        """Yield the response for every page of a paginated endpoint.
+
+        The first page is yielded first; its Link header tells how many pages there are,
+        and the remaining pages are fetched on a bounded thread pool and yielded as they
+        complete, so callers can start using rows before the last page arrives.
+        """
+        separator = "&" if "?" in path else "?"
+        first = self.get(f"{path}{separator}per_page={per_page}")
+        yield first
+
+        last_page = last_page_number(first.headers.get("Link")) if first.status_code == 200 else 1
+        if last_page <= 1:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, last_page - 1))
+        try:
+            futures = [
+                executor.submit(self.get, f"{path}{separator}per_page={per_page}&page={page}")
+                for page in range(2, last_page + 1)
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # Stop queued pages if the caller stops iterating early
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def fetch_profile(self, username):
+        """Fetch a user and the first page of their repositories in parallel.
+
+        Repositories are listed most recently pushed first, so a caller that already has
+        older data can stop after the first page. Returns (user_response, first_page,
+        remaining_pages), where remaining_pages is the iter_pages generator positioned
+        after the first page; closing it skips the remaining requests.
+        """
+        repo_pages = self.iter_pages(f"/users/{username}/repos?sort=pushed")
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            user_future = executor.submit(self.get, f"/users/{username}")
+            first_page = next(repo_pages)
+            return user_future.result(), first_page, repo_pages
+
+    def graphql(self, query, variables, max_age=None):
+        """POST a GraphQL query; responses are cached by query and variables for the TTL (no ETags on POST)."""
+        url = f"{self.base_url}/graphql"
+        payload = {"query": query, "variables": variables}
+        cache_key = f"{url}#{json.dumps(payload, sort_keys=True)}"
+        max_age = self.ttl if max_age is None else max_age
+
+        entry = self._load(cache_key)
+        if entry is not None and time.time() - entry["fetched_at"] < max_age:
+            return GitHubResponse(200, entry["data"], entry["headers"], True)
+
+        response = self._send("POST", url, resource="graphql", json=payload)
+        try:
+            data = response.json()
+        except ValueError:
+            data = None
+        if response.status_code == 200 and data and not data.get("errors"):
+            self._store(cache_key, {"url": url, "fetched_at": time.time(), "data": data, "headers": {}})
+        return GitHubResponse(response.status_code, data, response.headers, False)
+
+    def fetch_profile_graphql(self, username):
+        """Fetch a profile over GraphQL, shaped like fetch_profile's REST result.
+
+        The first request returns the profile and up to 100 repositories; larger
+        accounts are paged with the query's cursor. Needs an authenticated client.
+        """
+        def page_response(response):
+            data = response.data if isinstance(response.data, dict) else {}
+            user = (data.get("data") or {}).get("user")
+            errors = data.get("errors") or []
+            if response.status_code == 200 and errors:
+                types = {error.get("type") for error in errors}
+                if "RATE_LIMITED" in types:
+                    raise RateLimitExceeded("graphql", time.time() + backoff_delay(response, MAX_RETRIES))
+                # A missing login comes back as a NOT_FOUND error. Any other error is passed on
+                # as a 502 carrying GitHub's messages, so it isn't mistaken for a missing user
+                if types != {"NOT_FOUND"}:
+                    message = "; ".join(error.get("message", "unknown error") for error in errors)
+                    return GitHubResponse(502, {"message": message}, response.headers, response.from_cache), None
+            if response.status_code != 200 or user is None:
+                status = 404 if response.status_code == 200 else response.status_code
+                return GitHubResponse(status, response.data, response.headers, response.from_cache), None
+            repos = [rest_repo(repo) for repo in user["repositories"]["nodes"]]
+            return GitHubResponse(200, repos, response.headers, response.from_cache), user
+
+        first_page, user = page_response(self.graphql(PROFILE_QUERY, {"login": username, "cursor": None}))
+        if user is None:
+            return first_page, first_page, iter(())
+        user_response = GitHubResponse(200, rest_user(user), first_page.headers, first_page.from_cache)
+
+        def remaining_pages(page_info):
+            while page_info["hasNextPage"]:
+                page, next_user = page_response(self.graphql(PROFILE_QUERY, {"login": username, "cursor": page_info["endCursor"]}))
+                yield page
+                if next_user is None:
+                    return
+                page_info = next_user["repositories"]["pageInfo"]
+
+        return user_response, first_page, remaining_pages(user["repositories"]["pageInfo"])
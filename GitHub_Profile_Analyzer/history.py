@@ -0,0 +1,196 @@
+# Local history of profile snapshots in SQLite.
+#
+# Every live fetch of a profile is stored as a snapshot: the profile counts at that
+# time plus each repository's stars, forks and size. The latest known state of every
+# repository is kept separately, which makes incremental refreshes possible:
+# repositories are requested most recently pushed first, and once the first page
+# reaches repositories that haven't been pushed since the last snapshot, the stored
+# rows stand in for the rest of the pages. Those rows are copied into the snapshot
+# flagged as carried forward: their stars and forks are as of an earlier fetch.
+#
+# Trends (stars over time, languages over time, top star gainers) are computed in SQL.
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+from analysis import REPO_FIELDS
+
+# Database file; history is kept across runs, unlike the response cache
+HISTORY_DB = Path(os.getenv("GITHUB_HISTORY_DB", Path(__file__).parent / "history.db"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    username TEXT NOT NULL COLLATE NOCASE,
+    fetched_at REAL NOT NULL,
+    followers INTEGER,
+    following INTEGER,
+    public_repos INTEGER
+);
+CREATE INDEX IF NOT EXISTS snapshots_by_user ON snapshots (username, fetched_at);
+
+CREATE TABLE IF NOT EXISTS repo_stats (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    language TEXT,
+    stars INTEGER NOT NULL,
+    forks INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    carried INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (snapshot_id, name)
+);
+
+CREATE TABLE IF NOT EXISTS repos (
+    username TEXT NOT NULL COLLATE NOCASE,
+    name TEXT NOT NULL,
+    stargazers_count INTEGER,
+    forks_count INTEGER,
+    language TEXT,
+    html_url TEXT,
+    created_at TEXT,
+    pushed_at TEXT,
+    size INTEGER,
+    fork INTEGER,
+    PRIMARY KEY (username, name)
+);
+"""
+
+# Stars, forks and followers of every snapshot of a user. A snapshot with carried-forward
+# rows has no star or fork totals (NULL): the carried counts weren't fetched at that time
+STARS_OVER_TIME = """
+SELECT s.fetched_at, s.followers, COUNT(r.name) AS repos,
+       CASE WHEN MAX(r.carried) THEN NULL ELSE COALESCE(SUM(r.stars), 0) END AS stars,
+       CASE WHEN MAX(r.carried) THEN NULL ELSE COALESCE(SUM(r.forks), 0) END AS forks
+FROM snapshots AS s LEFT JOIN repo_stats AS r ON r.snapshot_id = s.id
+WHERE s.username = ?
+GROUP BY s.id
+ORDER BY s.fetched_at
+"""
+
+# Repositories per language in every snapshot of a user
+LANGUAGES_OVER_TIME = """
+SELECT s.fetched_at, COALESCE(r.language, 'None') AS language, COUNT(*) AS repos
+FROM snapshots AS s JOIN repo_stats AS r ON r.snapshot_id = s.id
+WHERE s.username = ?
+GROUP BY s.id, r.language
+ORDER BY s.fetched_at
+"""
+
+# Stars gained by each repository between its first and latest fetched (not carried) row
+TOP_GAINERS = """
+SELECT name, MAX(last_stars) - MAX(first_stars) AS stars_gained, MAX(last_stars) AS stars
+FROM (
+    SELECT r.name,
+           FIRST_VALUE(r.stars) OVER history AS first_stars,
+           LAST_VALUE(r.stars) OVER history AS last_stars
+    FROM repo_stats AS r JOIN snapshots AS s ON s.id = r.snapshot_id
+    WHERE s.username = ? AND NOT r.carried
+    WINDOW history AS (PARTITION BY r.name ORDER BY s.fetched_at ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING)
+)
+GROUP BY name
+HAVING stars_gained != 0
+ORDER BY stars_gained DESC
+LIMIT ?
+"""
+
+# Combine the first page of a pushed-first repository listing with the stored repositories.
+# Returns the full list when the page reaches back past the newest stored push, every
+# stored repository pushed since the page's oldest push is on the page, and the merged
+# names number the profile's public_repos; otherwise None, and all pages are needed
+# (first visit, more than a page of changes, or deleted, renamed or hidden repositories).
+def merge_incremental(known_repos, first_page, public_repos):
+    if not known_repos or not first_page:
+        return None
+    newest_known = max(repo["pushed_at"] or "" for repo in known_repos)
+    oldest_on_page = first_page[-1]["pushed_at"] or ""
+    if oldest_on_page > newest_known:
+        return None
+    # The page lists everything pushed after its oldest push, so a stored name from that
+    # span missing from it is gone; a matching count elsewhere could otherwise hide it
+    page_names = {repo["name"] for repo in first_page}
+    if any((repo["pushed_at"] or "") > oldest_on_page and repo["name"] not in page_names for repo in known_repos):
+        return None
+    merged = {repo["name"]: repo for repo in known_repos}
+    merged.update((repo["name"], repo) for repo in first_page)
+    if len(merged) != public_repos:
+        return None
+    return list(merged.values())
+
+
+class HistoryStore:
+    """Snapshots and latest repository state of every analyzed profile."""
+
+    def __init__(self, path=HISTORY_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            # WAL lets sessions read history while another one writes a snapshot
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+            # Databases created before snapshots flagged carried-forward rows
+            if "carried" not in {row[1] for row in db.execute("PRAGMA table_info(repo_stats)")}:
+                db.execute("ALTER TABLE repo_stats ADD COLUMN carried INTEGER NOT NULL DEFAULT 0")
+
+    # A short-lived connection per call: Streamlit sessions run on different threads
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=10)
+        db.execute("PRAGMA foreign_keys=ON")
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def latest_repos(self, username):
+        """The stored repositories of a user, as API-shaped dicts."""
+        with self._connect() as db:
+            db.row_factory = sqlite3.Row
+            rows = db.execute(f"SELECT {', '.join(REPO_FIELDS)} FROM repos WHERE username = ?", (username,)).fetchall()
+        return [dict(row, fork=bool(row["fork"])) for row in rows]
+
+    def save_snapshot(self, user, repos, fetched_at=None, carried=()):
+        """Record a fetch and make its repositories the latest known state.
+
+        `carried` names the repositories copied from the stored state instead of fetched.
+        """
+        username = user["login"]
+        carried = set(carried)
+        with self._connect() as db:
+            snapshot_id = db.execute(
+                "INSERT INTO snapshots (username, fetched_at, followers, following, public_repos) VALUES (?, ?, ?, ?, ?)",
+                (username, fetched_at or time.time(), user["followers"], user["following"], user["public_repos"]),
+            ).lastrowid
+            db.executemany(
+                "INSERT INTO repo_stats (snapshot_id, name, language, stars, forks, size, carried) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(snapshot_id, r["name"], r["language"], r["stargazers_count"], r["forks_count"], r["size"], r["name"] in carried) for r in repos],
+            )
+            db.execute("DELETE FROM repos WHERE username = ?", (username,))
+            db.executemany(
+                f"INSERT INTO repos (username, {', '.join(REPO_FIELDS)}) VALUES (?{', ?' * len(REPO_FIELDS)})",
+                [(username, *(repo.get(field) for field in REPO_FIELDS)) for repo in repos],
+            )
+        return snapshot_id
+
+    def _query(self, sql, *parameters):
+        with self._connect() as db:
+            cursor = db.execute(sql, parameters)
+            columns = [column[0] for column in cursor.description]
+            return pd.DataFrame(cursor.fetchall(), columns=columns)
+
+    def stars_over_time(self, username):
+        frame = self._query(STARS_OVER_TIME, username)
+        frame["fetched_at"] = pd.to_datetime(frame["fetched_at"], unit="s", utc=True)
+        return frame
+
+    def languages_over_time(self, username):
+        frame = self._query(LANGUAGES_OVER_TIME, username)
+        frame["fetched_at"] = pd.to_datetime(frame["fetched_at"], unit="s", utc=True)
+        return frame
+
+    def top_gainers(self, username, limit=10):
+        return self._query(TOP_GAINERS, username, limit)
@@ -0,0 +1,108 @@
+# Load test: concurrent simulated sessions against the local mock server.
+#
+# Each session is a Streamlit AppTest of main.py that does what a visitor does:
+#   - open:    first render of the page
+#   - analyze: enter a username and wait for the profile, table and first view
+#   - switch:  pick another analysis view
+#   - revisit: rerun the page for the same username (revalidated with ETags, answered 304)
+# Sessions run in threads of one process, so like a real server they share the
+# process-wide client, caches and history database. The response cache TTL is 0 by
+# default, so every analyze goes to the mock server.
+#
+# Reports p50/p95 render latency per step and the requests the mock server answered.
+#
+# Run with: python load_test.py [--sessions 20] [--concurrency 5] [--latency 0.05] [--replay recordings]
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from mock_server import MockGitHubServer
+
+APP = Path(__file__).parent / "main.py"
+
+STEPS = ["open", "analyze", "switch", "revisit"]
+
+# Per-run timeout of a single AppTest step, in seconds
+STEP_TIMEOUT = 60
+
+# Nearest-rank percentile of a list of durations
+def percentile(durations, fraction):
+    ordered = sorted(durations)
+    return ordered[max(0, min(len(ordered) - 1, round(fraction * len(ordered)) - 1))]
+
+# One visitor; returns {step: seconds}
+def run_session(index, usernames):
+    from streamlit.testing.v1 import AppTest
+
+    username = usernames[index % len(usernames)]
+    app = AppTest.from_file(str(APP), default_timeout=STEP_TIMEOUT)
+    timings = {}
+
+    def timed(step, action):
+        started = time.perf_counter()
+        action()
+        timings[step] = time.perf_counter() - started
+        if app.exception:
+            raise RuntimeError(f"session {index}, {step}: {app.exception[0].message}")
+
+    timed("open", app.run)
+    timed("analyze", lambda: app.text_input[0].set_value(username).run())
+    views = app.segmented_control(key="analysis_tab").options
+    timed("switch", lambda: app.segmented_control(key="analysis_tab").set_value(views[1]).run())
+    timed("revisit", app.run)
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Drive the app with concurrent simulated sessions.")
+    parser.add_argument("--sessions", type=int, default=20, help="sessions in total (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, default=5, help="sessions at once (default: %(default)s)")
+    parser.add_argument("--latency", type=float, default=0.05, help="mock server latency per request (default: %(default)s)")
+    parser.add_argument("--replay", type=Path, metavar="DIR", help="serve profiles recorded with mock_server.py --record")
+    parser.add_argument("--user", action="append", default=[], metavar="NAME=REPOS", help="synthetic user and repository count (default: small=30, large=500)")
+    parser.add_argument("--cache-ttl", default="0", help="GITHUB_CACHE_TTL for the app (default: %(default)s)")
+    args = parser.parse_args()
+
+    if args.replay:
+        server = MockGitHubServer.from_recordings(args.replay, latency=args.latency)
+    else:
+        users = dict((name, int(count)) for name, count in (user.split("=") for user in args.user)) or {"small": 30, "large": 500}
+        server = MockGitHubServer(users, latency=args.latency)
+    server.start()
+    usernames = [user["login"] for user in server.users.values()]
+
+    # The app reads these at import time; point it at the mock and keep its caches out of the way
+    workdir = tempfile.mkdtemp(prefix="load-test-")
+    os.environ.update({
+        "GITHUB_API_URL": server.url,
+        "GITHUB_CACHE_DIR": str(Path(workdir) / "cache"),
+        "GITHUB_CACHE_TTL": args.cache_ttl,
+        "GITHUB_HISTORY_DB": str(Path(workdir) / "history.db"),
+        "GITHUB_TOKEN": "",
+    })
+
+    print(f"{args.sessions} sessions, {args.concurrency} at once, {len(usernames)} users, mock latency {args.latency * 1000:.0f} ms\n")
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        sessions = list(executor.map(run_session, range(args.sessions), [usernames] * args.sessions))
+    elapsed = time.perf_counter() - started
+    server.stop()
+
+    print(f"{'Step':<10}{'p50 (ms)':>10}{'p95 (ms)':>10}{'max (ms)':>10}")
+    for step in STEPS + ["session"]:
+        if step == "session":
+            durations = [sum(timings.values()) for timings in sessions]
+        else:
+            durations = [timings[step] for timings in sessions]
+        print(
+            f"{step:<10}{statistics.median(durations) * 1000:>10.0f}"
+            f"{percentile(durations, 0.95) * 1000:>10.0f}{max(durations) * 1000:>10.0f}"
+        )
+    print(
+        f"\n{args.sessions / elapsed:.1f} sessions/s; mock server answered {server.request_count} requests "
+        f"({server.not_modified_count} Not Modified)"
+    )
@@ -5,16 +5,56 @@ from dotenv import load_dotenv
 import os
 import requests
 import plotly.express as px
-import base64
+import time
 from pathlib import Path
+from github_client import GitHubClient, RateLimitExceeded
+from batch import build_frames, checkpoint_path, parse_usernames, run_batch
+from analysis import REPO_COLUMNS, build_repo_frame, data_version, summarize
+from history import HistoryStore, merge_incremental
+from static_assets import asset_url
 
 # Load environment variables from .env file for secure credential management
 load_dotenv()
 
 # Get GitHub token from environment variable for API authentication
 token = os.getenv('GITHUB_TOKEN')
-# Set up headers for GitHub API requests with token if available
-headers = {'Authorization': f'token {token}'} if token else {}
+
+# One client per process: its connection pool and response cache are shared by every rerun and session
+@st.cache_resource
+def get_client():
+    return GitHubClient(token=token)
+
+client = get_client()
+
+# Snapshots of every fetched profile, kept across runs for incremental refreshes and trends
+@st.cache_resource
+def get_history():
+    return HistoryStore()
+
+history = get_history()
+
+# Parse a fetch's repositories once; reruns over the same data reuse the frame and its aggregates
+@st.cache_data(max_entries=32)
+def analyze_repos(username, version, _repos):
+    repo_df = build_repo_frame(_repos)
+    return repo_df, summarize(repo_df)
+
+# Plotly figures are built once per (username, data version) and shared by reruns and sessions;
+# `build` is not part of the key. st.plotly_chart still validates and serializes the figure on
+# every run (about 2-3 ms a chart): it has no public way to take a prepared spec, and a dict
+# is validated back into a Figure, so only the build is cached
+@st.cache_resource(max_entries=128)
+def cached_figure(name, username, version, _build):
+    return _build()
+
+# Remaining API budget, as reported by the last live response
+def show_rate_limit(resource='core'):
+    budget = client.rate_limit(resource)
+    if budget is not None:
+        st.caption(
+            f"API budget: {budget.remaining:,} of {budget.limit:,} requests left, "
+            f"resets at {time.strftime('%H:%M', time.localtime(budget.reset_at))}."
+        )
 
 # Configure Streamlit page settings
 st.set_page_config(
@@ -26,22 +66,223 @@ st.set_page_config(
 # Main title of the application
 st.title('GitHub Profile Analyzer')
 
-# Input field for GitHub username
-username = st.text_input('Enter GitHub username')
+# Team leaderboard: fetch a whole roster concurrently, resuming from the checkpoint of an earlier run
+def render_leaderboard():
+    names_text = st.text_area('GitHub usernames', help='One per line, or separated by commas or spaces.')
+    names_file = st.file_uploader('Or upload a file of usernames', type=['txt', 'csv'])
+    if names_file is not None:
+        names_text += '\n' + names_file.getvalue().decode('utf-8', errors='replace')
+    usernames = parse_usernames(names_text)
+    if not usernames:
+        st.warning('Please enter at least one GitHub username.')
+        return
 
-if username:
-    # API endpoints for user data and repositories
-    user_url = f'https://api.github.com/users/{username}'
-    repo_url = f'https://api.github.com/users/{username}/repos?per_page=50'
+    roster_key = checkpoint_path(usernames).stem
+    fresh = st.checkbox('Start fresh', help='Fetch every account again instead of resuming an unfinished run.')
+    if st.button(f'Analyze {len(usernames)} accounts', type='primary'):
+        progress = st.progress(0.0)
+        live_table = st.empty()
+        records = []
+        for record in run_batch(client, usernames, fresh=fresh):
+            records.append(record)
+            progress.progress(len(records) / len(usernames), text=f"Fetched {len(records)} of {len(usernames)} accounts")
+            # Redraw the provisional ranking every few accounts rather than on every one
+            if len(records) % 10 == 0:
+                live_table.dataframe(build_frames(records)[1], hide_index=True)
+        progress.empty()
+        live_table.empty()
+        st.session_state['leaderboard'] = (roster_key, records)
+
+    roster, records = st.session_state.get('leaderboard', (None, []))
+    if roster != roster_key:
+        return
+
+    repos_df, leaderboard = build_frames(records)
+    resumed = sum(1 for record in records if record.get('resumed'))
+    missing = [record['username'] for record in records if record['status'] == 'not_found']
+    failed = [record['username'] for record in records if record['status'] == 'error']
+    if resumed:
+        st.caption(f'{resumed} accounts resumed from the checkpoint of an earlier run.')
+    if missing:
+        st.warning(f"Not found: {', '.join(missing)}")
+    if failed:
+        st.error(f"Could not load: {', '.join(failed)}. Run the batch again to retry them.")
+    show_rate_limit()
+
+    st.header('Leaderboard')
+    st.dataframe(leaderboard, hide_index=True)
+    st.download_button('Download leaderboard (CSV)', leaderboard.to_csv(index=False), 'leaderboard.csv', 'text/csv')
+    st.header('All Repositories')
+    st.dataframe(repos_df, hide_index=True)
+    st.download_button('Download repositories (CSV)', repos_df.to_csv(index=False), 'repositories.csv', 'text/csv')
+
+# Analysis views. Only the selected view runs, and switching views reruns just this
+# fragment, so the profile and the repository table above aren't rebuilt or resent
+ANALYSIS_TABS = ['Top Repositories', 'Language Analysis', 'Repository Insights', 'Activity Stats', 'History']
+
+@st.fragment
+def analysis_tabs(username, version, repo_df, summary, login):
+    # Deselecting the current view falls back to the first one
+    tab = st.segmented_control('View', ANALYSIS_TABS, default=ANALYSIS_TABS[0], key='analysis_tab', label_visibility='collapsed') or ANALYSIS_TABS[0]
+
+    # Tab 1: Visualize top repositories by stars
+    if tab == 'Top Repositories':
+        st.subheader('Top 10 Repositories by Stars')
+
+        # Create horizontal bar chart for top repos
+        fig1 = cached_figure('top_repos', username, version, lambda: px.bar(
+            summary.top_repos,
+            x='stargazers_count',
+            y='name',
+            orientation='h',
+            labels={"stargazers_count": "Stars", "name": "Repository"},
+            color='stargazers_count',
+        ))
+        st.plotly_chart(fig1, use_container_width=True)
+    
+    # Tab 2: Analyze programming languages used
+    if tab == 'Language Analysis':
+        st.subheader('🧠 Language Distribution')
+        col1, col2 = st.columns(2)
+        
+        # Create pie chart for language distribution
+        with col1:
+            fig2 = cached_figure('languages', username, version, lambda: px.pie(
+                summary.language_count,
+                values='Count',
+                names='Language',
+                title='Language Usage'
+            ))
+            st.plotly_chart(fig2, use_container_width=True)
+        
+        # Display language statistics in table format
+        with col2:
+            st.subheader("Top Languages")
+            st.table(summary.language_count.head())
+
+    # Tab 3: Show repository statistics and insights
+    if tab == 'Repository Insights':
+        st.subheader('📊 Repository Statistics')
+        
+        # Display key metrics in columns
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("Total Stars", summary.total_stars)
+        
+        with col2:
+            st.metric("Total Forks", summary.total_forks)
+        
+        with col3:
+            st.metric("Fork Ratio", f"{summary.fork_ratio:.1f}%")
+        
+        # Visualize most forked repositories
+        st.subheader("Most Forked Repositories")
+        fig3 = cached_figure('top_forked', username, version, lambda: px.bar(
+            summary.top_forked,
+            x='name',
+            y='forks_count',
+            title='Top 5 Most Forked Repositories'
+        ))
+        st.plotly_chart(fig3, use_container_width=True)
+
+    # Tab 4: Show repository activity over time
+    if tab == 'Activity Stats':
+        st.subheader('📈 Repository Activity')
+        
+        # Create timeline visualization of repositories created per year
+        fig4 = cached_figure('timeline', username, version, lambda: px.line(
+            summary.yearly,
+            x='Year',
+            y='Number of Repositories',
+            title='Repository Creation Timeline',
+            markers=True
+        ))
+        st.plotly_chart(fig4, use_container_width=True)
+        
+        # Show repository size distribution
+        st.subheader("Repository Size Distribution")
+        fig5 = cached_figure('sizes', username, version, lambda: px.histogram(
+            repo_df,
+            x='size',
+            title='Repository Size Distribution (KB)',
+            nbins=20
+        ))
+        st.plotly_chart(fig5, use_container_width=True)
+
+    # Tab 5: Trends across the stored snapshots of this profile, aggregated in SQLite
+    if tab == 'History':
+        st.subheader('📜 Profile History')
+        stars_history = history.stars_over_time(login)
+        if len(stars_history) < 2:
+            st.info('History builds up each time this profile is fetched again.')
+        else:
+            # Snapshots are only ever added, so their count versions the history charts
+            history_version = len(stars_history)
+            # Snapshots with carried-forward rows have no star or fork totals; the lines bridge them
+            fig6 = cached_figure('history', login, history_version, lambda: px.line(
+                stars_history,
+                x='fetched_at',
+                y=['stars', 'forks', 'followers'],
+                labels={'fetched_at': 'Fetched', 'value': 'Count', 'variable': ''},
+                title='Stars, Forks and Followers Over Time',
+                markers=True
+            ).update_traces(connectgaps=True))
+            st.plotly_chart(fig6, use_container_width=True)
+
+            fig7 = cached_figure('history_languages', login, history_version, lambda: px.area(
+                history.languages_over_time(login),
+                x='fetched_at',
+                y='repos',
+                color='language',
+                labels={'fetched_at': 'Fetched', 'repos': 'Repositories', 'language': 'Language'},
+                title='Repositories by Language Over Time'
+            ))
+            st.plotly_chart(fig7, use_container_width=True)
 
-    # Make API requests to GitHub
-    user_response = requests.get(user_url, headers=headers)
-    repos_respnse = requests.get(repo_url, headers=headers)
+            st.subheader('Top Star Gainers')
+            gainers = history.top_gainers(login)
+            if gainers.empty:
+                st.write('No repository has gained or lost stars since the first snapshot.')
+            else:
+                st.table(gainers)
+
+mode = st.radio('Mode', ['Single profile', 'Team leaderboard'], horizontal=True)
+
+username = None
+if mode == 'Team leaderboard':
+    render_leaderboard()
+else:
+    # Input field for GitHub username
+    username = st.text_input('Enter GitHub username')
+
+    # GraphQL loads the profile and 100 repositories per request, but the API only accepts it with a token
+    api_mode = st.radio('API', ['REST', 'GraphQL'], horizontal=True, help='GraphQL needs GITHUB_TOKEN to be set.')
+    if api_mode == 'GraphQL' and not token:
+        st.info('GraphQL needs a GitHub token; using REST instead.')
+        api_mode = 'REST'
+    full_refresh = st.checkbox('Full refresh', help='Download every repository again, not only those pushed since the last visit.')
+
+if username:
+    # Fetch the user and the first page of repositories at the same time
+    # (served from the local cache when fresh, revalidated with ETags otherwise);
+    # the remaining repository pages stream in below
+    try:
+        if api_mode == 'GraphQL':
+            user_response, first_page, repo_pages = client.fetch_profile_graphql(username)
+        else:
+            user_response, first_page, repo_pages = client.fetch_profile(username)
+    except RateLimitExceeded as error:
+        st.error(f'{error}. Please try again later.')
+        st.stop()
+    except requests.RequestException as error:
+        st.error(f'Could not reach GitHub: {error}')
+        st.stop()
 
     # Check if the API requests were successful
-    if user_response.status_code == 200 and repos_respnse.status_code == 200:
-        user_data = user_response.json()
-        repos_data = repos_respnse.json()
+    if user_response.status_code == 200 and first_page.status_code == 200:
+        user_data = user_response.data
+        repos_data = list(first_page.data)
 
         # Display user profile information
         st.header('Profile Header')
@@ -62,142 +303,83 @@ if username:
         # Repository Analysis Section
         st.header('Repositories Overview')
 
-        # Convert repository data to DataFrame for analysis
-        repo_df = pd.DataFrame(repos_data)
+        # Fill the repository table in as the remaining pages arrive
+        repo_table = st.empty()
+        repo_table.dataframe(pd.DataFrame(repos_data, columns=REPO_COLUMNS))
+        progress = st.progress(0.0)
+        all_from_cache = user_response.from_cache and first_page.from_cache
+        complete = True
 
-        if not repo_df.empty:
-            # Select relevant columns for analysis
-            repo_df = repo_df[['name', 'stargazers_count', 'forks_count', 'language', 'html_url', 'created_at', 'size', 'fork']]
-            # Format creation date for better readability
-            repo_df['created_at'] = pd.to_datetime(repo_df['created_at']).dt.strftime('%B %d, %Y')
-            # Sort repositories by stars (most popular first)
-            repo_df = repo_df.sort_values(by='stargazers_count', ascending=False)
-            st.dataframe(repo_df)
-            
-            # Create tabs for different analysis views
-            tab1, tab2, tab3, tab4 = st.tabs([
-                'Top Repositories', 
-                'Language Analysis', 
-                'Repository Insights',
-                'Activity Stats'
-            ])
-
-            # Tab 1: Visualize top repositories by stars
-            with tab1:
-                st.subheader('Top 10 Repositories by Stars')
-                top_repos = repo_df.head(10)
-
-                # Create horizontal bar chart for top repos
-                fig1 = px.bar(
-                    top_repos,
-                    x='stargazers_count',
-                    y='name',
-                    orientation='h',
-                    labels={"stargazers_count": "Stars", "name": "Repository"},
-                    color='stargazers_count',
+        # Repositories come most recently pushed first; if the first page already reaches
+        # back to the last snapshot, the rest are unchanged and come from the history store
+        merged = None
+        carried = set()
+        if not full_refresh:
+            merged = merge_incremental(history.latest_repos(user_data['login']), first_page.data, user_data['public_repos'])
+        if merged is not None:
+            repo_pages.close()
+            carried = {repo['name'] for repo in merged} - {repo['name'] for repo in repos_data}
+            st.caption(
+                f'Refreshed incrementally: {len(repos_data)} recently pushed repositories downloaded, '
+                f'{len(merged) - len(repos_data)} unchanged ones loaded from history.'
+            )
+            repos_data = merged
+
+        try:
+            for page in repo_pages:
+                if page.status_code != 200:
+                    st.warning('Some repositories could not be loaded.')
+                    complete = False
+                    continue
+                all_from_cache = all_from_cache and page.from_cache
+                repos_data.extend(page.data)
+                repo_table.dataframe(pd.DataFrame(repos_data, columns=REPO_COLUMNS))
+                progress.progress(
+                    min(len(repos_data) / max(user_data['public_repos'], 1), 1.0),
+                    text=f"Loaded {len(repos_data)} of {user_data['public_repos']} repositories",
                 )
-                st.plotly_chart(fig1, use_container_width=True)
+        except requests.RequestException as error:
+            st.warning(f'Some repositories could not be loaded: {error}')
+            complete = False
+        progress.empty()
+
+        # Record a snapshot whenever something new came over the network
+        if complete and not all_from_cache:
+            history.save_snapshot(user_data, repos_data, carried=carried)
+
+        if all_from_cache:
+            st.caption('Served from the local cache.')
+        show_rate_limit('graphql' if api_mode == 'GraphQL' else 'core')
+
+        # One typed frame per fetch; every tab below is derived from it
+        repos_version = data_version(repos_data)
+        repo_df, summary = analyze_repos(username, repos_version, repos_data)
+
+        if not repo_df.empty:
+            repo_table.dataframe(
+                repo_df,
+                column_config={'created_at': st.column_config.DatetimeColumn(format='MMMM DD, YYYY')},
+            )
             
-            # Tab 2: Analyze programming languages used
-            with tab2:
-                st.subheader('🧠 Language Distribution')
-                col1, col2 = st.columns(2)
-                
-                # Create pie chart for language distribution
-                with col1:
-                    language_count = repo_df['language'].dropna().value_counts().reset_index()
-                    language_count.columns = ['Language', 'Count']
-                    fig2 = px.pie(
-                        language_count,
-                        values='Count',
-                        names='Language',
-                        title='Language Usage'
-                    )
-                    st.plotly_chart(fig2, use_container_width=True)
-                
-                # Display language statistics in table format
-                with col2:
-                    st.subheader("Top Languages")
-                    st.table(language_count.head())
-
-            # Tab 3: Show repository statistics and insights
-            with tab3:
-                st.subheader('📊 Repository Statistics')
-                
-                # Display key metrics in columns
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    total_stars = repo_df['stargazers_count'].sum()
-                    st.metric("Total Stars", total_stars)
-                
-                with col2:
-                    total_forks = repo_df['forks_count'].sum()
-                    st.metric("Total Forks", total_forks)
-                
-                with col3:
-                    fork_ratio = (repo_df['fork'].sum() / len(repo_df)) * 100
-                    st.metric("Fork Ratio", f"{fork_ratio:.1f}%")
-                
-                # Visualize most forked repositories
-                st.subheader("Most Forked Repositories")
-                top_forked = repo_df.nlargest(5, 'forks_count')[['name', 'forks_count']]
-                fig3 = px.bar(
-                    top_forked,
-                    x='name',
-                    y='forks_count',
-                    title='Top 5 Most Forked Repositories'
-                )
-                st.plotly_chart(fig3, use_container_width=True)
-
-            # Tab 4: Show repository activity over time
-            with tab4:
-                st.subheader('📈 Repository Activity')
-                
-                # Analyze repository creation timeline
-                timeline_df = pd.DataFrame(repos_data)[['created_at']]
-                timeline_df['created_at'] = pd.to_datetime(timeline_df['created_at'])
-                
-                # Group repositories by creation year
-                yearly_repos = timeline_df.groupby(timeline_df['created_at'].dt.year).size().reset_index()
-                yearly_repos.columns = ['Year', 'Number of Repositories']
-                
-                # Create timeline visualization
-                fig4 = px.line(
-                    yearly_repos,
-                    x='Year',
-                    y='Number of Repositories',
-                    title='Repository Creation Timeline',
-                    markers=True
-                )
-                st.plotly_chart(fig4, use_container_width=True)
-                
-                # Show repository size distribution
-                st.subheader("Repository Size Distribution")
-                fig5 = px.histogram(
-                    repo_df,
-                    x='size',
-                    title='Repository Size Distribution (KB)',
-                    nbins=20
-                )
-                st.plotly_chart(fig5, use_container_width=True)
+            analysis_tabs(username, repos_version, repo_df, summary, user_data['login'])
         else:
+            repo_table.empty()
             st.warning('No repositories found for this user.')
-    else:
+    elif user_response.status_code == 404:
         st.warning('Invalid GitHub username.')
-else:
+    else:
+        failed = first_page if user_response.status_code == 200 else user_response
+        message = failed.data.get('message') if isinstance(failed.data, dict) else None
+        st.error(f"GitHub returned HTTP {failed.status_code}: {message or 'unknown error'}")
+elif mode == 'Single profile':
     st.warning('Please enter a GitHub username.')
 
 
 # Footer section with attribution
-def img_to_base64(img_path):
-    """Convert an image file to base64 string for embedding in HTML"""
-    with open(img_path, "rb") as img_file:
-        return base64.b64encode(img_file.read()).decode()
-
-# Load and prepare profile image for footer
+# The profile image is resized once per process (2x its 50px display size for sharp
+# high-DPI rendering) and served from the static folder by URL
 img_path = Path(__file__).parent / "assets" / "osama.png"
-img_base64 = img_to_base64(str(img_path))
+img_url = asset_url(img_path, width=100)
 
 # Add footer separator and content
 st.markdown("---")
@@ -205,7 +387,7 @@ st.markdown(
     f'<div style="display: flex; align-items: center; justify-content: center;">'
     f'<p>Built with ❤️ by '
     f'<a href="https://github.com/OsamabinAdnan">Osama bin Adnan</a> '
-    f'<img src="data:image/png;base64,{img_base64}" style="width: 50px; height: 50px; border-radius: 50%; margin-left: 5px;">'
+    f'<img src="{img_url}" style="width: 50px; height: 50px; border-radius: 50%; margin-left: 5px;">'
     f'</p></div>', 
     unsafe_allow_html=True
 )
\ No newline at end of file
@@ -0,0 +1,299 @@
+# Local stand-in for the GitHub API, for benchmarks, load tests and offline development.
+#
+# Serves a fixed set of users, either synthetic (a repository count) or recorded from
+# the real API with --record:
+#   GET  /users/{username}          profile
+#   GET  /users/{username}/repos    repositories, paginated with per_page/page and a Link header;
+#                                   sort=pushed lists the most recently pushed first
+#   POST /graphql                   the analyzer's PROFILE_QUERY, paginated by cursor, pushed first
+# Like GitHub, GET responses carry an ETag and answer a matching If-None-Match with
+# 304 Not Modified, and every response carries X-RateLimit-* headers. Requests past
+# the limit get 403 until the window resets; 304s don't count against it.
+# Every request waits `latency` seconds to simulate a network round trip.
+#
+# Run it standalone and point the analyzer at it:
+#   python mock_server.py --port 8765 --latency 0.05
+#   GITHUB_API_URL=http://127.0.0.1:8765 streamlit run main.py
+#
+# Record real profiles once (GITHUB_TOKEN raises the rate limit), then replay them:
+#   python mock_server.py --record octocat --record torvalds --recordings recordings
+#   python mock_server.py --replay recordings
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlencode, urlparse
+
+LANGUAGES = ["Python", "JavaScript", "Go", "Rust", "TypeScript", None]
+
+# Deterministic synthetic profile and repositories for a user
+def make_user(username, repo_count):
+    return {
+        "login": username,
+        "name": username.title(),
+        "avatar_url": f"https://avatars.githubusercontent.com/{username}",
+        "bio": f"Synthetic profile with {repo_count} repositories",
+        "followers": repo_count * 3,
+        "following": repo_count // 2,
+        "public_repos": repo_count,
+    }
+
+def make_repos(username, repo_count):
+    return [
+        {
+            "name": f"{username}-repo-{index}",
+            "stargazers_count": (index * 37) % 1000,
+            "forks_count": (index * 11) % 200,
+            "language": LANGUAGES[index % len(LANGUAGES)],
+            "html_url": f"https://github.com/{username}/{username}-repo-{index}",
+            "created_at": f"{2010 + index % 15}-{1 + index % 12:02d}-15T12:00:00Z",
+            "pushed_at": f"{2024 + index % 2}-{1 + index % 12:02d}-20T08:30:00Z",
+            "size": (index * 97) % 50000,
+            "fork": index % 5 == 0,
+        }
+        for index in range(repo_count)
+    ]
+
+# The same repository in GraphQL field names
+def graphql_repo(repo):
+    return {
+        "name": repo["name"],
+        "stargazerCount": repo["stargazers_count"],
+        "forkCount": repo["forks_count"],
+        "primaryLanguage": {"name": repo["language"]} if repo["language"] else None,
+        "url": repo["html_url"],
+        "createdAt": repo["created_at"],
+        "pushedAt": repo["pushed_at"],
+        "diskUsage": repo["size"],
+        "isFork": repo["fork"],
+    }
+
+# Fetch a real profile and all of its repositories and save them as {directory}/{login}.json.
+# The pages are stored as one list; the mock server paginates them again on replay.
+def record_profile(username, directory, token=None):
+    import tempfile
+
+    from github_client import GitHubClient
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        user, first_page, remaining_pages = GitHubClient(token=token, cache_dir=cache_dir).fetch_profile(username)
+        if user.status_code != 200 or first_page.status_code != 200:
+            raise SystemExit(f"Could not record {username}: HTTP {user.status_code}")
+        repos = list(first_page.data)
+        for page in remaining_pages:
+            repos.extend(page.data)
+
+    path = Path(directory) / f"{user.data['login']}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"user": user.data, "repos": repos, "recorded_at": time.time()}), encoding="utf-8")
+    return path
+
+
+class MockGitHubServer:
+    """Threaded HTTP server that answers like the GitHub API.
+
+    `users` maps a username to a repository count (synthetic data) or to a recorded
+    profile {"user": {...}, "repos": [...]}. Each rate limit resource ("core" for REST,
+    "graphql") allows `rate_limit` requests per `rate_window` seconds.
+    """
+
+    def __init__(self, users, latency=0.0, host="127.0.0.1", port=0, rate_limit=5000, rate_window=3600):
+        # Logins are case-insensitive, so users are looked up by their lowercase name
+        self.users = {}
+        self.repos = {}
+        for name, profile in users.items():
+            if isinstance(profile, int):
+                user, repos = make_user(name, profile), make_repos(name, profile)
+            else:
+                user, repos = profile["user"], profile["repos"]
+            self.users[name.lower()] = user
+            self.repos[name.lower()] = repos
+        self.repos_by_push = {
+            name: sorted(repos, key=lambda repo: repo["pushed_at"] or "", reverse=True) for name, repos in self.repos.items()
+        }
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.request_count = 0
+        self.not_modified_count = 0
+        self._rate_windows = {}
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self.url = f"http://{host}:{self.server.server_port}"
+
+    @classmethod
+    def from_recordings(cls, directory, **kwargs):
+        """Serve every profile recorded with record_profile in `directory`."""
+        profiles = {}
+        for path in sorted(Path(directory).glob("*.json")):
+            profile = json.loads(path.read_text(encoding="utf-8"))
+            profiles[profile["user"]["login"]] = profile
+        return cls(profiles, **kwargs)
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _spend(self, resource, cost):
+        """Charge `cost` requests to a resource; returns (allowed, rate limit headers)."""
+        with self._lock:
+            self.request_count += 1
+            self.not_modified_count += cost == 0
+            now = time.time()
+            reset_at, used = self._rate_windows.get(resource, (0, 0))
+            if now >= reset_at:
+                reset_at, used = now + self.rate_window, 0
+            allowed = used + cost <= self.rate_limit
+            if allowed:
+                used += cost
+            self._rate_windows[resource] = (reset_at, used)
+        return allowed, {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(self.rate_limit - used),
+            "X-RateLimit-Reset": str(int(reset_at)),
+            "X-RateLimit-Used": str(used),
+            "X-RateLimit-Resource": resource,
+        }
+
+    def _handler_class(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def send_body(self, status, data, headers):
+                self.send_response(status)
+                if data:
+                    self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def send_rate_limited(self, rate_headers):
+                body = {"message": "API rate limit exceeded", "documentation_url": "https://docs.github.com/rest/rate-limit"}
+                self.send_body(403, json.dumps(body).encode(), rate_headers)
+
+            def do_GET(self):
+                time.sleep(mock.latency)
+                status, body, headers = self.route()
+                data = json.dumps(body).encode()
+
+                # Weak ETag of the body, as GitHub sends; a match costs no rate limit
+                etag = f'W/"{hashlib.sha1(data).hexdigest()}"'
+                not_modified = status == 200 and etag in self.headers.get("If-None-Match", "")
+                allowed, rate_headers = mock._spend("core", 0 if not_modified else 1)
+
+                if not allowed:
+                    return self.send_rate_limited(rate_headers)
+                if status == 200:
+                    headers["ETag"] = etag
+                if not_modified:
+                    return self.send_body(304, b"", {"ETag": etag, **rate_headers})
+                self.send_body(status, data, {**headers, **rate_headers})
+
+            # (status, body, headers) for a GET path
+            def route(self):
+                url = urlparse(self.path)
+                parts = url.path.strip("/").split("/")
+                if len(parts) < 2 or parts[0] != "users" or parts[1].lower() not in mock.users:
+                    return 404, {"message": "Not Found"}, {}
+                username = parts[1].lower()
+                if len(parts) == 2:
+                    return 200, mock.users[username], {}
+                if len(parts) == 3 and parts[2] == "repos":
+                    return self.repos_page(username, parse_qs(url.query), url.path)
+                return 404, {"message": "Not Found"}, {}
+
+            def repos_page(self, username, query, path):
+                per_page = min(int(query.get("per_page", ["30"])[0]), 100)
+                page = int(query.get("page", ["1"])[0])
+                repos = (mock.repos_by_push if query.get("sort") == ["pushed"] else mock.repos)[username]
+                last_page = max(1, -(-len(repos) // per_page))
+                headers = {}
+                if last_page > 1:
+                    links = []
+                    if page < last_page:
+                        links.append(f'<{mock.url}{path}?{self.page_query(query, page + 1)}>; rel="next"')
+                    links.append(f'<{mock.url}{path}?{self.page_query(query, last_page)}>; rel="last"')
+                    headers["Link"] = ", ".join(links)
+                return 200, repos[(page - 1) * per_page:page * per_page], headers
+
+            # The request's query string with a different page number
+            def page_query(self, query, page):
+                return urlencode({**{name: values[0] for name, values in query.items()}, "page": page})
+
+            def do_POST(self):
+                time.sleep(mock.latency)
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                allowed, rate_headers = mock._spend("graphql", 1)
+                if not allowed:
+                    return self.send_rate_limited(rate_headers)
+                if urlparse(self.path).path != "/graphql":
+                    return self.send_body(404, json.dumps({"message": "Not Found"}).encode(), rate_headers)
+                self.send_body(200, json.dumps(self.graphql(payload.get("variables", {}))).encode(), rate_headers)
+
+            def graphql(self, variables):
+                username = (variables.get("login") or "").lower()
+                if username not in mock.users:
+                    return {"data": {"user": None}, "errors": [{"type": "NOT_FOUND"}]}
+
+                start = int(variables.get("cursor") or 0)
+                repos = mock.repos_by_push[username]
+                user = mock.users[username]
+                return {"data": {"user": {
+                    "login": user["login"],
+                    "name": user["name"],
+                    "avatarUrl": user["avatar_url"],
+                    "bio": user["bio"],
+                    "followers": {"totalCount": user["followers"]},
+                    "following": {"totalCount": user["following"]},
+                    "repositories": {
+                        "totalCount": len(repos),
+                        "pageInfo": {"hasNextPage": start + 100 < len(repos), "endCursor": str(start + 100)},
+                        "nodes": [graphql_repo(repo) for repo in repos[start:start + 100]],
+                    },
+                }}}
+
+        return Handler
+
+
+if __name__ == "__main__":
+    import os
+
+    parser = argparse.ArgumentParser(description="Serve synthetic or recorded GitHub API responses locally.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every request")
+    parser.add_argument("--rate-limit", type=int, default=5000, help="requests per hour for each resource (default: %(default)s)")
+    parser.add_argument("--user", action="append", default=[], metavar="NAME=REPOS", help="synthetic user and repository count (default: octocat=250)")
+    parser.add_argument("--replay", type=Path, metavar="DIR", help="serve the profiles recorded in this directory")
+    parser.add_argument("--record", action="append", default=[], metavar="NAME", help="record this real profile into --recordings and exit")
+    parser.add_argument("--recordings", type=Path, default=Path("recordings"), help="where --record writes (default: %(default)s)")
+    args = parser.parse_args()
+
+    if args.record:
+        for username in args.record:
+            print(f"Recorded {username} to {record_profile(username, args.recordings, os.getenv('GITHUB_TOKEN'))}")
+        raise SystemExit
+
+    options = {"latency": args.latency, "port": args.port, "rate_limit": args.rate_limit}
+    if args.replay:
+        server = MockGitHubServer.from_recordings(args.replay, **options)
+    else:
+        users = dict((name, int(count)) for name, count in (user.split("=") for user in args.user)) or {"octocat": 250}
+        server = MockGitHubServer(users, **options)
+    print(f"Mock GitHub API at {server.url} for {', '.join(user['login'] for user in server.users.values())}")
+    server.server.serve_forever()
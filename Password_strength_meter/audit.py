@@ -0,0 +1,201 @@
+# Bulk password audit, e.g. of an exported credential list or a test fixture.
+#
+# - Entries are plaintext passwords or hashes. SHA-1 hashes (as in Have I Been Pwned
+#   exports) are checked against the blocklist; other hash formats (MD5/NTLM, SHA-256,
+#   crypt strings such as bcrypt) are counted but can't be scored.
+# - Entries are scored in chunks on a pool of worker processes. Each worker opens the
+#   blocklist once; as a memory map, its pages are shared by all of them.
+# - Results stream back chunk by chunk into an AuditSummary: the strength distribution,
+#   the most common failing rules, the blocklist hit rate and the throughput.
+# - Per-entry rows carry the line number, never the password itself.
+#
+# Run from the command line:
+#   python audit.py passwords.txt --output results.csv
+import csv
+import io
+import multiprocessing
+import os
+import re
+import sys
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from blocklist import load_blocklist
+from strength import check_password_strength, estimate_strength
+
+# Entries per task; large enough that pickling is a small share of each task
+AUDIT_CHUNK_SIZE = 1000
+
+AUDIT_WORKERS = os.cpu_count() or 1
+
+# Strength of a hash that isn't known to be breached
+UNSCORED = "🔒 Hashed (not scored)"
+
+SHA1_HASH = re.compile(r"[0-9a-fA-F]{40}")
+OTHER_HASH = re.compile(r"[0-9a-fA-F]{32}|[0-9a-fA-F]{64}|[0-9a-fA-F]{128}|\$[0-9a-z]+\$\S+")
+
+# One audited entry; `line` is its 1-based position in the input
+AuditRow = namedtuple("AuditRow", ["line", "kind", "strength", "score", "guesses_log10", "blocklisted", "failing"])
+
+# Entries of an uploaded file as (entries, skipped): one per line, or the "password" or
+# "hash" column of a CSV. CSV rows too short to reach that column, blank ones included,
+# are skipped and counted
+def parse_entries(text):
+    first_line = text.split("\n", 1)[0].strip().lower()
+    columns = [column.strip() for column in first_line.split(",")]
+    for name in ("password", "hash"):
+        if "," in first_line and name in columns:
+            index = columns.index(name)
+            rows = list(csv.reader(io.StringIO(text)))[1:]
+            entries = [row[index] for row in rows if len(row) > index]
+            return entries, len(rows) - len(entries)
+    return [line.rstrip("\r") for line in text.split("\n") if line.strip()], 0
+
+# ------------------------------------------------------------------------------
+# Workers
+# ------------------------------------------------------------------------------
+_blocklist = None
+
+def _init_worker():
+    global _blocklist
+    _blocklist = load_blocklist()
+
+def audit_entry(line, entry, blocklist):
+    if SHA1_HASH.fullmatch(entry):
+        blocklisted = blocklist.contains_hash(int(entry[:16], 16))
+        strength, score = ("❌ Very Weak", 0) if blocklisted else (UNSCORED, None)
+        return AuditRow(line, "sha1", strength, score, None, blocklisted, [])
+    if OTHER_HASH.fullmatch(entry):
+        return AuditRow(line, "hash", UNSCORED, None, None, False, [])
+
+    # Breached passwords score 0 without an estimate; the blocklist is searched once
+    blocklisted = entry in blocklist
+    estimate = None if blocklisted else estimate_strength(entry)
+    score, strength, failing = check_password_strength(entry, blocklist, estimate, blocklisted=blocklisted)
+    guesses_log10 = round(estimate.guesses_log10, 2) if estimate else None
+    return AuditRow(line, "plaintext", strength, score, guesses_log10, blocklisted, failing)
+
+def audit_chunk(first_line, entries):
+    blocklist = _blocklist if _blocklist is not None else load_blocklist()
+    return [audit_entry(first_line + offset, entry, blocklist) for offset, entry in enumerate(entries)]
+
+# ------------------------------------------------------------------------------
+# Batch API
+# ------------------------------------------------------------------------------
+# Workers are forked on Linux: they start at once and share the loaded word lists.
+# The app's process runs Streamlit's threads, but a forked worker only runs audit_chunk:
+# plain Python over the word lists and its own blocklist map, opened by _init_worker
+# after the fork. It never calls into Streamlit or takes a lock those threads could have
+# held when it was forked (CPython resets the import lock in the child).
+# forkserver and spawn aren't an option there: multiprocessing re-runs __main__ in every
+# such worker, and under Streamlit __main__ is the whole app script. Spawning is left to
+# platforms without fork (macOS, Windows).
+def pool_context():
+    return multiprocessing.get_context("fork" if sys.platform == "linux" else "spawn")
+
+class AuditSummary:
+    """Running totals over audited rows; `skipped` counts input rows that held no entry."""
+
+    def __init__(self, skipped=0):
+        self.skipped = skipped
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+        self.total = 0
+        self.distribution = Counter()
+        self.failing_rules = Counter()
+        self.blocklist_hits = 0
+        self.hashed = 0
+
+    def add(self, rows):
+        for row in rows:
+            self.total += 1
+            self.distribution[row.strength] += 1
+            self.failing_rules.update(row.failing)
+            self.blocklist_hits += row.blocklisted
+            self.hashed += row.kind != "plaintext"
+        self.elapsed = time.perf_counter() - self.started
+
+    @property
+    def hit_rate(self):
+        return self.blocklist_hits / self.total if self.total else 0.0
+
+    @property
+    def throughput(self):
+        """Entries audited per second."""
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+def audit_passwords(entries, workers=AUDIT_WORKERS, chunk_size=AUDIT_CHUNK_SIZE):
+    """Audit `entries` on a process pool, yielding the rows of each chunk as it finishes.
+
+    Chunks finish out of order; rows keep their line numbers. At most two chunks per
+    worker are queued at once, so `entries` can be a lazy iterator over a large file.
+    """
+    def chunks():
+        chunk, first_line = [], 1
+        for line, entry in enumerate(entries, start=1):
+            chunk.append(entry)
+            if len(chunk) == chunk_size:
+                yield first_line, chunk
+                chunk, first_line = [], line + 1
+        if chunk:
+            yield first_line, chunk
+
+    pending = chunks()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=pool_context(), initializer=_init_worker) as executor:
+        futures = set()
+        while True:
+            for first_line, chunk in pending:
+                futures.add(executor.submit(audit_chunk, first_line, chunk))
+                if len(futures) >= workers * 2:
+                    break
+            if not futures:
+                return
+            done, futures = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+# Rows as a CSV table, in input order
+def rows_to_csv(rows, output):
+    writer = csv.writer(output)
+    writer.writerow(["line", "kind", "strength", "score", "guesses_log10", "blocklisted", "failing"])
+    for row in sorted(rows):
+        writer.writerow([*row[:-1], "; ".join(row.failing)])
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Score a list of passwords or hashes.")
+    parser.add_argument("file", help="one password or hash per line, or a CSV with a password or hash column")
+    parser.add_argument("--workers", type=int, default=AUDIT_WORKERS, help="worker processes (default: %(default)s)")
+    parser.add_argument("--chunk-size", type=int, default=AUDIT_CHUNK_SIZE, help="entries per task (default: %(default)s)")
+    parser.add_argument("--output", help="write per-entry results (without passwords) to this CSV file")
+    args = parser.parse_args()
+
+    with open(args.file, encoding="utf-8", errors="replace", newline="") as source:
+        entries, skipped = parse_entries(source.read())
+
+    summary = AuditSummary(skipped)
+    rows = []
+    for chunk_rows in audit_passwords(entries, args.workers, args.chunk_size):
+        summary.add(chunk_rows)
+        if args.output:
+            rows.extend(chunk_rows)
+        print(f"\r{summary.total:,}/{len(entries):,} audited, {summary.throughput:,.0f} passwords/s", end="", file=sys.stderr)
+    print(file=sys.stderr)
+
+    print(f"Audited {summary.total:,} entries in {summary.elapsed:.1f} s ({summary.throughput:,.0f} passwords/s) with {args.workers} workers")
+    print(f"Blocklist hits: {summary.blocklist_hits:,} ({summary.hit_rate:.1%}); hashes: {summary.hashed:,}")
+    if summary.skipped:
+        print(f"Skipped {summary.skipped:,} CSV rows too short to have a password or hash")
+    print("\nStrength distribution:")
+    for strength, count in summary.distribution.most_common():
+        print(f"  {strength:<28}{count:>10,}  {count / summary.total:6.1%}")
+    print("\nTop failing rules:")
+    for rule, count in summary.failing_rules.most_common(10):
+        print(f"  {count:>10,}  {rule}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as output:
+            rows_to_csv(rows, output)
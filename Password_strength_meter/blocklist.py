@@ -0,0 +1,229 @@
+# Breached-password blocklist as a memory-mapped sorted hash array.
+#
+# Every password is stored as the first 8 bytes of its SHA-1 digest, big-endian, in one
+# sorted array behind a 16-byte header. A lookup hashes the password and binary-searches
+# the mapped file: about 24 probes for 10 million entries, each reading 8 bytes. The
+# pages live in the OS page cache, shared by every process, instead of in Python
+# objects: 10 million passwords take 80 MB on disk and almost no per-process memory,
+# where a set of the same strings would need over 1 GB in each process. With 64-bit
+# prefixes, a false hit on a 10 million entry list has a chance of about 1 in 2 million million.
+#
+# The builder reads plaintext lists (one password per line) and Have I Been Pwned
+# SHA-1 downloads ("HASH:count" lines), and sorts them in chunks on disk, so lists
+# larger than memory work:
+#   python blocklist.py build rockyou.txt pwnedpasswords.txt --output data/blocklist.bin
+#   python blocklist.py bench data/blocklist.bin
+#
+# Without a built index the app falls back to the bundled common-password list.
+import hashlib
+import heapq
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+
+from strength import DATA_DIR, load_ranked
+
+BLOCKLIST_PATH = Path(os.getenv("PASSWORD_BLOCKLIST", DATA_DIR / "blocklist.bin"))
+
+MAGIC = b"PWBLOCK1"
+HEADER = struct.Struct(">8sQ")
+ENTRY = struct.Struct(">Q")
+
+# Hashes sorted in memory at once while building; about 100 MB of Python ints
+CHUNK_SIZE = 1_000_000
+
+# A line of a Have I Been Pwned SHA-1 list
+HASH_LINE = re.compile(rb"[0-9A-Fa-f]{40}(?::\d+)?")
+
+def password_hash(password):
+    """The 64-bit key of a password: the first 8 bytes of its UTF-8 SHA-1 digest."""
+    if isinstance(password, str):
+        password = password.encode("utf-8")
+    return int.from_bytes(hashlib.sha1(password).digest()[:8], "big")
+
+
+class Blocklist:
+    """Sorted 64-bit password hashes in a bytes-like buffer, usually a memory map."""
+
+    def __init__(self, buffer):
+        magic, count = HEADER.unpack_from(buffer)
+        if magic != MAGIC or len(buffer) != HEADER.size + count * ENTRY.size:
+            raise ValueError("not a blocklist index")
+        self.buffer = buffer
+        self.count = count
+
+    @classmethod
+    def open(cls, path):
+        with open(path, "rb") as file:
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @classmethod
+    def from_passwords(cls, passwords):
+        """A small in-memory index, e.g. of the bundled list."""
+        hashes = sorted({password_hash(password) for password in passwords})
+        return cls(HEADER.pack(MAGIC, len(hashes)) + struct.pack(f">{len(hashes)}Q", *hashes))
+
+    def __len__(self):
+        return self.count
+
+    def contains_hash(self, value):
+        buffer, low, high = self.buffer, 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            (entry,) = ENTRY.unpack_from(buffer, HEADER.size + middle * ENTRY.size)
+            if entry < value:
+                low = middle + 1
+            elif entry > value:
+                high = middle
+            else:
+                return True
+        return False
+
+    def __contains__(self, password):
+        # Lists hold passwords as typed; the lowercase form also catches "Password1" for "password1"
+        return self.contains_hash(password_hash(password)) or (
+            password.lower() != password and self.contains_hash(password_hash(password.lower()))
+        )
+
+# The built index when there is one, otherwise the bundled common-password list
+def load_blocklist(path=BLOCKLIST_PATH):
+    if Path(path).exists():
+        return Blocklist.open(path)
+    return Blocklist.from_passwords(load_ranked(DATA_DIR / "common_passwords.txt"))
+
+# ------------------------------------------------------------------------------
+# Building
+# ------------------------------------------------------------------------------
+def parse_line(line):
+    line = line.rstrip(b"\r\n")
+    if not line:
+        return None
+    if HASH_LINE.fullmatch(line):
+        return int(line[:16], 16)
+    return password_hash(line)
+
+# Sorted, deduplicated hashes of one chunk, written big-endian
+def write_run(hashes, path):
+    ordered = array("Q", sorted(set(hashes)))
+    if sys.byteorder == "little":
+        ordered.byteswap()
+    path.write_bytes(ordered.tobytes())
+
+def read_run(path, block_size=1 << 16):
+    with open(path, "rb") as run:
+        while block := run.read(block_size):
+            for (value,) in ENTRY.iter_unpack(block):
+                yield value
+
+def build_blocklist(sources, output, chunk_size=CHUNK_SIZE):
+    """Index the passwords and hashes in `sources` into `output`; returns the entry count."""
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=output.parent) as scratch:
+        runs = []
+        chunk = []
+        for source in sources:
+            with open(source, "rb") as lines:
+                for line in lines:
+                    value = parse_line(line)
+                    if value is not None:
+                        chunk.append(value)
+                    if len(chunk) >= chunk_size:
+                        runs.append(Path(scratch) / f"run-{len(runs)}.bin")
+                        write_run(chunk, runs[-1])
+                        chunk = []
+        runs.append(Path(scratch) / f"run-{len(runs)}.bin")
+        write_run(chunk, runs[-1])
+
+        # Merge the runs, dropping duplicates; the header gets the count at the end
+        count = 0
+        previous = None
+        partial = output.with_suffix(".partial")
+        with open(partial, "wb") as index:
+            index.write(HEADER.pack(MAGIC, 0))
+            block = bytearray()
+            for value in heapq.merge(*(read_run(run) for run in runs)):
+                if value != previous:
+                    block += ENTRY.pack(value)
+                    previous = value
+                    count += 1
+                    if len(block) >= 1 << 16:
+                        index.write(block)
+                        block.clear()
+            index.write(block)
+            index.seek(0)
+            index.write(HEADER.pack(MAGIC, count))
+        partial.replace(output)
+    return count
+
+# Resident memory in MB as (private, file-backed); Linux only, (None, None) elsewhere.
+# Pages of the mapped index are file-backed: shared by every process and reclaimable.
+def resident_memory():
+    try:
+        status = Path("/proc/self/status").read_text()
+    except OSError:
+        return None, None
+    fields = dict(re.findall(r"^(RssAnon|RssFile):\s+(\d+) kB", status, re.MULTILINE))
+    return int(fields["RssAnon"]) / 1024, int(fields["RssFile"]) / 1024
+
+# Lookup latency and memory of an index
+def benchmark(path, lookups=100_000):
+    import random
+    import statistics
+    import time
+
+    private_before, mapped_before = resident_memory()
+    started = time.perf_counter()
+    blocklist = Blocklist.open(path)
+    opened = time.perf_counter() - started
+
+    # Half misses (random strings), half hits (entries read back from the index)
+    probes = [f"not-a-password-{random.random()}" for _ in range(lookups // 2)]
+    hits = [ENTRY.unpack_from(blocklist.buffer, HEADER.size + random.randrange(len(blocklist)) * ENTRY.size)[0]
+            for _ in range(lookups // 2)] if len(blocklist) else []
+    durations = []
+    for password in probes:
+        started = time.perf_counter()
+        password in blocklist
+        durations.append(time.perf_counter() - started)
+    for value in hits:
+        started = time.perf_counter()
+        blocklist.contains_hash(value)
+        durations.append(time.perf_counter() - started)
+    durations.sort()
+    private_after, mapped_after = resident_memory()
+
+    print(f"{len(blocklist):,} entries, {Path(path).stat().st_size / 1e6:.1f} MB, opened in {opened * 1000:.2f} ms")
+    print(f"lookup p50 {statistics.median(durations) * 1e6:.1f} µs, p99 {durations[int(len(durations) * 0.99)] * 1e6:.1f} µs "
+          f"over {len(durations):,} lookups")
+    if private_before is not None:
+        print(f"resident memory grew by {mapped_after - mapped_before:.1f} MB of shared index pages "
+              f"and {private_after - private_before:.1f} MB private (mostly the benchmark's own probe list)")
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Build or benchmark a breached-password blocklist index.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="index plaintext password lists and HIBP SHA-1 lists")
+    build.add_argument("sources", nargs="+", type=Path)
+    build.add_argument("--output", type=Path, default=BLOCKLIST_PATH, help="index file (default: %(default)s)")
+    build.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="hashes sorted in memory at once (default: %(default)s)")
+    bench = commands.add_parser("bench", help="measure lookup latency and memory")
+    bench.add_argument("index", type=Path, nargs="?", default=BLOCKLIST_PATH)
+    bench.add_argument("--lookups", type=int, default=100_000)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        started = time.perf_counter()
+        count = build_blocklist(args.sources, args.output, args.chunk_size)
+        print(f"Indexed {count:,} passwords into {args.output} in {time.perf_counter() - started:.1f} s")
+    else:
+        benchmark(args.index, args.lookups)
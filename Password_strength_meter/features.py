@@ -0,0 +1,112 @@
+# Single-pass character scanner behind the checker's rules and suggestions.
+#
+# scan_password walks a password once, classifying each character through a table
+# built at import, and returns a PasswordFeatures vector:
+#   - counts per class: lowercase, uppercase, digits (any Unicode decimal digit, as re's
+#     \d matches), special (the !@#$%^&*() the rules ask for), other punctuation, and
+#     everything else (spaces, other non-ASCII)
+#   - longest_class_run: the longest stretch of one class ("password" is 8)
+#   - longest_repeat:    the longest run of one character ("aaa" is 3)
+#   - repeated:          characters equal to the one before
+#   - longest_sequence:  the longest run of consecutive characters, up or down ("abcd", "4321")
+#   - unique:            distinct characters
+# Scoring and suggestions both read the vector, instead of running up to eight
+# re.search calls over the same string.
+#
+# Compare with the regex checks it replaces: python features.py
+import string
+from collections import namedtuple
+
+# Special characters the checker's rule asks for
+SPECIAL = "!@#$%^&*()"
+
+LOWER, UPPER, DIGIT, SPECIAL_CLASS, PUNCTUATION, OTHER = range(6)
+
+# Class of every ASCII code point; above 127, decimal digits ("٣") are DIGIT and the rest OTHER
+CLASS_TABLE = [OTHER] * 128
+for characters, character_class in [
+    (string.ascii_lowercase, LOWER),
+    (string.ascii_uppercase, UPPER),
+    (string.digits, DIGIT),
+    (string.punctuation, PUNCTUATION),
+    (SPECIAL, SPECIAL_CLASS),
+]:
+    for character in characters:
+        CLASS_TABLE[ord(character)] = character_class
+
+PasswordFeatures = namedtuple("PasswordFeatures", [
+    "length", "lower", "upper", "digits", "special", "punctuation", "other",
+    "longest_class_run", "longest_repeat", "repeated", "longest_sequence", "unique",
+])
+
+def scan_password(password):
+    """The feature vector of `password`, from one pass over its characters."""
+    counts = [0] * 6
+    table = CLASS_TABLE
+    longest_class_run = class_run = 0
+    longest_repeat = repeat = repeated = 0
+    longest_sequence = sequence = 0
+    # Sentinels: no first character repeats or continues a sequence from them
+    previous_code, previous_class, previous_step = -2, -1, 0
+
+    for character in password:
+        code = ord(character)
+        if code < 128:
+            character_class = table[code]
+        else:
+            character_class = DIGIT if character.isdecimal() else OTHER
+        counts[character_class] += 1
+
+        if character_class == previous_class:
+            class_run += 1
+        else:
+            class_run, previous_class = 1, character_class
+
+        step = code - previous_code
+        if step == 0:
+            repeat += 1
+            repeated += 1
+        else:
+            repeat = 1
+        if step == 1 or step == -1:
+            sequence = sequence + 1 if step == previous_step else 2
+        else:
+            sequence = 1
+        previous_code, previous_step = code, step
+
+        if class_run > longest_class_run:
+            longest_class_run = class_run
+        if repeat > longest_repeat:
+            longest_repeat = repeat
+        if sequence > longest_sequence:
+            longest_sequence = sequence
+
+    return PasswordFeatures(
+        len(password), *counts,
+        longest_class_run, longest_repeat, repeated, longest_sequence, len(set(password)),
+    )
+
+
+if __name__ == "__main__":
+    import re
+    import timeit
+
+    # The checks as they were: four searches to score, four more to build a suggestion
+    def regex_checks(password):
+        return (
+            bool(re.search(r"[a-z]", password) and re.search(r"[A-Z]", password)),
+            bool(re.search(r"\d", password)),
+            bool(re.search(r"[!@#$%^&*()]", password)),
+            not re.search(r"[A-Z]", password),
+            not re.search(r"[a-z]", password),
+            not re.search(r"[0-9]", password),
+            not re.search(r"[!@#$%^&*()]", password),
+        )
+
+    samples = ["password", "Tr0ub4dour&3", "correct horse battery staple", "kX9#vQ2!mZ77abcdefgh1234567"]
+    print(f"{'Password':<32}{'regex (µs)':>12}{'scan (µs)':>12}")
+    for password in samples:
+        runs = 100_000
+        regex_time = timeit.timeit(lambda: regex_checks(password), number=runs) / runs * 1e6
+        scan_time = timeit.timeit(lambda: scan_password(password), number=runs) / runs * 1e6
+        print(f"{password:<32}{regex_time:>12.2f}{scan_time:>12.2f}")
@@ -0,0 +1,93 @@
+# Cryptographically secure password generation, one password or a million at a time.
+#
+# generate_passwords draws one large buffer from os.urandom and turns it into characters
+# with a single bytes.translate call. Byte values below the largest multiple of the
+# alphabet size map to alphabet[value % size]; the rest are deleted (rejection sampling).
+# That keeps every character equally likely, where `byte % size` on every byte would
+# favour the first 256 % size characters. For the 94-character alphabet 68 of 256 byte
+# values are rejected; a second, smaller draw tops up any shortfall.
+#
+# Benchmark against the previous random.choice generator: python generator.py --benchmark
+import os
+import string
+from functools import lru_cache
+
+# Longest password the app offers
+MAX_LENGTH = 128
+
+# Extra bytes drawn beyond the expected need, so one draw is almost always enough
+DRAW_MARGIN = 1.02
+
+def build_alphabet(use_digit, use_special):
+    characters = string.ascii_letters
+    if use_digit:
+        characters += string.digits
+    if use_special:
+        characters += string.punctuation
+    return characters
+
+# (translation table, bytes to delete, accepted byte values) for an alphabet
+@lru_cache(maxsize=32)
+def _translation(alphabet):
+    size = len(alphabet)
+    if not alphabet.isascii() or not 2 <= size <= 256 or len(set(alphabet)) != size:
+        raise ValueError("the alphabet must be 2 to 256 distinct ASCII characters")
+    limit = 256 - 256 % size
+    table = bytes(ord(alphabet[value % size]) if value < limit else 0 for value in range(256))
+    return table, bytes(range(limit, 256)), limit
+
+def random_characters(count, alphabet):
+    """`count` characters drawn uniformly from `alphabet` with the OS CSPRNG."""
+    table, rejected, limit = _translation(alphabet)
+    chunks = []
+    remaining = count
+    while remaining > 0:
+        chunk = os.urandom(int(remaining * 256 / limit * DRAW_MARGIN) + 64).translate(table, rejected)[:remaining]
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks).decode("ascii")
+
+def generate_passwords(count, length, alphabet=string.ascii_letters + string.digits + string.punctuation):
+    """`count` independent random passwords of `length` characters from `alphabet`."""
+    characters = random_characters(count * length, alphabet)
+    return [characters[start:start + length] for start in range(0, count * length, length)]
+
+
+if __name__ == "__main__":
+    import argparse
+    import random
+    import sys
+    import time
+    from collections import Counter
+
+    parser = argparse.ArgumentParser(description="Generate random passwords, one per line.")
+    parser.add_argument("count", type=int, nargs="?", default=1)
+    parser.add_argument("--length", type=int, default=16)
+    parser.add_argument("--no-digits", action="store_true")
+    parser.add_argument("--no-special", action="store_true")
+    parser.add_argument("--benchmark", action="store_true", help="time 1M passwords against the random.choice generator")
+    args = parser.parse_args()
+    alphabet = build_alphabet(not args.no_digits, not args.no_special)
+
+    if not args.benchmark:
+        sys.stdout.write("\n".join(generate_passwords(args.count, args.length, alphabet)) + "\n")
+        raise SystemExit
+
+    count = 1_000_000 if args.count == 1 else args.count
+
+    # The previous generator, one random.choice per character (and not cryptographically secure)
+    def random_choice_passwords(count, length, alphabet):
+        return ["".join(random.choice(alphabet) for _ in range(length)) for _ in range(count)]
+
+    print(f"{count:,} passwords of {args.length} characters from a {len(alphabet)}-character alphabet")
+    for name, generate in [("os.urandom + translate", generate_passwords), ("random.choice", random_choice_passwords)]:
+        started = time.perf_counter()
+        passwords = generate(count, args.length, alphabet)
+        elapsed = time.perf_counter() - started
+        print(f"  {name:<24}{elapsed:8.2f} s {count / elapsed:>14,.0f} passwords/s")
+
+    # Every character should appear equally often
+    frequencies = Counter("".join(generate_passwords(count, args.length, alphabet)))
+    expected = count * args.length / len(alphabet)
+    print(f"  character frequency within {max(abs(n - expected) for n in frequencies.values()) / expected:.2%} "
+          f"of uniform ({len(frequencies)} of {len(alphabet)} characters seen)")
@@ -1,9 +1,56 @@
-import re
+import html
 import streamlit as st
-import string
-import random
 import plotly.graph_objects as go
 import streamlit.components.v1 as com
+from strength import check_password_strength, display_time, estimate_strength, generate_suggest_password
+from features import scan_password
+from meter import strength_meter
+from generator import MAX_LENGTH, build_alphabet, generate_passwords
+from blocklist import load_blocklist
+from audit import AuditSummary, audit_passwords, parse_entries, rows_to_csv
+import io
+
+# Breached-password index, opened once per process; a memory map shared by every session
+@st.cache_resource
+def get_blocklist():
+    return load_blocklist()
+
+# Full check of the password the meter sent, run before the rerun so the meter gets the result at once
+def check_meter_password():
+    value = st.session_state["meter"]
+    if not value or not value["password"]:
+        st.session_state.pop("meter_check", None)
+        return
+    password = value["password"]
+    features = scan_password(password)
+    estimate = estimate_strength(password)
+    score, strength, feedback = check_password_strength(password, get_blocklist(), estimate, features)
+    st.session_state["meter_check"] = {
+        "seq": value["seq"], "password": password, "features": features, "estimate": estimate,
+        "score": score, "strength": strength, "feedback": feedback,
+    }
+
+# Gauge for a score out of 5; scores are whole numbers, so each gauge is built once and shared
+@st.cache_resource
+def create_gauge(score):
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=score,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        gauge={
+            'axis': {'range': [0, 5]},
+            'bar': {'color': 'gold'},
+            'bgcolor': 'white',
+            'bordercolor': 'gray',
+            'borderwidth': 2,
+            'steps': [
+                {'range': [0, 2], 'color': 'red'},
+                {'range': [2, 4], 'color': 'yellow'},
+                {'range': [4, 5], 'color': 'green'}
+            ]
+        }
+    ))
+    return fig
 
 # Set Page Configuration
 st.set_page_config(
@@ -25,153 +72,124 @@ com.iframe("https://lottie.host/embed/7bde058d-2083-4425-ad14-834874a56d27/sYgGd
 st.title("🔒 Password Generator & Strength Checker")
 
 # 🔹 Creating Tabs
-tab1, tab2 = st.tabs(["🔑 Password Generator", "🛡️ Password Strength Checker"])
+tab1, tab2, tab3 = st.tabs(["🔑 Password Generator", "🛡️ Password Strength Checker", "📋 Bulk Audit"])
 
 # --- 🔹 PASSWORD GENERATOR --- #
 with tab1:
     st.header("🔑 Generate a Secure Password")
-    length = st.slider("Password Length:", min_value=6, max_value=20, value=13)
+    length = st.slider("Password Length:", min_value=6, max_value=MAX_LENGTH, value=13)
     use_digit = st.checkbox("Include Digits")
     use_special = st.checkbox("Include Special Characters")
+    count = st.number_input("Number of Passwords:", min_value=1, max_value=100_000, value=1, step=1,
+                            help="More than one can be downloaded as a text file.")
 
-    # Function to generate random passwords
-    def generate_random_password(length, use_digit, use_special):
-        characters = string.ascii_letters
-        if use_digit:
-            characters += string.digits
-        if use_special:
-            characters += string.punctuation
-        return ''.join(random.choice(characters) for _ in range(length))
-
+    # Passwords come from the OS's secure random source, all of a batch from one draw
     if st.button("🔄 Generate Password"):
-        password = generate_random_password(length, use_digit, use_special)
+        st.session_state["generated"] = generate_passwords(count, length, build_alphabet(use_digit, use_special))
+
+    passwords = st.session_state.get("generated")
+    if passwords and len(passwords) == 1:
+        password = passwords[0]
 
         # Styled password display
         st.markdown(
             f"<p style='font-size:22px; font-weight:bold;'>🔐 Generated Password:</p>"
-            f"<p style='font-size:22px; font-weight:bold; color:green; background-color:#f0f0f0; padding:5px; border-radius:5px; display:inline-block;'>{password}</p>",
+            f"<p style='font-size:22px; font-weight:bold; color:green; background-color:#f0f0f0; padding:5px; border-radius:5px; display:inline-block;'>{html.escape(password)}</p>",
             unsafe_allow_html=True
         )
+    elif passwords:
+        st.markdown(f"<p style='font-size:22px; font-weight:bold;'>🔐 Generated {len(passwords):,} Passwords</p>", unsafe_allow_html=True)
+        st.code("\n".join(passwords[:5]), language=None)
+        st.download_button("⬇️ Download all (TXT)", "\n".join(passwords) + "\n", "passwords.txt", "text/plain")
+
+# --- 🔹 BULK AUDIT --- #
+# Placed before the checker tab's code, which stops the script while its input is empty
+with tab3:
+    st.header("📋 Audit a Password List")
+    uploaded = st.file_uploader(
+        "Upload passwords or hashes:",
+        type=["txt", "csv"],
+        help="One per line, or a CSV with a 'password' or 'hash' column. SHA-1 hashes are checked against the blocklist.",
+    )
+
+    if uploaded is not None and st.button("🔍 Run Audit"):
+        entries, skipped = parse_entries(uploaded.getvalue().decode("utf-8", errors="replace"))
+        progress = st.progress(0.0)
+        summary = AuditSummary(skipped)
+        rows = []
+        for chunk_rows in audit_passwords(entries):
+            summary.add(chunk_rows)
+            rows.extend(chunk_rows)
+            progress.progress(summary.total / len(entries), f"{summary.total:,} of {len(entries):,} audited · {summary.throughput:,.0f} passwords/s")
+
+        results = io.StringIO()
+        rows_to_csv(rows, results)
+        st.session_state["audit"] = (uploaded.file_id, summary, results.getvalue())
+
+    # Results stay up across reruns until another file is uploaded
+    audit = st.session_state.get("audit")
+    if uploaded is not None and audit and audit[0] == uploaded.file_id:
+        _, summary, results = audit
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Entries", f"{summary.total:,}")
+        col2.metric("Blocklist hit rate", f"{summary.hit_rate:.1%}")
+        col3.metric("Throughput", f"{summary.throughput:,.0f}/s")
+        if summary.skipped:
+            st.caption(f"Skipped {summary.skipped:,} CSV rows too short to have a password or hash.")
+
+        st.subheader("Strength distribution")
+        st.bar_chart({strength: count for strength, count in summary.distribution.most_common()}, horizontal=True)
+
+        st.subheader("Top failing rules")
+        st.table([{"Rule": rule, "Entries": count} for rule, count in summary.failing_rules.most_common(10)])
+
+        st.download_button("⬇️ Download results (CSV)", results, "audit.csv", "text/csv", help="Line numbers and scores only; no passwords.")
 
 # --- 🔹 PASSWORD STRENGTH CHECKER --- #
 with tab2:
     st.header("🛡️ Check Your Password Strength")
 
-    password = st.text_input("Enter your password:", placeholder="At least 8 characters", type="password")
+    # Basic rules are scored in the browser; the full check runs once typing pauses
+    check = st.session_state.get("meter_check")
+    meter_result = check and {"seq": check["seq"], "score": check["score"], "strength": check["strength"]}
+    strength_meter(meter_result, key="meter", on_change=check_meter_password)
     # Check if the password field is empty
-    if  len(password) == 0:
+    if check is None:
         st.warning("Please enter a password to check its strength.")
         st.stop()
 
-    # Blacklisted Weak Passwords
-    BLACKLISTED_PASSWORDS = {"password", "123456", "qwerty", "password123", "admin", "letmein", "welcome"}
-
-    # Function to check password strength
-    def check_password_strength(password):
-        score = 0
-        feedback = []
-
-        # Check if password is in the blacklist
-        if password.lower() in BLACKLISTED_PASSWORDS:
-            return 0, "❌ Very Weak", ["This password is too common and easily guessed. Use a unique one."]
-
-        # Check password length
-        if len(password) >= 8:
-            score += 2
-        else:
-            feedback.append("Increase password length to at least 8 characters.")
-
-        # Check upper and lowercase characters
-        if re.search(r"[a-z]", password) and re.search(r"[A-Z]", password):
-            score += 1
-        else:
-            feedback.append("Include both uppercase and lowercase letters.")
-
-        # Check digits
-        if re.search(r"\d", password):
-            score += 1
-        else:
-            feedback.append("Add at least one number (0-9).")
-
-        # Check special characters
-        if re.search(r"[!@#$%^&*()]", password):
-            score += 1
-        else:
-            feedback.append("Use at least one special character (!@#$%^&*()).")
-
-        # Determine password strength
-        if score <= 3:
-            return score, "❌ Weak", feedback
-        elif score <= 4:
-            return score, "⚠️ Moderate", feedback
-        else:
-            return score, "✅ Strong", []
-
-    # Function to suggest a stronger password
-    def generate_suggest_password(password):
-        suggested_password = list(password)
-
-        # Ensure at least 8 characters
-        while len(suggested_password) < 8:
-            suggested_password.append(random.choice(string.ascii_letters))
-        
-        # Ensure password contains required character types
-        if not re.search(r"[A-Z]", password):
-            suggested_password.append(random.choice(string.ascii_uppercase))
-        if not re.search(r"[a-z]", password):
-            suggested_password.append(random.choice(string.ascii_lowercase))
-        if not re.search(r"[0-9]", password):
-            suggested_password.append(random.choice(string.digits))
-        if not re.search(r"[!@#$%^&*()]", password):
-            suggested_password.append(random.choice("!@#$%^&*()"))
-
-        random.shuffle(suggested_password)
-        return "".join(suggested_password)
-
-    # Function to create gauge chart
-    def create_gauge(score):
-        fig = go.Figure(go.Indicator(
-            mode="gauge+number+delta",
-            value=score,
-            domain={'x': [0, 1], 'y': [0, 1]},
-            gauge={
-                'axis': {'range': [0, 5]},
-                'bar': {'color': 'gold'},
-                'bgcolor': 'white',
-                'bordercolor': 'gray',
-                'borderwidth': 2,
-                'steps': [
-                    {'range': [0, 2], 'color': 'red'},
-                    {'range': [2, 4], 'color': 'yellow'},
-                    {'range': [4, 5], 'color': 'green'}
-                ]
-            }
-        ))
-        return fig
-
     # --- Checking Password Strength --- #
-    if password:
-        score, strength, feedback = check_password_strength(password)
+    if check:
+        password, features, estimate = check["password"], check["features"], check["estimate"]
+        score, strength, feedback = check["score"], check["strength"], check["feedback"]
 
         # Display strength level
         st.write(f"### Strength: {strength} (Score: {score}/5)")
+        st.caption(
+            f"About 10^{estimate.guesses_log10:.0f} guesses: cracked in "
+            f"{display_time(estimate.crack_times['online_throttled'])} online (throttled), "
+            f"{display_time(estimate.crack_times['offline_slow_hash'])} offline (slow hash)."
+        )
 
         # Display gauge meter
         st.plotly_chart(create_gauge(score))
 
         # Provide feedback based on strength
-        if strength == "❌ Weak":
+        if strength == "❌ Very Weak":
+            st.error(f"🚫 {feedback[0]}")
+
+        elif strength == "❌ Weak":
             st.error("⚠️ Your password is weak! Improve it with the suggestions below:")
             for tip in feedback:
                 st.write(f"- {tip}")
-            suggested_password = generate_suggest_password(password)
+            suggested_password = generate_suggest_password(password, features)
             st.info(f"🔑 Suggested Strong Password: **{suggested_password}**")
 
         elif strength == "⚠️ Moderate":
             st.warning("⚠️ Your password is moderate. Consider strengthening it!")
             for tip in feedback:
                 st.write(f"- {tip}")
-            suggested_password = generate_suggest_password(password)
+            suggested_password = generate_suggest_password(password, features)
             st.info(f"🔑 Suggested Stronger Password: **{suggested_password}**")
 
         elif strength == "✅ Strong":
@@ -0,0 +1,21 @@
+# Live strength meter: a password field whose basic score is computed in the browser.
+#
+# The frontend (frontend/index.html) scores the character rules as the user types and
+# sends the password back only after a pause of `debounce_ms`, so typing doesn't rerun
+# the app on every keystroke. Its value is {"seq": n, "password": ...}; `seq` counts the
+# passwords sent. The app scores each one with the blocklist and the guess estimate
+# and passes {"seq", "score", "strength"} back as `result`; the meter shows it for as
+# long as the field still holds that password.
+import os
+import streamlit.components.v1 as com
+
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend")
+
+# Pause in typing before the password is sent for the full check
+DEBOUNCE_MS = 500
+
+_component = com.declare_component("strength_meter", path=FRONTEND_DIR)
+
+def strength_meter(result=None, debounce_ms=DEBOUNCE_MS, key=None, on_change=None):
+    """The last password sent as {"seq", "password"}, or None before the first one."""
+    return _component(result=result, debounce_ms=debounce_ms, key=key, on_change=on_change, default=None)
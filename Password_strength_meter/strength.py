@@ -0,0 +1,535 @@
+# Password strength estimation in the style of zxcvbn.
+#
+# A password is matched against the patterns an attacker tries first:
+#   - dictionary: common passwords and English words, also reversed and with l33t
+#                 substitutions (p@ssw0rd); guesses grow with the word's rank
+#   - spatial:    keyboard walks such as qwerty or zxcvbn, counting turns and shifted keys
+#   - sequence:   runs with a constant step such as abcd, 2468 or zyx
+#   - repeat:     repeated characters or blocks such as aaaa or abcabc
+#   - year:       recent years such as 1987 or 2024
+# Whatever no pattern covers is brute-forced at 10 guesses per character. The cheapest
+# sequence of matches covering the whole password is found by dynamic programming, and
+# its guess count maps to a score from 0 (guessed in under a thousand tries) to 4.
+#
+# Guess counts are kept as log10 values, so long passwords never overflow a float.
+import math
+import re
+import secrets
+import string
+from collections import namedtuple
+from datetime import date
+from pathlib import Path
+
+from features import SPECIAL, scan_password
+
+DATA_DIR = Path(__file__).parent / "data"
+
+# Only the first characters are analyzed; the rest can only add guesses
+MAX_LENGTH = 64
+
+# Guesses per character not covered by any pattern
+BRUTEFORCE_CARDINALITY = 10
+
+# Lower bounds for a match that is only part of the password, as in zxcvbn
+MIN_SUBMATCH_GUESSES_SINGLE_CHAR = 10
+MIN_SUBMATCH_GUESSES_MULTI_CHAR = 50
+
+# Penalty for every extra match in a sequence, so "pass" + "word" isn't cheaper than "password"
+MIN_GUESSES_BEFORE_GROWING_SEQUENCE = 10000
+
+# Years closer than this to the current one are all equally likely
+MIN_YEAR_SPACE = 20
+REFERENCE_YEAR = date.today().year
+
+# Upper bounds on the guesses for scores 0 to 3; anything above scores 4
+SCORE_THRESHOLDS = [1e3, 1e6, 1e8, 1e10]
+
+# Guesses per second of typical attacks
+ATTACK_SPEEDS = {
+    "online_throttled": 100 / 3600,
+    "online": 10,
+    "offline_slow_hash": 1e4,
+    "offline_fast_hash": 1e10,
+}
+
+# One pattern found in the password: characters i to j (inclusive) and their guess count
+Match = namedtuple("Match", ["pattern", "i", "j", "token", "guesses_log10", "detail"])
+
+Estimate = namedtuple("Estimate", ["guesses", "guesses_log10", "score", "sequence", "crack_times", "feedback"])
+
+# ------------------------------------------------------------------------------
+# Dictionaries
+# ------------------------------------------------------------------------------
+# Words of a ranked list file by rank, 1 being the most common; "#" lines are comments
+def load_ranked(path):
+    ranked = {}
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        word = line.strip().lower()
+        if word and not word.startswith("#"):
+            ranked.setdefault(word, len(ranked) + 1)
+    return ranked
+
+DICTIONARIES = {
+    "passwords": load_ranked(DATA_DIR / "common_passwords.txt"),
+    "english": load_ranked(DATA_DIR / "english_words.txt"),
+}
+MAX_WORD_LENGTH = max(len(word) for ranked in DICTIONARIES.values() for word in ranked)
+
+# Letters and the characters commonly substituted for them
+L33T_TABLE = {
+    "a": "4@", "b": "8", "c": "({[<", "e": "3", "g": "69", "i": "1!|",
+    "l": "1|7", "o": "0", "s": "$5", "t": "+7", "x": "%", "z": "2",
+}
+L33T_LETTERS = {}
+for letter, substitutes in L33T_TABLE.items():
+    for character in substitutes:
+        L33T_LETTERS.setdefault(character, []).append(letter)
+
+# Readings of a token (each l33t character as itself or a letter) kept while it grows;
+# only readings that still start a dictionary word are kept, so this is rarely reached
+MAX_L33T_COMBINATIONS = 64
+
+def uppercase_variations(token):
+    if not re.search(r"[A-Z]", token):
+        return 1
+    if re.fullmatch(r"[A-Z][^A-Z]+|[^A-Z]+[A-Z]|[^a-z]+", token):
+        return 2
+    upper = sum(character.isupper() for character in token)
+    lower = sum(character.islower() for character in token)
+    return sum(math.comb(upper + lower, i) for i in range(1, min(upper, lower) + 1))
+
+def l33t_variations(token, substitutions):
+    variations = 1
+    lower = token.lower()
+    for substitute, letter in substitutions.items():
+        subbed, unsubbed = lower.count(substitute), lower.count(letter)
+        if subbed == 0 or unsubbed == 0:
+            variations *= 2
+        else:
+            variations *= sum(math.comb(subbed + unsubbed, i) for i in range(1, min(subbed, unsubbed) + 1))
+    return variations
+
+def dictionary_match(password, i, j, word, dictionary, rank, reversed_=False, substitutions=None):
+    token = password[i:j + 1]
+    guesses = rank * uppercase_variations(token) * (l33t_variations(token, substitutions) if substitutions else 1)
+    if reversed_:
+        guesses *= 2
+    detail = {"word": word, "dictionary": dictionary, "rank": rank, "reversed": reversed_, "l33t": substitutions or {}}
+    return Match("dictionary", i, j, token, math.log10(guesses), detail)
+
+# Every prefix of a dictionary word; a l33t reading that isn't one can't grow into a word
+WORD_PREFIXES = {word[:k] for ranked in DICTIONARIES.values() for word in ranked for k in range(1, len(word) + 1)}
+
+# Every substring that is a dictionary word, as typed or (if `l33t`) with l33t characters replaced.
+# Readings grow one character at a time from each start, and are dropped as soon as they
+# stop being the start of a word, instead of trying every combination of every substring.
+def dictionary_matches(password, l33t=True):
+    matches = []
+    lower = password.lower()
+    for i in range(len(password)):
+        # Readings of lower[i:j + 1] that start a word, as (text, substitutions made)
+        readings = [("", {})]
+        for j in range(i, min(len(password), i + MAX_WORD_LENGTH)):
+            token = lower[i:j + 1]
+            for dictionary, ranked in DICTIONARIES.items():
+                if token in ranked:
+                    matches.append(dictionary_match(password, i, j, token, dictionary, ranked[token]))
+            if not l33t:
+                if token not in WORD_PREFIXES:
+                    break
+                continue
+
+            character = lower[j]
+            grown = []
+            for reading, substitutions in readings:
+                for letter in (character, *L33T_LETTERS.get(character, ())):
+                    word = reading + letter
+                    if word not in WORD_PREFIXES:
+                        continue
+                    grown.append((word, substitutions if letter == character else {**substitutions, character: letter}))
+            readings = grown[:MAX_L33T_COMBINATIONS]
+            if not readings:
+                break
+            for word, substitutions in readings:
+                if not substitutions:
+                    continue
+                for dictionary, ranked in DICTIONARIES.items():
+                    if word in ranked:
+                        matches.append(dictionary_match(password, i, j, word, dictionary, ranked[word], substitutions=substitutions))
+    return matches
+
+# Reversed words, as typed only
+def reverse_dictionary_matches(password):
+    length = len(password)
+    return [
+        dictionary_match(password, length - 1 - match.j, length - 1 - match.i, match.detail["word"],
+                         match.detail["dictionary"], match.detail["rank"], reversed_=True)
+        for match in dictionary_matches(password[::-1], l33t=False)
+        if len(match.token) > 2
+    ]
+
+# ------------------------------------------------------------------------------
+# Keyboard walks
+# ------------------------------------------------------------------------------
+# QWERTY keys as (unshifted, shifted) pairs, row by row; rows are staggered half a key
+KEYBOARD_ROWS = [
+    ("`1234567890-=", "~!@#$%^&*()_+", 0),
+    ("qwertyuiop[]\\", "QWERTYUIOP{}|", 1),
+    ("asdfghjkl;'", 'ASDFGHJKL:"', 1),
+    ("zxcvbnm,./", "ZXCVBNM<>?", 1),
+]
+
+# Neighbours of every key in six fixed directions (left, up-left, up-right, right,
+# down-right, down-left); a walk turns whenever the direction changes
+def keyboard_graph(rows):
+    keys = {}
+    for y, (unshifted, shifted, offset) in enumerate(rows):
+        for x, pair in enumerate(zip(unshifted, shifted)):
+            keys[(x + offset, y)] = "".join(pair)
+    graph = {}
+    for (x, y), pair in keys.items():
+        neighbours = [keys.get(position) for position in
+                      [(x - 1, y), (x, y - 1), (x + 1, y - 1), (x + 1, y), (x, y + 1), (x - 1, y + 1)]]
+        for character in pair:
+            graph[character] = neighbours
+    return graph, len(keys)
+
+KEYBOARD, KEYBOARD_KEYS = keyboard_graph(KEYBOARD_ROWS)
+KEYBOARD_DEGREE = sum(neighbour is not None for pair in KEYBOARD.values() for neighbour in pair) / len(KEYBOARD)
+SHIFTED_KEYS = {shifted for _, row, _ in KEYBOARD_ROWS for shifted in row}
+
+def spatial_guesses(length, turns, shifted):
+    guesses = sum(
+        math.comb(i - 1, t - 1) * KEYBOARD_KEYS * KEYBOARD_DEGREE ** t
+        for i in range(2, length + 1)
+        for t in range(1, min(turns, i - 1) + 1)
+    )
+    unshifted = length - shifted
+    if shifted:
+        guesses *= 2 if unshifted == 0 else sum(math.comb(shifted + unshifted, i) for i in range(1, min(shifted, unshifted) + 1))
+    return guesses
+
+# Runs of three or more keys where each key is next to the previous one
+def spatial_matches(password):
+    matches = []
+    i = 0
+    while i < len(password) - 1:
+        j = i + 1
+        direction = None
+        turns = 0
+        shifted = int(password[i] in SHIFTED_KEYS)
+        while j < len(password):
+            neighbours = KEYBOARD.get(password[j - 1], [])
+            step = next((d for d, pair in enumerate(neighbours) if pair and password[j] in pair), None)
+            if step is None:
+                break
+            shifted += password[j] in SHIFTED_KEYS
+            if step != direction:
+                turns += 1
+                direction = step
+            j += 1
+        if j - i > 2:
+            guesses = spatial_guesses(j - i, turns, shifted)
+            matches.append(Match("spatial", i, j - 1, password[i:j], math.log10(guesses), {"turns": turns, "shifted": shifted}))
+        i = j
+    return matches
+
+# ------------------------------------------------------------------------------
+# Sequences, repeats and years
+# ------------------------------------------------------------------------------
+# Largest step between consecutive characters that still counts as a sequence
+MAX_SEQUENCE_STEP = 5
+
+def sequence_matches(password):
+    matches = []
+
+    def add(i, j, step):
+        if (j - i > 1 or abs(step) == 1) and 0 < abs(step) <= MAX_SEQUENCE_STEP:
+            token = password[i:j + 1]
+            if token[0] in "aAzZ019":
+                base = 4
+            elif token[0].isdigit():
+                base = 10
+            else:
+                base = 26
+            if step < 0:
+                base *= 2
+            matches.append(Match("sequence", i, j, token, math.log10(base * len(token)), {"step": step}))
+
+    i, last_step = 0, None
+    for k in range(1, len(password)):
+        step = ord(password[k]) - ord(password[k - 1])
+        if last_step is None:
+            last_step = step
+        if step != last_step:
+            add(i, k - 1, last_step)
+            i, last_step = k - 1, step
+    if last_step is not None:
+        add(i, len(password) - 1, last_step)
+    return matches
+
+GREEDY_REPEAT = re.compile(r"(.+)\1+", re.DOTALL)
+LAZY_REPEAT = re.compile(r"(.+?)\1+", re.DOTALL)
+
+# A block repeated two or more times; guesses are the block's guesses times the repeat count
+def repeat_matches(password):
+    matches = []
+    start = 0
+    while start < len(password):
+        greedy = GREEDY_REPEAT.search(password, start)
+        if not greedy:
+            break
+        lazy = LAZY_REPEAT.search(password, start)
+        if len(greedy.group(0)) > len(lazy.group(0)):
+            match = greedy
+            base = LAZY_REPEAT.fullmatch(match.group(0)).group(1)
+        else:
+            match = lazy
+            base = match.group(1)
+        repeat_count = len(match.group(0)) // len(base)
+        guesses_log10 = estimate_strength(base).guesses_log10 + math.log10(repeat_count)
+        detail = {"base": base, "repeat_count": repeat_count}
+        matches.append(Match("repeat", match.start(), match.end() - 1, match.group(0), guesses_log10, detail))
+        start = match.end()
+    return matches
+
+def year_matches(password):
+    return [
+        Match("year", match.start(), match.end() - 1, match.group(0),
+              math.log10(max(abs(int(match.group(0)) - REFERENCE_YEAR), MIN_YEAR_SPACE)), {})
+        for match in re.finditer(r"19\d\d|20\d\d", password)
+    ]
+
+def omnimatch(password):
+    return [
+        *dictionary_matches(password),
+        *reverse_dictionary_matches(password),
+        *spatial_matches(password),
+        *sequence_matches(password),
+        *repeat_matches(password),
+        *year_matches(password),
+    ]
+
+# ------------------------------------------------------------------------------
+# Scoring
+# ------------------------------------------------------------------------------
+# log10(10**a + 10**b) without leaving log space
+def log10_add(a, b):
+    high, low = max(a, b), min(a, b)
+    return high + math.log10(1 + 10 ** (low - high))
+
+# The sequence of non-overlapping matches, with brute force in the gaps, that is cheapest
+# to guess; returns (matches, log10 guesses). Like zxcvbn, a sequence of l matches costs
+# l! * (product of their guesses) + MIN_GUESSES_BEFORE_GROWING_SEQUENCE ** (l - 1).
+def most_guessable_sequence(password, matches):
+    length = len(password)
+    by_end = [[] for _ in range(length)]
+    for match in matches:
+        by_end[match.j].append(match)
+
+    # For every end position k and sequence length l: the last match, the log of the
+    # product of guesses, and the log of the total cost
+    best_match = [{} for _ in range(length)]
+    best_product = [{} for _ in range(length)]
+    best_cost = [{} for _ in range(length)]
+
+    def match_guesses_log10(match):
+        if len(match.token) == length:
+            return match.guesses_log10
+        minimum = MIN_SUBMATCH_GUESSES_SINGLE_CHAR if len(match.token) == 1 else MIN_SUBMATCH_GUESSES_MULTI_CHAR
+        return max(match.guesses_log10, math.log10(minimum))
+
+    def update(match, count):
+        k = match.j
+        product_log10 = match_guesses_log10(match)
+        if count > 1:
+            product_log10 += best_product[match.i - 1][count - 1]
+        cost = log10_add(math.lgamma(count + 1) / math.log(10) + product_log10,
+                         (count - 1) * math.log10(MIN_GUESSES_BEFORE_GROWING_SEQUENCE))
+        if any(other <= count and other_cost <= cost for other, other_cost in best_cost[k].items()):
+            return
+        best_match[k][count] = match
+        best_product[k][count] = product_log10
+        best_cost[k][count] = cost
+
+    def bruteforce(i, j):
+        return Match("bruteforce", i, j, password[i:j + 1], (j - i + 1) * math.log10(BRUTEFORCE_CARDINALITY), {})
+
+    for k in range(length):
+        for match in by_end[k]:
+            if match.i > 0:
+                for count in list(best_match[match.i - 1]):
+                    update(match, count + 1)
+            else:
+                update(match, 1)
+
+        # Brute force never directly follows brute force: that would just be a longer gap
+        update(bruteforce(0, k), 1)
+        for i in range(1, k + 1):
+            for count, last in list(best_match[i - 1].items()):
+                if last.pattern != "bruteforce":
+                    update(bruteforce(i, k), count + 1)
+
+    count, cost = min(best_cost[length - 1].items(), key=lambda item: item[1])
+    sequence = []
+    k = length - 1
+    while k >= 0:
+        match = best_match[k][count]
+        sequence.append(match)
+        k = match.i - 1
+        count -= 1
+    return sequence[::-1], cost
+
+def guesses_to_score(guesses):
+    return next((score for score, threshold in enumerate(SCORE_THRESHOLDS) if guesses < threshold + 5), 4)
+
+TIME_UNITS = [("second", 1), ("minute", 60), ("hour", 3600), ("day", 86400), ("month", 2629800), ("year", 31557600)]
+
+# Human-readable duration, e.g. "3 hours" or "centuries"
+def display_time(seconds):
+    if seconds < 1:
+        return "less than a second"
+    if seconds >= 100 * TIME_UNITS[-1][1]:
+        return "centuries"
+    unit, size = [(unit, size) for unit, size in TIME_UNITS if seconds >= size][-1]
+    value = round(seconds / size)
+    return f"{value} {unit}{'s' if value != 1 else ''}"
+
+# The warning and suggestions for a weak password, based on its longest match
+def get_feedback(score, sequence):
+    if score > 2:
+        return []
+    suggestions = ["Add another word or two. Uncommon words are better."]
+    longest = max(sequence, key=lambda match: len(match.token))
+    warning = None
+
+    if longest.pattern == "dictionary":
+        detail = longest.detail
+        if detail["dictionary"] == "passwords":
+            if len(sequence) == 1 and not detail["l33t"] and not detail["reversed"]:
+                warning = "This is a top-10 common password." if detail["rank"] <= 10 else "This is a very common password."
+            else:
+                warning = "This is similar to a commonly used password."
+        elif len(sequence) == 1:
+            warning = "A word by itself is easy to guess."
+        if longest.token[:1].isupper() and not longest.token.isupper():
+            suggestions.append("Capitalization doesn't help very much.")
+        elif longest.token.isupper() and longest.token.lower() != longest.token:
+            suggestions.append("All-uppercase is almost as easy to guess as all-lowercase.")
+        if detail["reversed"]:
+            suggestions.append("Reversed words aren't much harder to guess.")
+        if detail["l33t"]:
+            suggestions.append("Predictable substitutions like '@' instead of 'a' don't help very much.")
+    elif longest.pattern == "spatial":
+        warning = "Straight rows of keys are easy to guess." if longest.detail["turns"] == 1 else "Short keyboard patterns are easy to guess."
+        suggestions.append("Use a longer keyboard pattern with more turns.")
+    elif longest.pattern == "repeat":
+        if len(longest.detail["base"]) == 1:
+            warning = 'Repeats like "aaa" are easy to guess.'
+        else:
+            warning = 'Repeats like "abcabcabc" are only slightly harder to guess than "abc".'
+        suggestions.append("Avoid repeated words and characters.")
+    elif longest.pattern == "sequence":
+        warning = "Sequences like abc or 6543 are easy to guess."
+        suggestions.append("Avoid sequences.")
+    elif longest.pattern == "year":
+        warning = "Recent years are easy to guess."
+        suggestions.append("Avoid recent years and years that are associated with you.")
+    return [warning, *suggestions] if warning else suggestions
+
+def estimate_strength(password):
+    """Estimate how many guesses an attacker needs for `password`, zxcvbn style."""
+    password = password[:MAX_LENGTH]
+    if not password:
+        return Estimate(1.0, 0.0, 0, [], {name: 0.0 for name in ATTACK_SPEEDS}, [])
+    sequence, guesses_log10 = most_guessable_sequence(password, omnimatch(password))
+    guesses = 10 ** guesses_log10 if guesses_log10 < 300 else math.inf
+    score = guesses_to_score(guesses)
+    crack_times = {name: guesses / speed for name, speed in ATTACK_SPEEDS.items()}
+    return Estimate(guesses, guesses_log10, score, sequence, crack_times, get_feedback(score, sequence))
+
+# ------------------------------------------------------------------------------
+# Checker score
+# ------------------------------------------------------------------------------
+# Shown when the estimate lowers a score but has no specific advice
+LENGTH_SUGGESTION = "Make it longer: add another word or two. Uncommon words are better."
+
+# The checker's score out of 5 as (score, strength, feedback): 2 points for length and
+# one each for mixed case, digits and special characters, capped by the guess estimate.
+# The estimate, feature vector and blocklist lookup are computed here unless passed in.
+# Breached passwords score 0.
+def check_password_strength(password, blocklist, estimate=None, features=None, blocklisted=None):
+    score = 0
+    feedback = []
+
+    # Check if password is in the breached-password blocklist
+    if blocklisted is None:
+        blocklisted = password in blocklist
+    if blocklisted:
+        return 0, "❌ Very Weak", ["This password appears in lists of breached passwords. Use a unique one."]
+
+    features = features or scan_password(password)
+
+    # Check password length
+    if features.length >= 8:
+        score += 2
+    else:
+        feedback.append("Increase password length to at least 8 characters.")
+
+    # Check upper and lowercase characters
+    if features.lower and features.upper:
+        score += 1
+    else:
+        feedback.append("Include both uppercase and lowercase letters.")
+
+    # Check digits
+    if features.digits:
+        score += 1
+    else:
+        feedback.append("Add at least one number (0-9).")
+
+    # Check special characters
+    if features.special:
+        score += 1
+    else:
+        feedback.append("Use at least one special character (!@#$%^&*()).")
+
+    # Cap the score by how guessable the password is: following every rule
+    # doesn't help if it's a keyboard walk or a word with predictable substitutions
+    estimate = estimate or estimate_strength(password)
+    if score > estimate.score + 1:
+        score = estimate.score + 1
+        feedback.extend(estimate.feedback or [LENGTH_SUGGESTION])
+
+    # Determine password strength
+    if score <= 3:
+        return score, "❌ Weak", feedback
+    elif score <= 4:
+        return score, "⚠️ Moderate", feedback
+    else:
+        return score, "✅ Strong", []
+
+# Suggestions come from the OS's secure random source, like generated passwords
+_random = secrets.SystemRandom()
+
+# A stronger variant of `password`: padded to 8 characters, with every missing character class added, shuffled
+def generate_suggest_password(password, features=None):
+    features = features or scan_password(password)
+    suggested_password = list(password)
+
+    # Ensure at least 8 characters
+    while len(suggested_password) < 8:
+        suggested_password.append(_random.choice(string.ascii_letters))
+
+    # Ensure password contains required character types
+    if not features.upper:
+        suggested_password.append(_random.choice(string.ascii_uppercase))
+    if not features.lower:
+        suggested_password.append(_random.choice(string.ascii_lowercase))
+    if not features.digits:
+        suggested_password.append(_random.choice(string.digits))
+    if not features.special:
+        suggested_password.append(_random.choice(SPECIAL))
+
+    _random.shuffle(suggested_password)
+    return "".join(suggested_password)
@@ -0,0 +1,306 @@
+# Bulk timestamp conversion: re-zone a column of log timestamps from one zone to many.
+#
+# - Timestamps are parsed with pd.to_datetime: ISO 8601 strings by default, or any
+#   strptime format, or epoch numbers (UTC by definition). Strings that carry their own
+#   offset ("Z", "+05:30") keep it and ignore the source zone; the rest of the column is
+#   still read in the source zone.
+# - Naive timestamps are localized to the source zone. Two kinds of wall-clock time
+#   don't name exactly one instant, and what happens to each is chosen explicitly:
+#     ambiguous (a fold: clocks go back and an hour repeats)
+#       "earliest" (the first pass, still on daylight time), "latest", "infer" (from the
+#       order of a sorted log), "NaT", or "raise"
+#     nonexistent (a gap: clocks go forward and an hour is skipped)
+#       "shift_forward" (to the first valid time), "shift_backward", "NaT", or "raise"
+#   Both are counted in the report, along with timestamps that couldn't be parsed.
+# - Converting to a target zone only relabels the same UTC instants, so it costs almost
+#   nothing. Formatting is what's slow: DataFrame.to_csv formats tz-aware values one at
+#   a time. csv_chunks builds ISO 8601 text for whole columns as byte arrays instead.
+#
+# Run from the command line:
+#   python batch.py access_log.csv --column timestamp --from America/New_York --to UTC Asia/Tokyo --output rezoned.csv
+#   python batch.py --benchmark 1000000 --from America/New_York --to UTC Asia/Tokyo --ambiguous earliest --nonexistent shift_forward
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Policies for folds, as pandas' tz_localize(ambiguous=...) values; True picks daylight time
+AMBIGUOUS = {"earliest": True, "latest": False, "infer": "infer", "NaT": "NaT", "raise": "raise"}
+
+# Policies for gaps, passed to tz_localize(nonexistent=...) as they are
+NONEXISTENT = ("shift_forward", "shift_backward", "NaT", "raise")
+
+# An offset at the end of a timestamp, after its time of day: "...:00Z", "...:00+05:30", "...:00 -0400"
+OFFSET_SUFFIX = r":\d{2}(?:[.,]\d+)?\s*(?:Z|[+-]\d{2}(?::?\d{2}){0,2})\s*$"
+
+# Nanoseconds per epoch unit
+UNIT_NANOSECONDS = {"s": 10**9, "ms": 10**6, "us": 10**3, "ns": 1}
+
+# Rows formatted per block of CSV output; bounds the memory of the byte arrays
+CSV_CHUNK_ROWS = 250_000
+
+class BatchReport:
+    """What a conversion did, and how fast."""
+
+    def __init__(self, rows, invalid, ambiguous, nonexistent, elapsed):
+        self.rows = rows
+        self.invalid = invalid
+        self.ambiguous = ambiguous
+        self.nonexistent = nonexistent
+        self.elapsed = elapsed
+
+    @property
+    def throughput(self):
+        """Timestamps converted per second."""
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+# ------------------------------------------------------------------------------
+# Parsing and localizing
+# ------------------------------------------------------------------------------
+def parse_timestamps(values, format=None, unit=None):
+    """`values` as datetimes, naive unless they carry an offset; unparseable values become NaT.
+
+    Raises ValueError if the offsets differ from row to row, or only some rows carry one.
+    """
+    values = pd.Series(values)
+    if unit:
+        # Epoch numbers read from a CSV are text, which pd.to_datetime won't take with a unit.
+        # Numbers past the datetime64[ns] range become NaT here, before they can overflow
+        scale = UNIT_NANOSECONDS[unit]
+        numbers = pd.to_numeric(values, errors="coerce")
+        numbers = numbers.where(numbers.abs() < np.iinfo(np.int64).max / scale)
+        parsed = pd.to_datetime(numbers, unit=unit, utc=True, errors="coerce")
+        # float64 is exact only up to 2**53, short of a ns epoch; whole numbers are re-read as int64
+        text = values.astype("string").str.strip()
+        whole = text.str.fullmatch(r"[+-]?\d+").fillna(False).astype(bool) & numbers.notna()
+        parsed[whole] = pd.to_datetime(text[whole].astype("int64") * scale, unit="ns", utc=True)
+        return parsed
+    return pd.to_datetime(values, format=format or "ISO8601", errors="coerce")
+
+def localize(naive, zone, ambiguous="raise", nonexistent="raise"):
+    """Localize naive timestamps to `zone` as (aware, ambiguous count, nonexistent count).
+
+    One strict pass finds the timestamps in folds and gaps; only those are localized
+    again under the chosen policies ("infer" needs the whole column, so it redoes it).
+    """
+    if ambiguous not in AMBIGUOUS:
+        raise ValueError(f"ambiguous must be one of {', '.join(AMBIGUOUS)}")
+    if nonexistent not in NONEXISTENT:
+        raise ValueError(f"nonexistent must be one of {', '.join(NONEXISTENT)}")
+
+    aware = naive.dt.tz_localize(zone, ambiguous="NaT", nonexistent="NaT")
+    unresolved = aware.isna() & naive.notna()
+    if not unresolved.any():
+        return aware, 0, 0
+
+    # Gaps shift to a valid time here; whatever is still NaT is in a fold
+    subset = naive[unresolved]
+    in_gap = subset.dt.tz_localize(zone, ambiguous="NaT", nonexistent="shift_forward").notna()
+    gaps, folds = int(in_gap.sum()), int((~in_gap).sum())
+    if folds and ambiguous == "raise":
+        raise ValueError(f"{folds:,} timestamps are ambiguous in {zone}, e.g. {subset[~in_gap].iloc[0]}")
+    if gaps and nonexistent == "raise":
+        raise ValueError(f"{gaps:,} timestamps don't exist in {zone}, e.g. {subset[in_gap].iloc[0]}")
+
+    if ambiguous == "infer":
+        return naive.dt.tz_localize(zone, ambiguous="infer", nonexistent=nonexistent), folds, gaps
+    policy = AMBIGUOUS[ambiguous]
+    if isinstance(policy, bool):
+        policy = np.full(len(subset), policy)
+    aware[unresolved] = subset.dt.tz_localize(zone, ambiguous=policy, nonexistent=nonexistent)
+    return aware, folds, gaps
+
+def convert_timestamps(values, source, targets, ambiguous="raise", nonexistent="raise", format=None, unit=None):
+    """Convert timestamps in `source` to every zone in `targets`, as (DataFrame, BatchReport).
+
+    The frame has a column per zone, source first, named by the zone's key.
+    """
+    started = time.perf_counter()
+    values = pd.Series(values)
+    folds = gaps = 0
+    try:
+        parsed = parse_timestamps(values, format, unit)
+    except ValueError:
+        # Offsets differ from row to row, or only some rows have one: rows with an offset
+        # keep their instants, the rest are wall-clock times in the source zone
+        has_offset = values.str.contains(OFFSET_SUFFIX, na=False)
+        offset = pd.to_datetime(values.where(has_offset), format=format or "ISO8601", errors="coerce", utc=True)
+        naive = parse_timestamps(values.where(~has_offset), format)
+        invalid = int((offset.isna() & naive.isna()).sum() - values.isna().sum())
+        local, folds, gaps = localize(naive, source, ambiguous, nonexistent)
+        aware = offset.dt.tz_convert(source).where(has_offset, local)
+    else:
+        invalid = int(parsed.isna().sum() - values.isna().sum())
+        if parsed.dt.tz is None:
+            aware, folds, gaps = localize(parsed, source, ambiguous, nonexistent)
+        else:
+            aware = parsed.dt.tz_convert(source)
+
+    frame = pd.DataFrame({zone: aware.dt.tz_convert(zone) for zone in dict.fromkeys([source, *targets])})
+    return frame, BatchReport(len(frame), invalid, folds, gaps, time.perf_counter() - started)
+
+# ------------------------------------------------------------------------------
+# Output
+# ------------------------------------------------------------------------------
+# Coarsest unit that writes every value of a tz-aware column exactly: "2026-01-01T00:00:00", not "...00.000000"
+def _precision(column):
+    wall = column.dt.tz_localize(None).to_numpy()
+    ticks = wall[~np.isnat(wall)].astype(np.int64)
+    unit = np.datetime_data(wall.dtype)[0]
+    for coarser in ("s", "ms", "us"):
+        if coarser == unit:
+            break
+        if not (ticks % (np.timedelta64(1, coarser) // np.timedelta64(1, unit))).any():
+            return coarser
+    return unit
+
+# Decimal digits of `values` into columns [start, start + width) of `out`, as ASCII
+def _write_digits(out, start, values, width):
+    for position in range(start + width - 1, start - 1, -1):
+        out[:, position] = ord("0") + values % 10
+        values = values // 10
+
+# "YYYY-MM-DD" for each day counted from 1970-01-01, by Howard Hinnant's civil_from_days
+def _date_bytes(days):
+    shifted = days + 719468
+    era = shifted // 146097
+    day_of_era = shifted - era * 146097
+    year_of_era = (day_of_era - day_of_era // 1460 + day_of_era // 36524 - day_of_era // 146096) // 365
+    day_of_year = day_of_era - (365 * year_of_era + year_of_era // 4 - year_of_era // 100)
+    month_index = (5 * day_of_year + 2) // 153
+    day = day_of_year - (153 * month_index + 2) // 5 + 1
+    month = np.where(month_index < 10, month_index + 3, month_index - 9)
+    year = year_of_era + era * 400 + (month <= 2)
+    if ((year < 0) | (year > 9999)).any():
+        raise ValueError("only years 0 to 9999 can be written as ISO 8601 text")
+
+    out = np.empty((len(days), 10), dtype=np.uint8)
+    out[:, [4, 7]] = ord("-")
+    _write_digits(out, 0, year, 4)
+    _write_digits(out, 5, month, 2)
+    _write_digits(out, 8, day, 2)
+    return out
+
+# "000" to "999", and "HH:MM:SS" for every second of a day
+_THREE_DIGITS = np.empty((1000, 3), dtype=np.uint8)
+_write_digits(_THREE_DIGITS, 0, np.arange(1000), 3)
+_TWO_DIGITS = _THREE_DIGITS[:100, 1:]
+_SECOND = np.arange(86400)
+_TIME_OF_DAY = np.hstack([
+    _TWO_DIGITS[_SECOND // 3600], np.full((86400, 1), ord(":"), dtype=np.uint8),
+    _TWO_DIGITS[_SECOND // 60 % 60], np.full((86400, 1), ord(":"), dtype=np.uint8),
+    _TWO_DIGITS[_SECOND % 60],
+])
+
+# ISO 8601 text of a tz-aware column ("2026-03-08T03:00:00.250-04:00") as (bytes, padded):
+# one row of bytes per value, all of the same width. Values aren't formatted one by one:
+# each day in the column's range is formatted once and looked up, as are times of day,
+# groups of three fraction digits and offsets. NaT rows are all zero, and so are the
+# seconds of whole-minute offsets when other rows' offsets have seconds (local mean
+# time, before about 1900); `padded` says if there are any.
+def _iso_bytes(column, unit):
+    wall = column.dt.tz_localize(None).to_numpy()
+    missing = np.isnat(wall)
+    per_second = np.timedelta64(1, "s") // np.timedelta64(1, np.datetime_data(wall.dtype)[0])
+    ticks = wall.astype(np.int64)
+    ticks[missing] = ticks[~missing].min() if not missing.all() else 0
+    seconds, fraction = np.divmod(ticks, per_second)
+    days, seconds = np.divmod(seconds, 86400)
+    first_day = days.min() if len(days) else 0
+    dates = _date_bytes(np.arange(first_day, days.max() + 1 if len(days) else 0))
+
+    # Offsets in seconds, from the wall time and the UTC instant
+    offsets = (wall - column.dt.tz_convert(None).to_numpy()).astype("timedelta64[s]").astype(np.int64)
+    offsets[missing] = 0
+    offset_seconds = np.abs(offsets) % 60
+    with_seconds = offset_seconds.any()
+
+    digits = {"s": 0, "ms": 3, "us": 6, "ns": 9}[unit]
+    offset_at = 19 + (digits and digits + 1)
+    width = offset_at + (9 if with_seconds else 6)
+    out = np.empty((len(column), width), dtype=np.uint8)
+    out[:, :10] = dates[days - first_day]
+    out[:, 10] = ord("T")
+    out[:, 11:19] = _TIME_OF_DAY[seconds]
+    if digits:
+        out[:, 19] = ord(".")
+        fraction //= per_second // 10 ** digits
+        for group in range(digits // 3):
+            out[:, 20 + 3 * group:23 + 3 * group] = _THREE_DIGITS[fraction // 10 ** (digits - 3 - 3 * group) % 1000]
+    out[:, offset_at] = np.where(offsets < 0, ord("-"), ord("+"))
+    out[:, offset_at + 1:offset_at + 3] = _TWO_DIGITS[np.abs(offsets) // 3600]
+    out[:, offset_at + 3] = ord(":")
+    out[:, offset_at + 4:offset_at + 6] = _TWO_DIGITS[np.abs(offsets) // 60 % 60]
+    if with_seconds:
+        out[:, offset_at + 6] = ord(":")
+        out[:, offset_at + 7:offset_at + 9] = _TWO_DIGITS[offset_seconds]
+        out[offset_seconds == 0, offset_at + 6:] = 0
+    out[missing] = 0
+    return out, bool(with_seconds or missing.any())
+
+def csv_chunks(frame, chunk_size=CSV_CHUNK_ROWS):
+    """`frame` of tz-aware columns as CSV, in blocks of bytes: the header, then `chunk_size` rows at a time.
+
+    Each block is a byte matrix, one row per line: the columns' ISO 8601 text separated
+    by commas. Padding leaves zeros, which are dropped from blocks that have any.
+    """
+    units = [_precision(frame[column]) for column in frame.columns]
+    yield (",".join(frame.columns) + "\n").encode()
+    for start in range(0, len(frame), chunk_size):
+        chunk = frame.iloc[start:start + chunk_size]
+        fields, padded = zip(*(_iso_bytes(chunk[column], unit) for column, unit in zip(chunk.columns, units)))
+        separators = np.full((len(chunk), 1), ord(","), dtype=np.uint8)
+        lines = np.hstack([part for field in fields for part in (field, separators)])
+        lines[:, -1] = ord("\n")
+        lines = lines.ravel()
+        yield (lines[lines != 0] if any(padded) else lines).tobytes()
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert a column of timestamps from one time zone to others.")
+    parser.add_argument("file", nargs="?", help="CSV file with a header row and a timestamp column")
+    parser.add_argument("--column", help="column to convert (default: the first)")
+    parser.add_argument("--from", dest="source", default="UTC", help="zone of naive timestamps (default: %(default)s)")
+    parser.add_argument("--to", dest="targets", nargs="+", required=True, help="zones to convert to")
+    parser.add_argument("--format", help="strptime format of the timestamps (default: ISO 8601)")
+    parser.add_argument("--unit", choices=["s", "ms", "us", "ns"], help="timestamps are epoch numbers in this unit")
+    parser.add_argument("--ambiguous", choices=list(AMBIGUOUS), default="raise", help="times in a DST fold (default: %(default)s)")
+    parser.add_argument("--nonexistent", choices=NONEXISTENT, default="raise", help="times in a DST gap (default: %(default)s)")
+    parser.add_argument("--output", help="write the converted columns to this CSV file")
+    parser.add_argument("--benchmark", type=int, metavar="ROWS", help="convert ROWS synthetic timestamps instead of a file")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        # A year of sorted, naive second-resolution log timestamps in the source zone
+        start = pd.Timestamp("2026-01-01").value // 10**9
+        seconds = np.sort(np.random.default_rng(0).integers(start, start + 365 * 86400, args.benchmark))
+        values = pd.Series(np.datetime_as_string(seconds.astype("datetime64[s]")))
+    elif args.file:
+        frame = pd.read_csv(args.file, dtype=str, keep_default_na=False, na_values=[""])
+        values = frame[args.column or frame.columns[0]]
+    else:
+        parser.error("a file or --benchmark is required")
+
+    try:
+        frame, report = convert_timestamps(values, args.source, args.targets, args.ambiguous, args.nonexistent, args.format, args.unit)
+    except ValueError as error:
+        sys.exit(f"error: {error}")
+
+    print(f"Converted {report.rows:,} timestamps from {args.source} to {', '.join(args.targets)} "
+          f"in {report.elapsed:.2f} s ({report.throughput:,.0f} timestamps/s)")
+    print(f"Ambiguous (fold): {report.ambiguous:,} as {args.ambiguous}; nonexistent (gap): {report.nonexistent:,} as {args.nonexistent}; unparseable: {report.invalid:,}")
+
+    if args.output or args.benchmark:
+        started = time.perf_counter()
+        output = open(args.output, "wb") if args.output else None
+        size = 0
+        for block in csv_chunks(frame):
+            size += len(block)
+            if output:
+                output.write(block)
+        if output:
+            output.close()
+        elapsed = time.perf_counter() - started
+        print(f"Wrote {size / 1e6:,.1f} MB of CSV in {elapsed:.2f} s ({report.rows / elapsed:,.0f} rows/s)")
@@ -2,8 +2,10 @@
 import streamlit as st  # Streamlit is used for creating interactive web apps
 import streamlit.components.v1 as com # streamlit.components.v1 is used for embedding Lottie animations
 from datetime import datetime  # datetime is used for handling date and time operations
-from zoneinfo import ZoneInfo  # zoneinfo is used for working with time zones
 import time
+import pandas as pd  # pandas reads uploaded CSV files
+from batch import AMBIGUOUS, NONEXISTENT, convert_timestamps, csv_chunks  # bulk conversion of timestamp columns
+from zones import TIME_ZONES, ZONE_NAMES, ZONES, local_times  # zone registry: ZoneInfo objects and offset tables, built once
 
 # Set up the Streamlit app configuration
 st.set_page_config(
@@ -16,34 +18,6 @@ st.set_page_config(
 # Embed a Lottie animation using the com.iframe function
 com.iframe("https://lottie.host/embed/f5e47b1a-c4a4-4569-8833-73e62b676b75/G666l1OwXH.lottie")
 
-# Dictionary mapping display names to actual timezone keys
-# The keys are user-friendly names with country information, 
-# and the values are valid timezone identifiers recognized by ZoneInfo
-Time_Zones = {
-    "🌍 UTC": "UTC",
-    "🇵🇰 Karachi": "Asia/Karachi",
-    "🇺🇸 New York": "America/New_York",
-    "🇬🇧 London": "Europe/London",
-    "🇯🇵 Tokyo": "Asia/Tokyo",
-    "🇦🇺 Sydney": "Australia/Sydney",
-    "🇺🇸 Los Angeles": "America/Los_Angeles",
-    "🇩🇪 Berlin": "Europe/Berlin",
-    "🇦🇪 Dubai": "Asia/Dubai",
-    "🇮🇳 Kolkata": "Asia/Kolkata",
-    "🇺🇸 Honolulu": "Pacific/Honolulu",
-    "🇺🇸 Chicago": "America/Chicago",
-    "🇺🇸 Denver": "America/Denver",
-    "🇺🇸 Phoenix": "America/Phoenix",
-    "🇨🇦 Toronto": "America/Toronto",
-    "🇮🇸 Reykjavik": "Atlantic/Reykjavik",
-    "🇳🇿 Auckland": "Pacific/Auckland",
-    "🇺🇸 Midway": "Pacific/Midway",
-    "🇧🇷 Sao Paulo": "America/Sao_Paulo",
-    "🇦🇷 Buenos Aires": "America/Argentina/Buenos_Aires",
-    "🇺🇸 Anchorage": "America/Anchorage",
-    "🇺🇸 Juneau": "America/Juneau",
-}
-
 # Display the app title
 st.title("⏲️ Time Zone Converter App ⌛")
 
@@ -51,18 +25,21 @@ st.title("⏲️ Time Zone Converter App ⌛")
 # Users can choose multiple time zones to view the current time in each
 selected_time_zone = st.multiselect(
     "Select Time Zone",  # Dropdown label
-    list(Time_Zones.keys()),  # Display user-friendly names
+    ZONE_NAMES,  # Display user-friendly names
     default=["🌍 UTC", "🇵🇰 Karachi"]  # Default selected options
 )
 
 # Section to display the current time for selected time zones
 st.subheader("Selected Time Zones:")
 
-# Loop through each selected time zone and display the current time
-for tz_display in selected_time_zone:
-    tz_key = Time_Zones[tz_display]  # Get the actual timezone key from the dictionary
-    current_time = datetime.now(ZoneInfo(tz_key)).strftime("%d-%m-%Y %I:%M:%S %p")  # Format in 12-hour format with AM/PM
-    st.write(f"**{tz_display}**: {current_time}")  # Display time with user-friendly name
+# Live clock: the fragment reruns on its own every second, without rerunning the whole script
+@st.fragment(run_every=1)
+def show_selected_times(selected):
+    # One clock reading for every zone; each zone's time is that instant plus its offset
+    for tz_display, zone_time in zip(selected, local_times(selected)):
+        st.write(f"**{tz_display}**: {zone_time.strftime('%d-%m-%Y %I:%M:%S %p')}")  # Format in 12-hour format with AM/PM
+
+show_selected_times(selected_time_zone)
 
 # 🌍 **Time Conversion Section**
 st.subheader("Convert Time between Time Zones")
@@ -76,14 +53,14 @@ current_time = st.time_input(
 # **Select source (From) time zone**
 from_tz_display = st.selectbox(
     "From Time Zone",  # Label for dropdown
-    list(Time_Zones.keys()),  # Use user-friendly names
+    ZONE_NAMES,  # Use user-friendly names
     index=0  # Default to UTC
 )
 
 # **Select destination (To) time zone**
 to_tz_display = st.selectbox(
     "To Time Zone",  # Label for dropdown
-    list(Time_Zones.keys()),  # Use user-friendly names
+    ZONE_NAMES,  # Use user-friendly names
     index=1  # Default to Asia/Karachi (Pakistan)
 )
 
@@ -91,14 +68,78 @@ to_tz_display = st.selectbox(
 if st.button("Convert Time"):
     with st.spinner("Converting Time..."):  # Show a loading spinner
         time.sleep(2)  # Simulate a delay for demonstration purposes
-        from_tz_key = Time_Zones[from_tz_display]  # Get the valid timezone key
-        to_tz_key = Time_Zones[to_tz_display]  # Get the valid timezone key
-
         # Combine the selected time with today's date and assign the source time zone
-        dt = datetime.combine(datetime.today(), current_time).replace(tzinfo=ZoneInfo(from_tz_key))
+        dt = datetime.combine(datetime.today(), current_time).replace(tzinfo=ZONES[from_tz_display])
 
         # Convert the time to the destination time zone
-        converted_time = dt.astimezone(ZoneInfo(to_tz_key)).strftime("%d-%m-%Y %I:%M:%S %p")
+        converted_time = dt.astimezone(ZONES[to_tz_display]).strftime("%d-%m-%Y %I:%M:%S %p")
 
         # Display the converted time in a success message
         st.success(f"Converted Time in {to_tz_display} : {converted_time}")
+
+# 📂 **Batch Conversion Section**
+# Re-zone a whole column of timestamps, e.g. from a log file, into several zones at once
+st.subheader("Convert a Column of Timestamps")
+
+# One column of the upload as text, blanks missing
+def read_column(uploaded, column):
+    uploaded.seek(0)
+    return pd.read_csv(uploaded, usecols=[column], dtype=str, keep_default_na=False, na_values=[""])[column]
+
+# The converted CSV, built only when the download button is clicked: it's many times the
+# size of the upload, so it is never kept in the session
+def converted_csv(uploaded, column, settings):
+    frame, _ = convert_timestamps(read_column(uploaded, column), *settings)
+    return b"".join(csv_chunks(frame))
+
+uploaded = st.file_uploader("Upload a CSV file", type=["csv"], help="The file needs a header row.")  # File with a timestamp column
+
+if uploaded is not None:
+    columns = pd.read_csv(uploaded, nrows=0).columns.tolist()  # Read only the header
+    column = st.selectbox("Timestamp Column", columns)  # Column to convert
+    unit = st.selectbox(
+        "Timestamps are",  # Text, or numbers counted from 1970-01-01 UTC
+        [None, "s", "ms", "us", "ns"],
+        format_func=lambda unit: "Date and time text" if unit is None else f"Epoch {unit}",
+    )
+    timestamp_format = st.text_input("Format (optional)", placeholder="ISO 8601, e.g. 2026-03-08 02:30:00", help="A strptime format such as %d/%m/%Y %H:%M:%S.") if unit is None else None
+    batch_from = st.selectbox("From Time Zone (for timestamps without an offset)", ZONE_NAMES, index=0)
+    batch_to = st.multiselect("To Time Zones", ZONE_NAMES, default=["🇵🇰 Karachi"])
+
+    # Wall-clock times that daylight saving repeats or skips, handled as chosen here
+    ambiguous = st.selectbox(
+        "Repeated times (clocks go back)", list(AMBIGUOUS),
+        format_func={"earliest": "Earliest (daylight time)", "latest": "Latest (standard time)", "infer": "Infer from order (sorted logs)", "NaT": "Leave empty", "raise": "Stop with an error"}.get,
+    )
+    nonexistent = st.selectbox(
+        "Skipped times (clocks go forward)", NONEXISTENT,
+        format_func={"shift_forward": "Shift to the first valid time", "shift_backward": "Shift to the last valid time", "NaT": "Leave empty", "raise": "Stop with an error"}.get,
+    )
+
+    settings = (
+        TIME_ZONES[batch_from], [TIME_ZONES[name] for name in batch_to],
+        ambiguous, nonexistent, timestamp_format or None, unit,
+    )
+    if st.button("Convert Column") and batch_to:
+        try:
+            frame, report = convert_timestamps(read_column(uploaded, column), *settings)
+            # Only the report, a preview and the settings are kept; the download rebuilds the rest
+            st.session_state["batch"] = (uploaded.file_id, column, settings, report, frame.head(20))
+        except ValueError as error:
+            st.error(f"Could not convert: {error}")
+
+    # Results stay up across reruns until another file is uploaded
+    batch = st.session_state.get("batch")
+    if batch and batch[0] == uploaded.file_id:
+        _, batch_column, batch_settings, report, preview = batch
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Timestamps", f"{report.rows:,}")
+        col2.metric("Throughput", f"{report.throughput:,.0f}/s")
+        col3.metric("Unparseable", f"{report.invalid:,}")
+        st.caption(f"Repeated times: {report.ambiguous:,} · skipped times: {report.nonexistent:,}")
+        st.dataframe(preview)
+        st.download_button(
+            "⬇️ Download converted CSV",
+            lambda: converted_csv(uploaded, batch_column, batch_settings),
+            "converted.csv", "text/csv", on_click="ignore",
+        )
@@ -0,0 +1,36 @@
+# Tests for batch.py; run with `python -m pytest` from this folder.
+import io
+
+import pandas as pd
+
+from batch import convert_timestamps
+
+# A column read the way the app and the CLI read it: as text, blanks missing
+def read_column(text):
+    return pd.read_csv(io.StringIO(text), dtype=str, keep_default_na=False, na_values=[""])["ts"]
+
+def test_epoch_text_from_csv():
+    values = read_column("ts\n1767225600\n1767225600.5\n\nnot a number\n")
+    frame, report = convert_timestamps(values, "UTC", ["Asia/Tokyo"], unit="s")
+    assert frame["UTC"].iloc[0] == pd.Timestamp("2026-01-01T00:00:00Z")
+    assert frame["Asia/Tokyo"].iloc[1] == pd.Timestamp("2026-01-01T09:00:00.5+09:00")
+    assert frame["UTC"].isna().tolist() == [False, False, True]
+    assert report.invalid == 1
+
+def test_nanosecond_epoch_keeps_every_digit():
+    values = read_column("ts\n1767225600123456789\n1767225600.5\n99999999999999999999\n")
+    frame, report = convert_timestamps(values, "UTC", ["UTC"], unit="ns")
+    assert frame["UTC"].iloc[0] == pd.Timestamp("2026-01-01T00:00:00.123456789Z")
+    assert frame["UTC"].isna().tolist() == [False, False, True]
+    assert report.invalid == 1
+
+def test_mixed_naive_and_offset_rows():
+    values = read_column("ts\n2026-01-01T12:00:00\n2026-01-01T12:00:00Z\n2026-07-01T12:00:00+05:30\n")
+    frame, report = convert_timestamps(values, "America/New_York", ["UTC"])
+    # The naive row is New York wall time; the others keep their own offsets
+    assert frame["UTC"].tolist() == [
+        pd.Timestamp("2026-01-01T17:00:00Z"),
+        pd.Timestamp("2026-01-01T12:00:00Z"),
+        pd.Timestamp("2026-07-01T06:30:00Z"),
+    ]
+    assert report.invalid == 0
@@ -0,0 +1,113 @@
+# Zone registry: the app's time zones, resolved once per process.
+#
+# - Every zone's ZoneInfo is built once, and the widget options are listed once.
+# - For each UTC year, OffsetTable holds every zone's offset transitions as NumPy arrays:
+#   a row per zone of UTC instants (seconds since the epoch) at which a new offset
+#   starts, and the offsets themselves. Rows are padded with a far-future instant.
+# - local_times then works out the wall-clock time in any number of zones from one
+#   instant with array arithmetic: count the transitions already passed, pick that
+#   offset, add it. No datetime.now call per zone.
+#
+# Transitions are found by sampling every zone's offset once a day and bisecting to the
+# second wherever it changes, so no private zoneinfo data is read.
+from datetime import UTC, datetime
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+# Dictionary mapping display names to actual timezone keys
+# The keys are user-friendly names with country information,
+# and the values are valid timezone identifiers recognized by ZoneInfo
+TIME_ZONES = {
+    "🌍 UTC": "UTC",
+    "🇵🇰 Karachi": "Asia/Karachi",
+    "🇺🇸 New York": "America/New_York",
+    "🇬🇧 London": "Europe/London",
+    "🇯🇵 Tokyo": "Asia/Tokyo",
+    "🇦🇺 Sydney": "Australia/Sydney",
+    "🇺🇸 Los Angeles": "America/Los_Angeles",
+    "🇩🇪 Berlin": "Europe/Berlin",
+    "🇦🇪 Dubai": "Asia/Dubai",
+    "🇮🇳 Kolkata": "Asia/Kolkata",
+    "🇺🇸 Honolulu": "Pacific/Honolulu",
+    "🇺🇸 Chicago": "America/Chicago",
+    "🇺🇸 Denver": "America/Denver",
+    "🇺🇸 Phoenix": "America/Phoenix",
+    "🇨🇦 Toronto": "America/Toronto",
+    "🇮🇸 Reykjavik": "Atlantic/Reykjavik",
+    "🇳🇿 Auckland": "Pacific/Auckland",
+    "🇺🇸 Midway": "Pacific/Midway",
+    "🇧🇷 Sao Paulo": "America/Sao_Paulo",
+    "🇦🇷 Buenos Aires": "America/Argentina/Buenos_Aires",
+    "🇺🇸 Anchorage": "America/Anchorage",
+    "🇺🇸 Juneau": "America/Juneau",
+}
+
+# Display names, in order, for the select widgets
+ZONE_NAMES = list(TIME_ZONES)
+
+# Row of each display name in the offset tables
+ZONE_INDEX = {name: index for index, name in enumerate(ZONE_NAMES)}
+
+ZONES = {name: ZoneInfo(key) for name, key in TIME_ZONES.items()}
+
+# Pads rows of the offset tables; later than any instant the app will see
+NEVER = np.iinfo(np.int64).max
+
+DAY = 86400
+
+def _offset(zone, instant):
+    """UTC offset of `zone` in seconds at `instant`, in seconds since the epoch."""
+    return int(datetime.fromtimestamp(instant, zone).utcoffset().total_seconds())
+
+# (instant, offset) for every offset change of `zone` in [start, end), plus the offset at `start`
+def _transitions(zone, start, end):
+    changes = [(start, _offset(zone, start))]
+    for day_start in range(start, end, DAY):
+        last_second = min(day_start + DAY, end) - 1
+        low, high = day_start, last_second
+        # The day ends on a new offset: bisect to the second it starts, then look further on
+        while _offset(zone, high) != changes[-1][1]:
+            while high - low > 1:
+                middle = (low + high) // 2
+                if _offset(zone, middle) == changes[-1][1]:
+                    low = middle
+                else:
+                    high = middle
+            changes.append((high, _offset(zone, high)))
+            low, high = high, last_second
+    return changes
+
+class OffsetTable:
+    """Offset transitions of every registry zone during one UTC year."""
+
+    def __init__(self, year):
+        self.year = year
+        self.start = int(datetime(year, 1, 1, tzinfo=UTC).timestamp())
+        self.end = int(datetime(year + 1, 1, 1, tzinfo=UTC).timestamp())
+        rows = [_transitions(zone, self.start, self.end) for zone in ZONES.values()]
+        width = max(len(row) for row in rows)
+        self.instants = np.full((len(rows), width), NEVER, dtype=np.int64)
+        self.offsets = np.zeros((len(rows), width), dtype=np.int64)
+        for index, row in enumerate(rows):
+            self.instants[index, :len(row)] = [instant for instant, _ in row]
+            self.offsets[index, :len(row)] = [offset for _, offset in row]
+
+    def offsets_at(self, instant, rows):
+        """Offsets in seconds of the zones in `rows` at `instant`, which must fall in the year."""
+        instants = self.instants[rows]
+        passed = (instants <= instant).sum(axis=1) - 1
+        return self.offsets[rows, passed]
+
+@lru_cache(maxsize=2)
+def offset_table(year):
+    return OffsetTable(year)
+
+def local_times(names, now=None):
+    """Wall-clock time in each zone of `names` at `now` (default: the current time), as naive datetimes."""
+    now = now or datetime.now(UTC)
+    instant = int(now.timestamp())
+    rows = np.array([ZONE_INDEX[name] for name in names], dtype=np.intp)
+    local = instant + offset_table(now.astimezone(UTC).year).offsets_at(instant, rows)
+    return (local * 1_000_000 + now.microsecond).astype("datetime64[us]").tolist()
@@ -0,0 +1,155 @@
+# Conversion throughput benchmark suite
+#
+# Measures, for every category in conversion_options:
+#   - scalar:       the category's conversion function over every from/to unit pair
+#   - batch:        convert_batch over a NumPy array
+#   - exact:        convert_exact for one value
+#   - pathological: inputs that take unusual paths (Milliradian angles, zero and
+#                   non-finite fuel economy values, extreme magnitudes)
+# and the import time of converter.py in a fresh interpreter.
+#
+# Run with:
+#   python benchmark.py                            # print results
+#   python benchmark.py --json baseline.json       # save results
+#   python benchmark.py --compare baseline.json    # flag cases slower than the baseline
+import argparse
+import json
+import subprocess
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+from converter import conversion_options, convert_batch, convert_exact, exact_table
+
+
+# ------------------------------------------------------------------------------
+# Timing Helpers
+# ------------------------------------------------------------------------------
+# Best-of-N seconds per call of `func`, with the loop count picked by timeit.autorange
+def seconds_per_call(func, repeat=3):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+# Best-of-N import time of converter.py, each in a fresh interpreter
+def import_seconds(repeat=5):
+    code = "import time; start = time.perf_counter(); import converter; print(time.perf_counter() - start)"
+    runs = [
+        float(subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parent, capture_output=True, text=True, check=True).stdout)
+        for _ in range(repeat)
+    ]
+    return min(runs)
+
+# ------------------------------------------------------------------------------
+# Benchmark Cases
+# ------------------------------------------------------------------------------
+# Every case returns seconds per call; names are stable so results can be compared across runs.
+
+# Each category's function over every from/to pair, reported per conversion
+def scalar_cases():
+    results = {}
+    for category, option in conversion_options.items():
+        conv_function = option["function"]
+        pairs = [(f, t) for f in option["units"] for t in option["units"]]
+
+        def convert_all_pairs():
+            for from_unit, to_unit in pairs:
+                conv_function(12.5, from_unit, to_unit)
+
+        results[f"scalar/{category}"] = seconds_per_call(convert_all_pairs) / len(pairs)
+    return results
+
+# convert_batch over `size` values, first unit to last unit
+def batch_cases(size):
+    values = np.random.default_rng(0).uniform(1, 1000, size)
+    results = {}
+    for category, option in conversion_options.items():
+        from_unit, to_unit = option["units"][0], option["units"][-1]
+        results[f"batch/{category}"] = seconds_per_call(lambda: convert_batch(category, values, from_unit, to_unit))
+    return results
+
+# convert_exact for one value, with the category's Fraction table already built
+def exact_cases():
+    results = {}
+    for category, option in conversion_options.items():
+        from_unit, to_unit = option["units"][0], option["units"][-1]
+        exact_table(category)
+        results[f"exact/{category}"] = seconds_per_call(lambda: convert_exact(category, 12.5, from_unit, to_unit))
+    return results
+
+# Inputs that used to take, or still take, unusual code paths
+def pathological_cases(size):
+    plane_angle = conversion_options["📐 Plane Angle"]["function"]
+    fuel_economy = conversion_options["⛽ Fuel Economy"]["function"]
+    angles = np.random.default_rng(1).uniform(-1e4, 1e4, size)
+    fuel_with_zeros = np.where(np.arange(size) % 10 == 0, 0.0, 8.5)
+    non_finite = np.array([np.nan, np.inf, -np.inf, 0.0] * (size // 4))
+    extremes = np.array([1e-300, 1e300, -1e-300, -1e300] * (size // 4))
+
+    # Scalar division by zero raises, so this measures the cost of the exception path
+    def fuel_economy_zero():
+        try:
+            fuel_economy(0.0, "L/100km", "Miles per Gallon")
+        except ZeroDivisionError:
+            pass
+
+    return {
+        "pathological/milliradian scalar": seconds_per_call(lambda: plane_angle(1234.5, "Milliradian", "Arcsecond")),
+        "pathological/milliradian batch": seconds_per_call(lambda: convert_batch("📐 Plane Angle", angles, "Milliradian", "Arcsecond")),
+        "pathological/fuel economy zero scalar": seconds_per_call(fuel_economy_zero),
+        "pathological/fuel economy zeros batch": seconds_per_call(lambda: convert_batch("⛽ Fuel Economy", fuel_with_zeros, "L/100km", "Miles per Gallon")),
+        "pathological/fuel economy non-finite batch": seconds_per_call(lambda: convert_batch("⛽ Fuel Economy", non_finite, "L/100km", "Kilometers per Liter")),
+        "pathological/temperature extremes batch": seconds_per_call(lambda: convert_batch("🌡️ Temperature", extremes, "Fahrenheit", "Kelvin")),
+        "pathological/energy exact eV to kWh": seconds_per_call(lambda: convert_exact("⚡ Energy", 1, "Electronvolt (eV)", "Kilowatt-hour (kWh)", 50)),
+    }
+
+# ------------------------------------------------------------------------------
+# Reporting
+# ------------------------------------------------------------------------------
+# Format seconds with a unit that keeps a few significant digits
+def format_seconds(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.3f} {unit}"
+    return f"{seconds / 1e-9:8.1f} ns"
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the unit conversion engine.")
+    parser.add_argument("--size", type=int, default=1_000_000, help="values per batch case (default: %(default)s)")
+    parser.add_argument("--json", type=Path, help="write results to this JSON file")
+    parser.add_argument("--compare", type=Path, help="compare against a JSON file written by --json")
+    parser.add_argument("--threshold", type=float, default=0.25, help="slowdown ratio reported as a regression (default: %(default)s)")
+    args = parser.parse_args()
+
+    results = {"import/converter": import_seconds()}
+    results.update(scalar_cases())
+    results.update(batch_cases(args.size))
+    results.update(exact_cases())
+    results.update(pathological_cases(args.size))
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    baseline = json.loads(args.compare.read_text(encoding="utf-8")) if args.compare else {}
+    regressions = []
+    print(f"{'Case':<52}{'Time':>12}{'Baseline':>14}")
+    for name, seconds in results.items():
+        line = f"{name:<52}{format_seconds(seconds):>12}"
+        if name in baseline:
+            change = seconds / baseline[name] - 1
+            line += f"{format_seconds(baseline[name]):>14} {change:+7.1%}"
+            if change > args.threshold:
+                regressions.append(name)
+                line += "  REGRESSION"
+        print(line)
+
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than the baseline by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,513 @@
+# Headless unit-conversion engine shared by the Streamlit app, batch jobs and the CLI.
+# Only `math` and `sys` are imported at module level so it loads in a few milliseconds;
+# NumPy, fractions/decimal and argparse are imported on first use of batch, exact and CLI mode.
+#
+# CLI usage (one value per line, from files or stdin):
+#   python -m converter Length Foot Meter values.txt
+#   cat readings.txt | python -m converter "Temperature" Celsius Kelvin --round 2
+#   python -m converter Length Nanometer Mile --exact --precision 40 values.txt
+import math
+import sys
+
+
+# ------------------------------------------------------------------------------
+# Unit Definitions
+# ------------------------------------------------------------------------------
+# Each category lists its units with the factor that takes a value into the base unit.
+
+# Length (base unit: Meter)
+LENGTH_FACTORS = {
+    "Meter": 1,
+    "Kilometer": 1000,
+    "Centimeter": 0.01,
+    "Millimeter": 0.001,
+    "Mile": 1609.34,
+    "Yard": 0.9144,
+    "Foot": 0.3048,
+    "Inch": 0.0254,
+    "Nautical Mile": 1852,
+    "Nanometer": 1e-9
+}
+
+# Area (base unit: Square Meter)
+AREA_FACTORS = {
+    "Square Meter": 1,
+    "Square Kilometer": 1e6,
+    "Square Centimeter": 0.0001,
+    "Square Millimeter": 1e-6,
+    "Square Mile": 2.59e6,
+    "Square Yard": 0.83612736,
+    "Square Foot": 0.09290304,
+    "Hectare": 10000,
+    "Acre": 4046.86
+}
+
+# Mass (base unit: Kilogram)
+MASS_FACTORS = {
+    "Kilogram": 1,
+    "Gram": 0.001,
+    "Milligram": 1e-6,
+    "Microgram": 1e-9,
+    "Pound": 0.453592,
+    "Ounce": 0.0283495,
+    "Tonne": 1000,
+    "Stone": 6.35029,
+    "Imperial Ton": 1016.05,
+    "US Ton": 907.185
+}
+
+# Data Transfer Rate (base unit: bits per second)
+DATA_TRANSFER_RATE_FACTORS = {
+    "Bits per Second (bps)": 1,                         # Base unit: 1 bit per second
+    "Kilobits per Second (Kbps)": 1e3,                  # 1 Kbps = 1,000 bits per second
+    "Megabits per Second (Mbps)": 1e6,                  # 1 Mbps = 1,000,000 bits per second
+    "Gigabits per Second (Gbps)": 1e9,                  # 1 Gbps = 1,000,000,000 bits per second
+    "Terabits per Second (Tbps)": 1e12,                 # 1 Tbps = 1,000,000,000,000 bits per second
+    "Kibibits per Second (Kibps)": 1024,                # 1 Kibps = 1,024 bits per second
+    "Mebibits per Second (Mibps)": 1024**2,             # 1 Mibps = 1,048,576 bits per second
+    "Gibibits per Second (Gibps)": 1024**3,             # 1 Gibps = 1,073,741,824 bits per second
+    "Tebibits per Second (Tibps)": 1024**4,             # 1 Tibps = 1,099,511,627,776 bits per second
+    "Bytes per Second (Bps)": 8,                        # 1 Byte per second = 8 bits per second
+    "Kilobytes per Second (KBps)": 8e3,                 # 1 KBps = 8,000 bits per second
+    "Megabytes per Second (MBps)": 8e6,                 # 1 MBps = 8,000,000 bits per second
+    "Gigabytes per Second (GBps)": 8e9,                 # 1 GBps = 8,000,000,000 bits per second
+    "Terabytes per Second (TBps)": 8e12                 # 1 TBps = 8,000,000,000,000 bits per second
+}
+
+# Digital Storage (base unit: Byte)
+DIGITAL_STORAGE_FACTORS = {
+    "Byte": 1,
+    "Kilobyte": 1024,
+    "Megabyte": 1024**2,
+    "Gigabyte": 1024**3,
+    "Terabyte": 1024**4
+}
+
+# Energy (base unit: Joule)
+ENERGY_FACTORS = {
+    "Joule (J)": 1,                              # Base unit: 1 joule
+    "Kilojoule (kJ)": 1e3,                       # 1 kilojoule = 1,000 joules
+    "Calorie (cal)": 4.184,                      # 1 calorie = 4.184 joules
+    "Kilocalorie (kcal)": 4.184e3,               # 1 kilocalorie = 4,184 joules
+    "Watt-hour (Wh)": 3.6e3,                     # 1 watt-hour = 3,600 joules
+    "Kilowatt-hour (kWh)": 3.6e6,                # 1 kilowatt-hour = 3,600,000 joules
+    "Electronvolt (eV)": 1.602176634e-19,        # 1 electronvolt ≈ 1.602176634e-19 joules
+    "British Thermal Unit (BTU)": 1055.06,       # 1 BTU ≈ 1,055.06 joules
+    "Foot-pound (ft·lb)": 1.3558179483314004,    # 1 foot-pound ≈ 1.3558179483314004 joules
+}
+
+# Frequency (base unit: Hertz)
+FREQUENCY_FACTORS = {
+    "Hertz (Hz)": 1,                   # Base unit: 1 Hz
+    "Kilohertz (kHz)": 1e3,             # 1 kHz = 1,000 Hz
+    "Megahertz (MHz)": 1e6,             # 1 MHz = 1,000,000 Hz
+    "Gigahertz (GHz)": 1e9,             # 1 GHz = 1,000,000,000 Hz
+}
+
+# Plane Angle (base unit: Degree)
+PLANE_ANGLE_FACTORS = {
+    "Degree": 1,
+    "Radian": 180 / math.pi,
+    "Gradian": 0.9,
+    "Arcminute": 1 / 60,
+    "Arcsecond": 1 / 3600,
+    "Milliradian": 180 / math.pi / 1000
+}
+
+# Pressure (base unit: Pascal)
+PRESSURE_FACTORS = {
+    "Pascal": 1,
+    "Kilopascal": 1000,
+    "Bar": 100000,
+    "Atmosphere": 101325,
+    "PSI": 6894.76
+}
+
+# Speed (base unit: meter/second)
+SPEED_FACTORS = {
+    "m/s": 1,
+    "km/h": 1/3.6,
+    "mph": 0.44704,
+    "Knots": 0.514444
+}
+
+# Time (base unit: Second)
+TIME_FACTORS = {
+    "Second": 1,
+    "Millisecond": 1e-3,       # 1 ms = 0.001 seconds
+    "Microsecond": 1e-6,       # 1 µs = 0.000001 seconds
+    "Nanosecond": 1e-9,        # 1 ns = 0.000000001 seconds
+    "Minute": 60,              # 1 minute = 60 seconds
+    "Hour": 3600,              # 1 hour = 3600 seconds
+    "Day": 86400,              # 1 day = 86400 seconds
+    "Week": 604800,            # 1 week = 604800 seconds
+    "Month": 2629746,          # 1 month ≈ 30.44 days ≈ 2629746 seconds (average)
+    "Calendar Year": 31556952, # 1 year ≈ 365.2425 days ≈ 31,556,952 seconds
+    "Decade": 315569520,       # 1 decade = 10 years
+    "Century": 3155695200      # 1 century = 100 years
+}
+
+# Volume (base unit: Liter)
+VOLUME_FACTORS = {
+    "Liter": 1,
+    "Milliliter": 0.001,
+    "Cubic Meter": 1000,
+    "Cubic Centimeter": 0.001,
+    "US Gallon": 3.78541,
+    "US Pint": 0.473176
+}
+
+# Temperature (base unit: Kelvin) as (scale, offset): kelvin = value * scale + offset
+TEMPERATURE_COEFFICIENTS = {
+    "Celsius": (1, 273.15),
+    "Fahrenheit": (5/9, 273.15 - 32 * 5/9),
+    "Kelvin": (1, 0)
+}
+
+# Fuel Economy (base unit: Kilometers per Liter) as (factor, reciprocal):
+# L/100km is an inverse unit, so kilometers per liter = 100 / value
+FUEL_ECONOMY_COEFFICIENTS = {
+    "Kilometers per Liter": (1, False),
+    "Miles per Gallon": (0.425144, False),
+    "L/100km": (100, True)
+}
+
+# Miles per Gallon <-> L/100km keeps its own constant rather than going through the base unit:
+# 100 / 0.425144 would be 235.2144215..., about 7e-7 relative away from the published 235.214583
+FUEL_ECONOMY_PAIRS = {
+    ("Miles per Gallon", "L/100km"): (235.214583, 0, True),
+    ("L/100km", "Miles per Gallon"): (235.214583, 0, True),
+}
+
+# Exact values, as Fraction strings, for the factors above that aren't finite decimals.
+# Exact mode uses these in place of the float; every other factor is read as the decimal it is written as.
+EXACT_FACTORS = {
+    "Radian": "57.295779513082320876798154814105170332405472466564321549160",        # 180 / π
+    "Milliradian": "0.057295779513082320876798154814105170332405472466564321549160",  # 180 / π / 1000
+    "Arcminute": "1/60",
+    "Arcsecond": "1/3600",
+    "km/h": "5/18",
+    "Fahrenheit": ("5/9", "45967/180"),                                              # 273.15 - 32 * 5/9
+}
+
+# ------------------------------------------------------------------------------
+# Conversion Tables
+# ------------------------------------------------------------------------------
+# Every category is compiled once, at import, into a from×to table of coefficients
+# (scale, offset, reciprocal). A conversion is then one dict lookup plus one
+# multiply-add, instead of going through the base unit or an if/elif chain.
+
+# Compile units given as (scale into base, offset into base, reciprocal) into a pairwise table.
+# `number` is the type the coefficients are stored as: float, or Fraction for exact mode.
+# `pairs` gives (scale, offset, reciprocal) for pairs that don't go through the base unit.
+def compile_table(units, number=float, pairs=None):
+    table = {}
+    for from_unit, (from_scale, from_offset, from_reciprocal) in units.items():
+        for to_unit, (to_scale, to_offset, to_reciprocal) in units.items():
+            if from_reciprocal == to_reciprocal:
+                if from_reciprocal:
+                    # base = from_scale / value, result = to_scale / base
+                    scale, offset, reciprocal = to_scale / from_scale, 0, False
+                else:
+                    # base = value * from_scale + from_offset, result = (base - to_offset) / to_scale
+                    scale, offset, reciprocal = from_scale / to_scale, (from_offset - to_offset) / to_scale, False
+            elif from_reciprocal:
+                # base = from_scale / value, result = base / to_scale
+                scale, offset, reciprocal = from_scale / to_scale, 0, True
+            else:
+                # base = value * from_scale, result = to_scale / base
+                scale, offset, reciprocal = to_scale / from_scale, 0, True
+            table[from_unit, to_unit] = (number(scale), number(offset), reciprocal)
+    for pair, (scale, offset, reciprocal) in (pairs or {}).items():
+        table[pair] = (number(scale), number(offset), reciprocal)
+    return table
+
+# Describe a plain factor dict (no offsets, no inverse units) in compile_table's format
+def linear_units(factors):
+    return {unit: (factor, 0, False) for unit, factor in factors.items()}
+
+# Apply one table entry to a scalar or a NumPy array
+def apply_coefficients(coefficients, value):
+    scale, offset, reciprocal = coefficients
+    if reciprocal:
+        return scale / value
+    return value * scale + offset
+
+# Build a conversion function backed by a compiled table
+def make_converter(table):
+    def convert(value, from_unit, to_unit):
+        return apply_coefficients(table[from_unit, to_unit], value)
+    return convert
+
+LENGTH_UNITS = linear_units(LENGTH_FACTORS)
+TEMPERATURE_UNITS = {unit: (scale, offset, False) for unit, (scale, offset) in TEMPERATURE_COEFFICIENTS.items()}
+AREA_UNITS = linear_units(AREA_FACTORS)
+MASS_UNITS = linear_units(MASS_FACTORS)
+DATA_TRANSFER_RATE_UNITS = linear_units(DATA_TRANSFER_RATE_FACTORS)
+DIGITAL_STORAGE_UNITS = linear_units(DIGITAL_STORAGE_FACTORS)
+ENERGY_UNITS = linear_units(ENERGY_FACTORS)
+FREQUENCY_UNITS = linear_units(FREQUENCY_FACTORS)
+FUEL_ECONOMY_UNITS = {unit: (factor, 0, reciprocal) for unit, (factor, reciprocal) in FUEL_ECONOMY_COEFFICIENTS.items()}
+PLANE_ANGLE_UNITS = linear_units(PLANE_ANGLE_FACTORS)
+PRESSURE_UNITS = linear_units(PRESSURE_FACTORS)
+SPEED_UNITS = linear_units(SPEED_FACTORS)
+TIME_UNITS = linear_units(TIME_FACTORS)
+VOLUME_UNITS = linear_units(VOLUME_FACTORS)
+
+LENGTH_TABLE = compile_table(LENGTH_UNITS)
+TEMPERATURE_TABLE = compile_table(TEMPERATURE_UNITS)
+AREA_TABLE = compile_table(AREA_UNITS)
+MASS_TABLE = compile_table(MASS_UNITS)
+DATA_TRANSFER_RATE_TABLE = compile_table(DATA_TRANSFER_RATE_UNITS)
+DIGITAL_STORAGE_TABLE = compile_table(DIGITAL_STORAGE_UNITS)
+ENERGY_TABLE = compile_table(ENERGY_UNITS)
+FREQUENCY_TABLE = compile_table(FREQUENCY_UNITS)
+FUEL_ECONOMY_TABLE = compile_table(FUEL_ECONOMY_UNITS, pairs=FUEL_ECONOMY_PAIRS)
+PLANE_ANGLE_TABLE = compile_table(PLANE_ANGLE_UNITS)
+PRESSURE_TABLE = compile_table(PRESSURE_UNITS)
+SPEED_TABLE = compile_table(SPEED_UNITS)
+TIME_TABLE = compile_table(TIME_UNITS)
+VOLUME_TABLE = compile_table(VOLUME_UNITS)
+
+# ------------------------------------------------------------------------------
+# Conversion Functions
+# ------------------------------------------------------------------------------
+# Each function converts an input value from one unit to another with a single table lookup.
+convert_length = make_converter(LENGTH_TABLE)
+convert_temperature = make_converter(TEMPERATURE_TABLE)
+convert_area = make_converter(AREA_TABLE)
+convert_mass = make_converter(MASS_TABLE)
+convert_data_transfer_rate = make_converter(DATA_TRANSFER_RATE_TABLE)
+convert_digital_storage = make_converter(DIGITAL_STORAGE_TABLE)
+convert_energy = make_converter(ENERGY_TABLE)
+convert_frequency = make_converter(FREQUENCY_TABLE)
+convert_fuel_economy = make_converter(FUEL_ECONOMY_TABLE)
+convert_plane_angle = make_converter(PLANE_ANGLE_TABLE)
+convert_pressure = make_converter(PRESSURE_TABLE)
+convert_speed = make_converter(SPEED_TABLE)
+convert_time = make_converter(TIME_TABLE)
+convert_volume = make_converter(VOLUME_TABLE)
+
+# ------------------------------------------------------------------------------
+# Dictionary for Conversion Options
+# ------------------------------------------------------------------------------
+conversion_options = {
+    "📏 Length": {
+        "function": convert_length,
+        "definition": LENGTH_UNITS,
+        "table": LENGTH_TABLE,
+        "units": ["Meter", "Kilometer", "Centimeter", "Millimeter", "Mile", "Yard", "Foot", "Inch", "Nautical Mile", "Nanometer"]
+    },
+    "🌡️ Temperature": {
+        "function": convert_temperature,
+        "definition": TEMPERATURE_UNITS,
+        "table": TEMPERATURE_TABLE,
+        "units": ["Celsius", "Fahrenheit", "Kelvin"]
+    },
+    "🗺️ Area": {
+        "function": convert_area,
+        "definition": AREA_UNITS,
+        "table": AREA_TABLE,
+        "units": ["Square Meter", "Square Kilometer", "Square Centimeter", "Square Millimeter", "Hectare", "Acre", "Square Mile", "Square Yard", "Square Foot"]
+    },
+    "⚖️ Mass": {
+        "function": convert_mass,
+        "definition": MASS_UNITS,
+        "table": MASS_TABLE,
+        "units": ["Kilogram", "Gram", "Milligram", "Pound", "Ounce", "Tonne", "Stone", "Imperial Ton", "US Ton"]
+    },
+    "📶 Data Transfer Rate": {
+        "function": convert_data_transfer_rate,
+        "definition": DATA_TRANSFER_RATE_UNITS,
+        "table": DATA_TRANSFER_RATE_TABLE,
+        "units": ["Bits per Second (bps)", "Kilobits per Second (Kbps)", "Megabits per Second (Mbps)", "Gigabits per Second (Gbps)", "Terabits per Second (Tbps)", "Kibibits per Second (Kibps)", "Mebibits per Second (Mibps)", "Gibibits per Second (Gibps)", "Tebibits per Second (Tibps)", "Bytes per Second (Bps)", "Kilobytes per Second (KBps)", "Megabytes per Second (MBps)", "Gigabytes per Second (GBps)", "Terabytes per Second (TBps)"]
+    },
+    "💾 Digital Storage": {
+        "function": convert_digital_storage,
+        "definition": DIGITAL_STORAGE_UNITS,
+        "table": DIGITAL_STORAGE_TABLE,
+        "units": ["Byte", "Kilobyte", "Megabyte", "Gigabyte", "Terabyte"]
+    },
+    "⚡ Energy": {
+        "function": convert_energy,
+        "definition": ENERGY_UNITS,
+        "table": ENERGY_TABLE,
+        "units": ["Joule (J)", "Kilojoule (kJ)", "Calorie (cal)",  "Kilocalorie (kcal)", "Watt-hour (Wh)", "Kilowatt-hour (kWh)","Electronvolt (eV)", "British Thermal Unit (BTU)", "Foot-pound (ft·lb)"]
+    },
+    "🔄 Frequency": {
+        "function": convert_frequency,
+        "definition": FREQUENCY_UNITS,
+        "table": FREQUENCY_TABLE,
+        "units": ["Hertz (Hz)", "Kilohertz (kHz)", "Megahertz (MHz)", "Gigahertz (GHz)"]
+    },
+    "⛽ Fuel Economy": {
+        "function": convert_fuel_economy,
+        "definition": FUEL_ECONOMY_UNITS,
+        "table": FUEL_ECONOMY_TABLE,
+        "pairs": FUEL_ECONOMY_PAIRS,
+        "units": ["Miles per Gallon", "L/100km", "Kilometers per Liter"]
+    },
+    "📐 Plane Angle": {
+        "function": convert_plane_angle,
+        "definition": PLANE_ANGLE_UNITS,
+        "table": PLANE_ANGLE_TABLE,
+        "units": ["Degree", "Radian", "Gradian", "Arcminute", "Arcsecond", "Milliradian"]
+    },
+    "🎚️ Pressure": {
+        "function": convert_pressure,
+        "definition": PRESSURE_UNITS,
+        "table": PRESSURE_TABLE,
+        "units": ["Pascal", "Kilopascal", "Bar", "Atmosphere", "PSI"]
+    },
+    "🏎️ Speed": {
+        "function": convert_speed,
+        "definition": SPEED_UNITS,
+        "table": SPEED_TABLE,
+        "units": ["m/s", "km/h", "mph", "Knots"]
+    },
+    "⏳ Time": {
+        "function": convert_time,
+        "definition": TIME_UNITS,
+        "table": TIME_TABLE,
+        "units": ["Second", "Millisecond", "Microsecond", "Nanosecond", "Minute", "Hour", "Day", "Week", "Month", "Calendar Year", "Decade", "Century"]
+    },
+    "🧪 Volume": {
+        "function": convert_volume,
+        "definition": VOLUME_UNITS,
+        "table": VOLUME_TABLE,
+        "units": ["Liter", "Milliliter", "Cubic Meter", "Cubic Centimeter", "US Gallon", "US Pint"]
+    }
+}
+
+# ------------------------------------------------------------------------------
+# Batch Conversion
+# ------------------------------------------------------------------------------
+# Converts a whole NumPy array or pandas Series in one vectorized pass.
+# The pair's coefficients are looked up once and applied to the array with NumPy
+# ufuncs, including the affine Temperature and reciprocal Fuel Economy cases.
+def convert_batch(category, values, from_unit, to_unit):
+    # Imported here so that scalar users and the CLI don't pay for loading NumPy
+    import numpy as np
+
+    coefficients = conversion_options[category]["table"][from_unit, to_unit]
+    array = np.asarray(values, dtype=float)
+
+    # A zero in a reciprocal conversion (e.g. 0 L/100km) becomes inf instead of raising
+    with np.errstate(divide="ignore"):
+        result = apply_coefficients(coefficients, array)
+
+    # Keep the index and name when a pandas Series is passed in
+    if hasattr(values, "index"):
+        return type(values)(result, index=values.index, name=values.name)
+    return result
+
+# ------------------------------------------------------------------------------
+# Exact Conversion
+# ------------------------------------------------------------------------------
+# Converts with rational arithmetic so chained factors (e.g. Nanometer -> Mile or
+# Electronvolt -> Kilowatt-hour) lose nothing along the way. Each category's Fraction
+# table is compiled on first use and cached; only the final result is rounded,
+# to `precision` significant digits.
+DEFAULT_PRECISION = 28
+
+_exact_tables = {}
+
+# Turn an input into an exact Fraction; floats are read by their shortest decimal form (0.1 -> 1/10)
+def to_fraction(value):
+    from fractions import Fraction
+
+    if isinstance(value, float):
+        return Fraction(repr(value))
+    return Fraction(value)
+
+# Compile the exact from×to table of a category on first use, then serve it from the cache
+def exact_table(category):
+    if category not in _exact_tables:
+        from fractions import Fraction
+
+        units = {}
+        for unit, (scale, offset, reciprocal) in conversion_options[category]["definition"].items():
+            exact = EXACT_FACTORS.get(unit)
+            if isinstance(exact, tuple):
+                scale, offset = exact
+            elif exact is not None:
+                scale = exact
+            units[unit] = (to_fraction(scale), to_fraction(offset), reciprocal)
+        pairs = {
+            pair: (to_fraction(scale), to_fraction(offset), reciprocal)
+            for pair, (scale, offset, reciprocal) in conversion_options[category].get("pairs", {}).items()
+        }
+        _exact_tables[category] = compile_table(units, number=Fraction, pairs=pairs)
+    return _exact_tables[category]
+
+# Convert one value exactly and return a Decimal rounded to `precision` significant digits
+def convert_exact(category, value, from_unit, to_unit, precision=DEFAULT_PRECISION):
+    from decimal import Decimal, localcontext
+
+    result = apply_coefficients(exact_table(category)[from_unit, to_unit], to_fraction(value))
+    with localcontext() as context:
+        context.prec = precision
+        return Decimal(result.numerator) / Decimal(result.denominator)
+
+# ------------------------------------------------------------------------------
+# Category Lookup
+# ------------------------------------------------------------------------------
+# Resolves "Length", "length" or "📏 Length" to its key in conversion_options.
+def find_category(name):
+    wanted = name.strip().lower()
+    for category in conversion_options:
+        if wanted in (category.lower(), category.split(" ", 1)[-1].lower()):
+            return category
+    raise KeyError(f"Unknown category {name!r}")
+
+# ------------------------------------------------------------------------------
+# Command Line Interface
+# ------------------------------------------------------------------------------
+# Streams values line by line from the given files (or stdin) and prints one result per line.
+# Lines that can't be converted are reported on stderr and the exit code is set to 1.
+def main(argv=None):
+    import argparse
+    import fileinput
+
+    parser = argparse.ArgumentParser(prog="python -m converter", description="Convert values between units, one per line.")
+    parser.add_argument("category", help='conversion category, e.g. "Length" or "Temperature"')
+    parser.add_argument("from_unit", help='unit of the input values, e.g. "Foot"')
+    parser.add_argument("to_unit", help='unit to convert to, e.g. "Meter"')
+    parser.add_argument("files", nargs="*", help="files with one value per line (default: stdin)")
+    parser.add_argument("--round", type=int, dest="digits", help="round results to this many decimal places")
+    parser.add_argument("--exact", action="store_true", help="use exact rational arithmetic instead of floats")
+    parser.add_argument("--precision", type=int, default=DEFAULT_PRECISION, help="significant digits of exact results (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    try:
+        category = find_category(args.category)
+    except KeyError as error:
+        parser.error(f"{error.args[0]}; choose from: {', '.join(conversion_options)}")
+    try:
+        table = exact_table(category) if args.exact else conversion_options[category]["table"]
+        coefficients = table[args.from_unit, args.to_unit]
+    except KeyError:
+        parser.error(f"unknown unit for {category}; choose from: {', '.join(conversion_options[category]['units'])}")
+
+    failures = 0
+    for line in fileinput.input(args.files):
+        text = line.strip()
+        if not text:
+            continue
+        try:
+            if args.exact:
+                result = convert_exact(category, text, args.from_unit, args.to_unit, args.precision)
+            else:
+                result = apply_coefficients(coefficients, float(text))
+        except (ValueError, ZeroDivisionError) as error:
+            print(f"{fileinput.filename()}:{fileinput.filelineno()}: {error}", file=sys.stderr)
+            failures += 1
+            continue
+        if args.digits is not None:
+            result = round(result, args.digits)
+        sys.stdout.write(f"{result}\n")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+# Compound and derived unit expressions such as "kg*m/s^2", "MiB/h" or "kWh".
+# An expression is parsed into a scale factor and a dimension vector over the base units.
+# A from/to pair with matching dimensions compiles into a conversion plan: the same
+# (scale, offset, reciprocal) coefficients used by the tables in converter.py.
+# Plans are kept in an LRU cache, so a repeated pair skips parsing entirely.
+#
+# Example:
+#   convert_expression(10, "MiB/h", "Mbps")
+#   compile_plan("kg*m/s^2", "N")  ->  (1.0, 0.0, False)
+import re
+from functools import lru_cache
+
+from converter import apply_coefficients
+
+
+# ------------------------------------------------------------------------------
+# Dimensions
+# ------------------------------------------------------------------------------
+# A dimension is a tuple of exponents, one per base unit, in this order.
+BASE_UNITS = ("m", "kg", "s", "A", "K", "mol", "cd", "bit")
+
+# Build a dimension vector from keyword exponents, e.g. dimension(m=1, s=-1)
+def dimension(**exponents):
+    return tuple(exponents.get(base, 0) for base in BASE_UNITS)
+
+DIMENSIONLESS = dimension()
+
+# Human-readable form of a dimension vector, e.g. "kg·m·s^-2"
+def format_dimension(dims):
+    parts = []
+    for base, exponent in zip(BASE_UNITS, dims):
+        if exponent == 1:
+            parts.append(base)
+        elif exponent:
+            parts.append(f"{base}^{exponent}")
+    return "·".join(parts) or "dimensionless"
+
+# ------------------------------------------------------------------------------
+# Unit Symbols
+# ------------------------------------------------------------------------------
+# Each symbol maps to (scale into SI base units, dimension).
+UNIT_SYMBOLS = {
+    # Base units
+    "m": (1, dimension(m=1)),
+    "g": (1e-3, dimension(kg=1)),
+    "s": (1, dimension(s=1)),
+    "A": (1, dimension(A=1)),
+    "K": (1, dimension(K=1)),
+    "mol": (1, dimension(mol=1)),
+    "cd": (1, dimension(cd=1)),
+    "bit": (1, dimension(bit=1)),
+    "b": (1, dimension(bit=1)),
+    "B": (8, dimension(bit=1)),
+    "rad": (1, DIMENSIONLESS),
+
+    # Time
+    "min": (60, dimension(s=1)),
+    "h": (3600, dimension(s=1)),
+    "d": (86400, dimension(s=1)),
+    "wk": (604800, dimension(s=1)),
+    "yr": (31556952, dimension(s=1)),
+
+    # Length, area and volume
+    "mi": (1609.34, dimension(m=1)),
+    "yd": (0.9144, dimension(m=1)),
+    "ft": (0.3048, dimension(m=1)),
+    "in": (0.0254, dimension(m=1)),
+    "nmi": (1852, dimension(m=1)),
+    "ha": (1e4, dimension(m=2)),
+    "ac": (4046.86, dimension(m=2)),
+    "L": (1e-3, dimension(m=3)),
+    "l": (1e-3, dimension(m=3)),
+    "gal": (3.78541e-3, dimension(m=3)),
+
+    # Mass
+    "t": (1000, dimension(kg=1)),
+    "lb": (0.453592, dimension(kg=1)),
+    "oz": (0.0283495, dimension(kg=1)),
+
+    # Speed
+    "mph": (0.44704, dimension(m=1, s=-1)),
+    "kn": (0.514444, dimension(m=1, s=-1)),
+
+    # Derived SI units
+    "Hz": (1, dimension(s=-1)),
+    "N": (1, dimension(kg=1, m=1, s=-2)),
+    "Pa": (1, dimension(kg=1, m=-1, s=-2)),
+    "J": (1, dimension(kg=1, m=2, s=-2)),
+    "W": (1, dimension(kg=1, m=2, s=-3)),
+    "C": (1, dimension(A=1, s=1)),
+    "V": (1, dimension(kg=1, m=2, s=-3, A=-1)),
+    "Ohm": (1, dimension(kg=1, m=2, s=-3, A=-2)),
+    "Ω": (1, dimension(kg=1, m=2, s=-3, A=-2)),
+
+    # Other energy, power and pressure units
+    "Wh": (3600, dimension(kg=1, m=2, s=-2)),
+    "eV": (1.602176634e-19, dimension(kg=1, m=2, s=-2)),
+    "cal": (4.184, dimension(kg=1, m=2, s=-2)),
+    "BTU": (1055.06, dimension(kg=1, m=2, s=-2)),
+    "bar": (1e5, dimension(kg=1, m=-1, s=-2)),
+    "atm": (101325, dimension(kg=1, m=-1, s=-2)),
+    "psi": (6894.76, dimension(kg=1, m=-1, s=-2)),
+
+    # Data rates
+    "bps": (1, dimension(bit=1, s=-1)),
+    "Bps": (8, dimension(bit=1, s=-1)),
+}
+
+# Decimal and binary prefixes that can precede any symbol above
+PREFIXES = {
+    "Y": 1e24, "Z": 1e21, "E": 1e18, "P": 1e15, "T": 1e12, "G": 1e9, "M": 1e6, "k": 1e3,
+    "h": 1e2, "da": 1e1, "d": 1e-1, "c": 1e-2, "m": 1e-3, "u": 1e-6, "µ": 1e-6,
+    "n": 1e-9, "p": 1e-12, "f": 1e-15, "a": 1e-18, "z": 1e-21, "y": 1e-24,
+    "Ki": 1024, "Mi": 1024**2, "Gi": 1024**3, "Ti": 1024**4, "Pi": 1024**5, "Ei": 1024**6,
+}
+
+# Look up a symbol, trying an exact match before splitting off a prefix ("min" is minutes, "mm" is milli-meters)
+def lookup_symbol(symbol):
+    if symbol in UNIT_SYMBOLS:
+        return UNIT_SYMBOLS[symbol]
+    for prefix, prefix_scale in PREFIXES.items():
+        if symbol.startswith(prefix) and symbol[len(prefix):] in UNIT_SYMBOLS:
+            scale, dims = UNIT_SYMBOLS[symbol[len(prefix):]]
+            return prefix_scale * scale, dims
+    raise ValueError(f"Unknown unit {symbol!r}")
+
+# ------------------------------------------------------------------------------
+# Parser
+# ------------------------------------------------------------------------------
+# Grammar (left-associative, so "m/s/s" is "(m/s)/s"):
+#   expression := term (("*" | "·" | "/") term)*
+#   term       := factor (("^" | "**") ["-"] integer)?
+#   factor     := symbol | number | "(" expression ")"
+TOKEN_PATTERN = re.compile(r"\s*(?:(\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)|([A-Za-zµΩ]+)|(\*\*|[*·/^()\-]))")
+
+# Split an expression into (kind, text) tokens
+def tokenize(expression):
+    tokens = []
+    position = 0
+    expression = expression.strip()
+    while position < len(expression):
+        match = TOKEN_PATTERN.match(expression, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Unexpected character {expression[position]!r} in {expression!r}")
+        number, symbol, operator = match.groups()
+        if number is not None:
+            tokens.append(("number", number))
+        elif symbol is not None:
+            tokens.append(("symbol", symbol))
+        else:
+            tokens.append(("operator", "^" if operator == "**" else operator))
+        position = match.end()
+    return tokens
+
+# Multiply (or divide, with sign=-1) two (scale, dimension) pairs
+def combine(left, right, sign=1):
+    scale = left[0] * right[0] if sign > 0 else left[0] / right[0]
+    dims = tuple(a + sign * b for a, b in zip(left[1], right[1]))
+    return scale, dims
+
+# Parse an expression into (scale into SI base units, dimension)
+def parse_expression(expression):
+    tokens = tokenize(expression)
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else (None, None)
+
+    def take(expected=None):
+        nonlocal position
+        kind, text = peek()
+        if kind is None or (expected is not None and text != expected):
+            raise ValueError(f"Expected {expected or 'a unit'} in {expression!r}")
+        position += 1
+        return kind, text
+
+    def parse_factor():
+        kind, text = take()
+        if kind == "number":
+            return float(text), DIMENSIONLESS
+        if kind == "symbol":
+            return lookup_symbol(text)
+        if text == "(":
+            result = parse_product()
+            take(")")
+            return result
+        raise ValueError(f"Unexpected {text!r} in {expression!r}")
+
+    def parse_term():
+        scale, dims = parse_factor()
+        if peek() == ("operator", "^"):
+            take("^")
+            sign = -1 if peek() == ("operator", "-") else 1
+            if sign < 0:
+                take("-")
+            kind, text = take()
+            if kind != "number" or not text.isdigit():
+                raise ValueError(f"Exponents must be integers in {expression!r}")
+            exponent = sign * int(text)
+            scale, dims = scale ** exponent, tuple(d * exponent for d in dims)
+        return scale, dims
+
+    def parse_product():
+        result = parse_term()
+        while peek()[1] in ("*", "·", "/"):
+            _, operator = take()
+            result = combine(result, parse_term(), -1 if operator == "/" else 1)
+        return result
+
+    result = parse_product()
+    if position != len(tokens):
+        raise ValueError(f"Unexpected {tokens[position][1]!r} in {expression!r}")
+    return result
+
+# ------------------------------------------------------------------------------
+# Conversion Plans
+# ------------------------------------------------------------------------------
+PLAN_CACHE_SIZE = 256
+
+# Compile a from/to pair into (scale, offset, reciprocal) coefficients.
+# Least recently used plans are evicted once PLAN_CACHE_SIZE pairs are cached;
+# compile_plan.cache_info() reports hits and misses.
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def compile_plan(from_expression, to_expression):
+    from_scale, from_dims = parse_expression(from_expression)
+    to_scale, to_dims = parse_expression(to_expression)
+    if from_dims != to_dims:
+        raise ValueError(
+            f"Cannot convert {from_expression!r} ({format_dimension(from_dims)}) "
+            f"to {to_expression!r} ({format_dimension(to_dims)})"
+        )
+    return from_scale / to_scale, 0.0, False
+
+# Convert a scalar or NumPy array between two unit expressions
+def convert_expression(value, from_expression, to_expression):
+    return apply_coefficients(compile_plan(from_expression, to_expression), value)
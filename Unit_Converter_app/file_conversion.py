@@ -0,0 +1,73 @@
+# Chunked CSV/Parquet conversion built on the converter engine.
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from converter import convert_batch
+
+
+# ------------------------------------------------------------------------------
+# Streaming File Conversion
+# ------------------------------------------------------------------------------
+# Converts selected columns of a CSV or Parquet file chunk by chunk, writing each
+# converted chunk straight to the output file. Only one chunk is held in memory
+# at a time, so peak memory depends on CHUNK_SIZE rather than on the file size.
+CHUNK_SIZE = 100_000
+
+# Read the column names without loading any rows
+def read_columns(source, file_format):
+    if file_format == "parquet":
+        columns = pq.ParquetFile(source).schema_arrow.names
+    else:
+        columns = list(pd.read_csv(source, nrows=0).columns)
+    source.seek(0)
+    return columns
+
+# Convert a CSV file chunk by chunk and return the number of rows written
+def convert_csv(source, output_path, category, columns, from_unit, to_unit, chunk_size=CHUNK_SIZE):
+    rows = 0
+    header = True
+    with open(output_path, "w", newline="") as output:
+        for chunk in pd.read_csv(source, chunksize=chunk_size):
+            for column in columns:
+                chunk[column] = convert_batch(category, chunk[column], from_unit, to_unit)
+            chunk.to_csv(output, header=header, index=False)
+            header = False
+            rows += len(chunk)
+        # A file with a header but no rows can yield no chunks at all; the output still gets the header
+        if header:
+            source.seek(0)
+            pd.read_csv(source, nrows=0).to_csv(output, index=False)
+    return rows
+
+# Convert a Parquet file one record batch at a time and return the number of rows written
+def convert_parquet(source, output_path, category, columns, from_unit, to_unit, chunk_size=CHUNK_SIZE):
+    rows = 0
+    writer = None
+    parquet_file = pq.ParquetFile(source)
+    # A file without rows still gets an output file, with the converted schema
+    batches = parquet_file.iter_batches(batch_size=chunk_size) if parquet_file.metadata.num_rows else [parquet_file.schema_arrow.empty_table()]
+    try:
+        for batch in batches:
+            chunk = batch.to_pandas()
+            for column in columns:
+                chunk[column] = convert_batch(category, chunk[column], from_unit, to_unit)
+
+            # The first converted batch fixes the output schema for the rest of the file
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(output_path, table.schema)
+            else:
+                table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+# Dispatch on the file format
+def convert_file(source, output_path, file_format, category, columns, from_unit, to_unit, chunk_size=CHUNK_SIZE):
+    if file_format == "parquet":
+        return convert_parquet(source, output_path, category, columns, from_unit, to_unit, chunk_size)
+    return convert_csv(source, output_path, category, columns, from_unit, to_unit, chunk_size)